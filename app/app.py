@@ -1,16 +1,24 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for, send_from_directory
+from flask import Flask, render_template, request, jsonify, redirect, url_for, send_from_directory, Response, stream_with_context
 import os
 import sys
 import json
 import datetime
 import uuid
+from email.utils import formatdate
+from xml.sax.saxutils import escape
 
 # Add parent directory to path so we can import from src
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Import required modules
-from src.utils import load_json_file, save_json_file, ensure_dir_exists
-from src.tts import generate_podcast_script, text_to_speech
+from src.utils import ensure_dir_exists
+from src.article_repository import get_article_repository
+from src.article_store import ARTICLE_PAGE_SIZE, SORT_ORDERS, REVIEW_STATES
+from src.tts import generate_podcast_script, text_to_speech, start_speech_stream, is_streaming, follow_audio_file, TTS_VOICE
+from src.episodes import get_episode_catalog
+from src.seen_index import article_key
+from src.audio_cache import get_audio_cache
+from src.pretranslate import needs_pretranslation, start_pretranslation, translation_progress
 
 # Get absolute paths for template folder
 template_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), 'templates'))
@@ -23,92 +31,226 @@ app = Flask(__name__,
 
 # Configuration
 DATA_DIR = "data"
-PROCESSED_NEWS_FILE = os.path.join(DATA_DIR, "processed_news.json")
-APPROVED_NEWS_FILE = os.path.join(DATA_DIR, "approved_news.json")
 PODCAST_SCRIPT_FILE = os.path.join(DATA_DIR, "podcast_script.txt")
+FEED_EPISODES = 50  # Episodes listed in the podcast feed
+EDITABLE_FIELDS = ('tamil_title', 'tamil_summary')
+REVIEW_ACTIONS = ('approve', 'reject', 'edit')
+MAX_REVIEW_ITEMS = 500  # Items accepted in one bulk review request
 
 # Ensure data directory exists
 ensure_dir_exists(DATA_DIR)
 
+def article_listing_options(args):
+    """
+    Filters, sort order and page for an article listing, from query arguments
+
+    Parameters:
+    - args: Request query arguments (language, review, needs_translation, feed,
+            since, until, sort, page, per_page)
+
+    Returns:
+    - (filters, sort, page, per_page)
+
+    Raises:
+    - ValueError if an argument has an invalid value
+    """
+    filters = {name: args.get(name) or None for name in ('language', 'review', 'feed', 'since', 'until')}
+    needs_translation = args.get('needs_translation')
+    filters['needs_translation'] = None if not needs_translation else needs_translation in ('1', 'true', 'yes')
+
+    if filters['review'] and filters['review'] not in REVIEW_STATES:
+        raise ValueError(f"review must be one of {', '.join(REVIEW_STATES)}")
+    for name in ('since', 'until'):
+        if filters[name]:
+            try:
+                value = datetime.datetime.fromisoformat(filters[name])
+            except ValueError:
+                raise ValueError(f"{name} must be an ISO date or date and time, e.g. 2025-03-18")
+            if value.tzinfo is not None:
+                raise ValueError(f"{name} must not include a time zone")
+    sort = args.get('sort') or "added"
+    if sort not in SORT_ORDERS:
+        raise ValueError(f"sort must be one of {', '.join(SORT_ORDERS)}")
+    page = max(args.get('page', 1, type=int), 1)
+    per_page = min(max(args.get('per_page', ARTICLE_PAGE_SIZE, type=int), 1), 100)
+    return filters, sort, page, per_page
+
 @app.route('/')
 def index():
-    """Main page showing all articles for review"""
-    articles = load_json_file(PROCESSED_NEWS_FILE, [])
-    approved_count = sum(1 for article in articles if article.get('approved', False))
+    """Main page listing articles for review, one filtered page at a time"""
+    try:
+        filters, sort, page, per_page = article_listing_options(request.args)
+    except ValueError as e:
+        return f"Invalid filter: {e}", 400
+
+    repository = get_article_repository()
+    articles, matching = repository.list_articles(filters, sort, page, per_page)
+    counters = repository.counters()
+    query = {name: value for name, value in request.args.items() if name != 'page'}
     return render_template('index.html', 
                           articles=articles, 
-                          total=len(articles),
-                          approved=approved_count)
-
-@app.route('/view/<int:article_id>')
+                          total=counters['total'],
+                          approved=counters['approved'],
+                          matching=matching,
+                          page=page,
+                          pages=max(1, -(-matching // per_page)),
+                          filters=filters,
+                          sort=sort,
+                          query=query)
+
+@app.route('/api/articles')
+def list_articles():
+    """Paginated, filterable article listing for scripted review tools (same arguments as /)"""
+    try:
+        filters, sort, page, per_page = article_listing_options(request.args)
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+
+    repository = get_article_repository()
+    articles, matching = repository.list_articles(filters, sort, page, per_page)
+    return jsonify({"status": "success",
+                    "articles": articles,
+                    "page": page,
+                    "per_page": per_page,
+                    "matching": matching,
+                    "next_page": page + 1 if page * per_page < matching else None,
+                    "counters": repository.counters()})
+
+@app.route('/view/<article_id>')
 def view_article(article_id):
     """View details of a specific article"""
-    articles = load_json_file(PROCESSED_NEWS_FILE, [])
+    article = get_article_repository().get(article_id)
 
-    if article_id >= len(articles):
+    if article is None:
         return "Article not found", 404
 
     return render_template('view.html', 
-                          article=articles[article_id], 
+                          article=article, 
                           article_id=article_id)
 
-@app.route('/edit/<int:article_id>', methods=['GET', 'POST'])
+def edited_fields(article, text):
+    """
+    Fields to set when a reviewer edits an article's Tamil text
+
+    Parameters:
+    - article: Article being edited
+    - text: Dictionary with tamil_title and/or tamil_summary
+
+    Returns:
+    - Dictionary of fields to set
+    """
+    fields = {name: text[name] for name in EDITABLE_FIELDS if name in text}
+    fields['edited'] = True
+    # Reviewer text replaces any pending background translation
+    if article.get('translation_status') in ('pending', 'translating'):
+        fields['translation_status'] = "edited"
+    return fields
+
+@app.route('/edit/<article_id>', methods=['GET', 'POST'])
 def edit_article(article_id):
     """Edit a specific article"""
-    articles = load_json_file(PROCESSED_NEWS_FILE, [])
+    repository = get_article_repository()
+    article = repository.get(article_id)
 
-    if article_id >= len(articles):
+    if article is None:
         return "Article not found", 404
 
     if request.method == 'POST':
         # Update article with edited content
-        articles[article_id]['tamil_title'] = request.form.get('tamil_title')
-        articles[article_id]['tamil_summary'] = request.form.get('tamil_summary')
-        articles[article_id]['edited'] = True
+        fields = edited_fields(article, {'tamil_title': request.form.get('tamil_title'),
+                                         'tamil_summary': request.form.get('tamil_summary')})
 
-        # Save updated articles
-        save_json_file(articles, PROCESSED_NEWS_FILE)
+        # Save updated article
+        repository.update(article_id, fields)
 
         return redirect(url_for('view_article', article_id=article_id))
 
     return render_template('edit.html', 
-                          article=articles[article_id], 
+                          article=article, 
                           article_id=article_id)
 
-@app.route('/approve/<int:article_id>', methods=['POST'])
+@app.route('/approve/<article_id>', methods=['POST'])
 def approve_article(article_id):
     """Approve an article"""
-    articles = load_json_file(PROCESSED_NEWS_FILE, [])
-
-    if article_id >= len(articles):
+    # One indexed row update; approved articles are queried, not copied to another file
+    if get_article_repository().update(article_id, {'approved': True}) is None:
         return jsonify({"status": "error", "message": "Article not found"})
 
-    articles[article_id]['approved'] = True
-    save_json_file(articles, PROCESSED_NEWS_FILE)
-
-    # Get all approved articles and save to approved_news.json
-    approved_articles = [article for article in articles if article.get('approved', False)]
-    save_json_file(approved_articles, APPROVED_NEWS_FILE)
-
     return jsonify({"status": "success"})
 
-@app.route('/reject/<int:article_id>', methods=['POST'])
+@app.route('/reject/<article_id>', methods=['POST'])
 def reject_article(article_id):
     """Reject an article"""
-    articles = load_json_file(PROCESSED_NEWS_FILE, [])
-
-    if article_id >= len(articles):
+    if get_article_repository().update(article_id, {'approved': False}) is None:
         return jsonify({"status": "error", "message": "Article not found"})
 
-    articles[article_id]['approved'] = False
-    save_json_file(articles, PROCESSED_NEWS_FILE)
-
     return jsonify({"status": "success"})
 
+@app.route('/api/review', methods=['POST'])
+def bulk_review():
+    """
+    Approve, reject and edit many articles in one request
+
+    Expects JSON like {"items": [{"id": "<article key>", "action": "approve"},
+    {"id": "...", "action": "edit", "fields": {"tamil_title": "..."}}]}.
+    Valid items are applied together in one transaction; the response has a
+    result for every item, in request order.
+    """
+    items = (request.get_json(silent=True) or {}).get('items')
+    if not isinstance(items, list) or not items:
+        return jsonify({"status": "error", "message": "Expected a non-empty list of items"}), 400
+    if len(items) > MAX_REVIEW_ITEMS:
+        return jsonify({"status": "error", "message": f"At most {MAX_REVIEW_ITEMS} items per request"}), 400
+
+    results = []
+    functions = {}
+    for item in items:
+        item = item if isinstance(item, dict) else {}
+        article_id = item.get('id')
+        action = item.get('action')
+        result = {"id": article_id, "action": action}
+        results.append(result)
+
+        if not isinstance(article_id, str) or action not in REVIEW_ACTIONS:
+            result.update(status="error", message=f"Each item needs an id and an action ({', '.join(REVIEW_ACTIONS)})")
+        elif article_id in functions:
+            result.update(status="error", message="Article appears more than once in this request")
+        elif action == 'edit' and not (isinstance(item.get('fields'), dict) and
+                                       any(name in item['fields'] for name in EDITABLE_FIELDS)):
+            result.update(status="error", message=f"Edit needs fields: {', '.join(EDITABLE_FIELDS)}")
+        elif action == 'edit' and not all(isinstance(item['fields'][name], str)
+                                          for name in EDITABLE_FIELDS if name in item['fields']):
+            result.update(status="error", message=f"Edited fields must be text: {', '.join(EDITABLE_FIELDS)}")
+        elif action == 'edit':
+            functions[article_id] = lambda article, text=item['fields']: edited_fields(article, text)
+        else:
+            approved = action == 'approve'
+            functions[article_id] = lambda article, approved=approved: {'approved': approved}
+
+    updated = get_article_repository().apply_updates(functions) if functions else {}
+
+    for result in results:
+        if 'status' in result:
+            continue
+        if updated.get(result['id']) is None:
+            result.update(status="error", message="Article not found")
+        else:
+            result['status'] = "success"
+
+    succeeded = sum(1 for result in results if result['status'] == "success")
+    return jsonify({"status": "success" if succeeded == len(results) else "partial",
+                    "succeeded": succeeded,
+                    "failed": len(results) - succeeded,
+                    "results": results})
+
 # Route to serve audio files
 @app.route('/audio/<path:filename>')
 def serve_audio(filename):
     """Serve audio files from the data directory"""
+    # An episode still being generated is streamed as it grows
+    filepath = os.path.join(DATA_DIR, filename)
+    if is_streaming(filepath):
+        return Response(stream_with_context(follow_audio_file(filepath)), mimetype='audio/mpeg')
     return send_from_directory(DATA_DIR, filename)
 
 @app.route('/generate-podcast', methods=['GET', 'POST'])
@@ -117,104 +259,20 @@ def generate_podcast():
     if request.method == 'POST':
         try:
             # Get all approved articles
-            articles = load_json_file(PROCESSED_NEWS_FILE, [])
-            approved_articles = [article for article in articles if article.get('approved', False)]
+            approved_articles = get_article_repository().approved()
 
             if not approved_articles:
                 return jsonify({"status": "error", "message": "No approved articles found"})
 
-            # Direct translation with OpenAI
-            try:
-                from openai import OpenAI
-
-                if 'OPENAI_API_KEY' not in os.environ:
-                    return jsonify({"status": "error", "message": "OpenAI API key not set. Please add it in Replit Secrets."})
-
-                # Initialize OpenAI client
-                client = OpenAI(api_key=os.environ['OPENAI_API_KEY'])
-
-                # Function to translate with OpenAI - cleaner version
-                def translate_to_tamil_direct(text):
-                    if not text or len(text.strip()) < 5:
-                        return text
-
-                    print(f"Translating: {text[:50]}...")
-
-                    try:
-                        # Call OpenAI API directly
-                        response = client.chat.completions.create(
-                            model="gpt-3.5-turbo",
-                            messages=[
-                                {"role": "system", "content": "You are a translator converting English to Tamil. Produce natural, conversational Tamil suitable for children. Do not include any English text or prefixes like '[Translation]' in your response."},
-                                {"role": "user", "content": f"Translate this text to Tamil: \"{text}\""}
-                            ]
-                        )
-
-                        translated = response.choices[0].message.content.strip()
-                        print(f"Translation result: {translated[:50]}...")
-                        return translated
-                    except Exception as e:
-                        print(f"OpenAI translation error: {e}")
-                        # Create a simple translation without the "[Need proper translation]" prefix
-                        import re
-                        basic_translations = {
-                            "News": "செய்திகள்",
-                            "Today": "இன்று",
-                            "India": "இந்தியா",
-                            "World": "உலகம்",
-                            "Sports": "விளையாட்டு",
-                            "Health": "ஆரோக்கியம்",
-                            "Education": "கல்வி",
-                            "Weather": "வானிலை",
-                            "Politics": "அரசியல்",
-                            "Technology": "தொழில்நுட்பம்",
-                            "Science": "அறிவியல்",
-                            "Environment": "சுற்றுச்சூழல்",
-                            "Entertainment": "பொழுதுபோக்கு",
-                            "Business": "வணிகம்",
-                            "Economy": "பொருளாதாரம்",
-                            "Government": "அரசு",
-                            "Device": "சாதனம்",
-                            "New": "புதிய",
-                            "elephants": "யானைகள்",
-                            "Farm": "பண்ணை",
-                            "keep": "வைத்திருக்க",
-                            "at": "இல்",
-                            "bay": "தடுப்பது"
-                        }
-
-                        result = text
-                        for eng, tam in basic_translations.items():
-                            result = re.sub(r'\b' + re.escape(eng) + r'\b', tam, result, flags=re.IGNORECASE)
-
-                        return result
-
-                # Process and translate each article
-                translated_articles = []
-                for article in approved_articles:
-                    # Create a copy of the article to translate
-                    translated_article = article.copy()
-
-                    # Always translate title if not in Tamil
-                    if article['title_language'] != "ta":
-                        print(f"Translating title: {article['original_title']}")
-                        translated_title = translate_to_tamil_direct(article['original_title'])
-                        translated_article['tamil_title'] = translated_title
-
-                    # Always translate summary if not in Tamil
-                    if article['summary_language'] != "ta":
-                        print(f"Translating summary: {article['original_summary'][:50]}...")
-                        translated_summary = translate_to_tamil_direct(article['original_summary'])
-                        translated_article['tamil_summary'] = translated_summary
-
-                    translated_articles.append(translated_article)
-
-            except ImportError:
-                print("OpenAI package not available. Using articles without additional translation.")
-                translated_articles = approved_articles
+            # Articles are translated in the background after scraping, so only
+            # text that is already there is assembled here
+            untranslated = [article for article in approved_articles if needs_pretranslation(article)]
+            if untranslated:
+                print(f"{len(untranslated)} approved articles are still waiting for translation")
+                start_pretranslation()
 
             # Generate podcast script with translated content
-            script = generate_podcast_script(translated_articles)
+            script = generate_podcast_script(approved_articles)
 
             # Save script to file with a unique identifier
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -228,22 +286,55 @@ def generate_podcast():
             with open(script_filepath, 'w', encoding='utf-8') as f:
                 f.write(script)
 
-            # Generate audio using OpenAI TTS
+            # Generate audio using OpenAI TTS; in streaming mode respond as soon as
+            # the first segment is written and keep generating in the background
             audio_filename = f"{podcast_filename}.mp3"
             audio_filepath = os.path.join(DATA_DIR, audio_filename)
-            audio_file = text_to_speech(script, audio_filepath)
+            options = request.get_json(silent=True) or {}
+            stream = bool(options.get('stream')) or request.args.get('stream') == '1'
+
+            # Episodes are added to the catalog once their audio is complete
+            article_ids = [article_key(article) for article in approved_articles]
+            def catalog_episode(path=None, failed_segments=0):
+                catalog = get_episode_catalog()
+                catalog.add_episode(podcast_filename, audio_filename if path else None, script_filename,
+                                    article_ids=article_ids, voice=TTS_VOICE, failed_segments=failed_segments)
+                catalog.apply_retention()
+
+            # Segments left out of the audio; only known here when not streaming
+            failed_segments = None
+            if stream:
+                start_speech_stream(script, audio_filepath, on_complete=catalog_episode)
+                audio_file = audio_filepath if os.path.exists(audio_filepath) else None
+            else:
+                audio_file, failed_segments = text_to_speech(script, audio_filepath)
+                if audio_file is None and failed_segments:
+                    return jsonify({"status": "error",
+                                    "message": f"Speech synthesis failed for {failed_segments} segments",
+                                    "failed_segments": failed_segments,
+                                    "script_file": script_filepath})
+                catalog_episode(audio_file, failed_segments)
 
             result = {
                 "status": "success", 
+                "translation_progress": translation_progress(approved_articles),
+                "untranslated": len(untranslated),
+                "audio_cache": get_audio_cache().summary(),
                 "script": script,
                 "script_file": script_filepath,
                 "script_filename": script_filename
             }
+            if failed_segments is not None:
+                result["failed_segments"] = failed_segments
+                if failed_segments:
+                    result["degraded"] = True
+                    result["message"] = f"{failed_segments} segments could not be synthesized and are missing from the audio"
 
             if audio_file:
                 result["audio_file"] = audio_filepath
                 result["audio_filename"] = audio_filename
                 result["audio_url"] = url_for('serve_audio', filename=audio_filename)
+                result["audio_streaming"] = is_streaming(audio_filepath)
 
             return jsonify(result)
         except Exception as e:
@@ -258,15 +349,66 @@ def generate_podcast():
     except Exception as e:
         return f"Error loading template: {str(e)}"
 
+def episode_json(episode):
+    """Episode catalog entry with URLs for the API"""
+    episode = dict(episode)
+    if episode['audio_file']:
+        episode['audio_url'] = url_for('serve_audio', filename=episode['audio_file'])
+    if episode['script_file']:
+        episode['script_url'] = url_for('serve_audio', filename=episode['script_file'])
+    return episode
+
+@app.route('/api/episodes')
+def list_episodes():
+    """Paginated episode listing, newest first (pass next_cursor back as ?cursor=)"""
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+    try:
+        episodes, next_cursor = get_episode_catalog().list_episodes(limit, request.args.get('cursor'))
+    except ValueError:
+        return jsonify({"status": "error", "message": "Invalid cursor"}), 400
+    return jsonify({"status": "success",
+                    "episodes": [episode_json(episode) for episode in episodes],
+                    "next_cursor": next_cursor})
+
+@app.route('/podcast.xml')
+def podcast_feed():
+    """Podcast RSS feed of the latest episodes, rendered from the episode catalog"""
+    episodes, _ = get_episode_catalog().list_episodes(FEED_EPISODES, with_audio=True)
+    items = []
+    for episode in episodes:
+        audio_url = url_for('serve_audio', filename=episode['audio_file'], _external=True)
+        minutes, seconds = divmod(int(round(episode['duration'])), 60)
+        items.append(f"""
+    <item>
+      <title>{escape(episode['title'])}</title>
+      <guid isPermaLink="false">{escape(episode['id'])}</guid>
+      <pubDate>{formatdate(episode['created'])}</pubDate>
+      <enclosure url="{escape(audio_url)}" length="{episode['size']}" type="audio/mpeg"/>
+      <itunes:duration>{minutes}:{seconds:02d}</itunes:duration>
+    </item>""")
+
+    feed = f"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd">
+  <channel>
+    <title>Tamil Kids News</title>
+    <link>{escape(url_for('index', _external=True))}</link>
+    <description>News for Tamil-speaking children</description>
+    <language>ta</language>{''.join(items)}
+  </channel>
+</rss>
+"""
+    return Response(feed, mimetype='application/rss+xml')
+
 @app.route('/run-scraper', methods=['GET', 'POST'])
 def run_scraper():
     """Run the news scraper"""
     if request.method == 'POST':
         try:
-            # Import and run the main function from src.main
-            from src.main import main
-            main()
-            return jsonify({"status": "success", "message": "Scraper ran successfully"})
+            # Scrape now; new articles are translated in the background
+            from src.main import RSS_FEEDS, scrape_feeds
+            articles = scrape_feeds(RSS_FEEDS, num_articles=2)
+            return jsonify({"status": "success",
+                            "message": f"Scraper ran successfully. {len(articles)} new articles are being translated in the background."})
         except Exception as e:
             return jsonify({"status": "error", "message": f"Error running scraper: {str(e)}"})
 
@@ -0,0 +1,73 @@
+"""
+Benchmark: compiled glossary vs one re.sub per entry
+
+Usage: python benchmarks/bench_glossary.py [num_entries]
+"""
+import os
+import re
+import sys
+import time
+import random
+
+# Fix import paths
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(current_dir))  # Add parent directory to path
+
+from src.glossary import Glossary
+
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+def make_glossary(count, seed=42):
+    """Build a reproducible glossary of made-up words and two-word phrases"""
+    rng = random.Random(seed)
+    entries = {}
+    while len(entries) < count:
+        words = [''.join(rng.choice(LETTERS) for _ in range(rng.randint(3, 9)))
+                 for _ in range(rng.choice((1, 1, 1, 2)))]
+        entries[' '.join(words)] = f"த{len(entries)}"
+    return entries
+
+def make_texts(entries, count=200, seed=7):
+    """Headlines mixing glossary terms with other words"""
+    rng = random.Random(seed)
+    terms = list(entries)
+    texts = []
+    for _ in range(count):
+        words = rng.sample(terms, 5) + ["today", "the", "city", "children", "school"]
+        rng.shuffle(words)
+        texts.append(' '.join(words).capitalize())
+    return texts
+
+def legacy_translate(entries, text):
+    """The per-entry substitution this benchmark replaces (longest terms first, to match the glossary)"""
+    result = text
+    for eng, tam in sorted(entries.items(), key=lambda item: -len(item[0])):
+        result = re.sub(r'\b' + re.escape(eng) + r'\b', tam, result, flags=re.IGNORECASE)
+    return result
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    entries = make_glossary(count)
+    texts = make_texts(entries)
+    print(f"Glossary of {count} entries, {len(texts)} headlines")
+
+    start = time.perf_counter()
+    glossary = Glossary(entries)
+    print(f"{'compile glossary':<24} {time.perf_counter() - start:8.3f}s")
+
+    start = time.perf_counter()
+    compiled = [glossary.translate(text) for text in texts]
+    elapsed = time.perf_counter() - start
+    print(f"{'compiled glossary':<24} {elapsed:8.3f}s ({elapsed / len(texts) * 1e6:.0f} us/text)")
+
+    # The per-entry loop is far too slow for the whole set; time a sample
+    sample = texts[:5]
+    start = time.perf_counter()
+    legacy = [legacy_translate(entries, text) for text in sample]
+    elapsed = time.perf_counter() - start
+    print(f"{'re.sub per entry':<24} {elapsed:8.3f}s ({elapsed / len(sample) * 1e6:.0f} us/text)")
+
+    assert legacy == compiled[:len(sample)], "compiled glossary differs from per-entry substitution"
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark: single-pass normalize_text vs the previous two-regex clean_html
+
+Usage: python benchmarks/bench_normalize.py [repeat] [num_texts]
+"""
+import os
+import re
+import sys
+import time
+import random
+from html import unescape
+
+# Fix import paths
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(current_dir))  # Add parent directory to path
+
+from src.utils import normalize_text
+
+WORDS = ["Chennai", "schools", "rain", "children", "science", "fair", "metro", "cricket", "team",
+         "wins", "library", "opens", "today", "city", "students", "சென்னை", "மழை", "பள்ளி", "குழந்தைகள்"]
+# Markup and entities as they appear in feed titles and summaries
+DECORATIONS = ["<p>", "</p>", "<br/>", "<b>", "</b>", '<a href="https://example.com/news?id=1&amp;s=2">',
+               "</a>", "&amp;", "&nbsp;", "&#8217;", "&quot;", "&#x2014;", "\n", "\t", "  "]
+
+def legacy_clean_html(html_text):
+    """The clean_html implementation this benchmark replaces"""
+    clean_text = re.sub(r'<[^>]+>', ' ', html_text)
+    clean_text = unescape(clean_text)
+    clean_text = re.sub(r'\s+', ' ', clean_text).strip()
+    return clean_text
+
+def legacy_pipeline(text):
+    """translate_to_tamil cleaned the text, then detect_language cleaned it again"""
+    return legacy_clean_html(legacy_clean_html(text))
+
+# Inputs whose whitespace comes partly from entities
+WHITESPACE_CASES = [
+    "Hello&#10; world", "a&#13;\nb", " &ensp; ", "x&nbsp;&nbsp; y", "a&NewLine;&Tab;b",
+    "a &#x0A; b", "a&#0010;b", "a&#x20;&#32;b", "<p>Rain</p>&#10;<p>in Chennai</p>",
+]
+
+# normalize_text drops comments and script/style contents, which legacy_clean_html kept
+DROPPED_MARKUP = re.compile(r'<!--|<script\b|<style\b', re.IGNORECASE)
+
+def check_equal(texts):
+    """Fail if normalize_text disagrees with legacy_clean_html on any comparable text"""
+    mismatches = [text for text in texts
+                  if not DROPPED_MARKUP.search(text) and normalize_text(text) != legacy_clean_html(text)]
+    for text in mismatches[:5]:
+        print(f"Mismatch: {text!r}: {normalize_text(text)!r} != {legacy_clean_html(text)!r}")
+    assert not mismatches, f"{len(mismatches)} texts normalized differently"
+    print(f"Outputs equal for {len(texts)} texts")
+
+def make_texts(count, seed=42):
+    """Reproducible titles and summaries mixing words, tags, entities and stray whitespace"""
+    rng = random.Random(seed)
+    texts = []
+    for index in range(count):
+        length = rng.randint(6, 12) if index % 2 == 0 else rng.randint(25, 60)
+        parts = []
+        for _ in range(length):
+            parts.append(rng.choice(WORDS))
+            if rng.random() < 0.3:
+                parts.append(rng.choice(DECORATIONS))
+        texts.append(' '.join(parts))
+    return texts
+
+def timed(label, function, texts, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            function(text)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:8.3f}s  ({elapsed / (repeat * len(texts)) * 1e6:.1f} us/text)")
+
+def main():
+    repeat = max(1, int(sys.argv[1])) if len(sys.argv) > 1 else 200
+    count = max(1, int(sys.argv[2])) if len(sys.argv) > 2 else 200
+    texts = make_texts(count)
+    check_equal(texts + WHITESPACE_CASES)
+    print(f"Normalizing {len(texts)} titles and summaries x {repeat}")
+
+    timed("legacy clean_html", legacy_clean_html, texts, repeat)
+    timed("legacy clean twice", legacy_pipeline, texts, repeat)
+    timed("normalize_text", normalize_text, texts, repeat)
+
+if __name__ == "__main__":
+    main()
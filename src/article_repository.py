@@ -0,0 +1,447 @@
+"""
+Article repository backed by SQLite
+
+Processed articles are stored one row per article, keyed by their stable
+content-hash key (see seen_index.article_key) instead of their position in
+a list. The fields the app filters on (approved, title_language,
+needs_translation, published, feed, translation_status) are indexed columns next to the full
+article JSON, so reading or changing one article touches one row, and listing the
+approved articles is an index lookup. The database runs in WAL mode, so the
+web app and the scheduler can read while the other writes.
+
+ARTICLE_BACKEND selects the storage: "sqlite" (default) or "json" (the
+in-memory ArticleStore over data/processed_news.json). Both have the same
+interface. On first use an empty database is filled from the JSON files.
+
+Usage: python src/article_repository.py   (re-import the JSON files)
+"""
+import os
+import sys
+import json
+import sqlite3
+import threading
+
+# Fix import paths
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(current_dir))  # Add parent directory to path
+
+from src.utils import ensure_dir_exists, load_json_file
+from src.seen_index import article_key
+from src.dedup import band_keys
+from src.article_store import (get_article_store, published_date, until_bound, PROCESSED_NEWS_FILE,
+                               ARTICLE_PAGE_SIZE)
+
+ARTICLE_DB_FILE = os.path.join("data", "articles.db")
+APPROVED_NEWS_FILE = os.path.join("data", "approved_news.json")
+ARTICLE_BACKEND = os.environ.get('ARTICLE_BACKEND', 'sqlite')
+
+# Article fields kept in their own columns; all are indexed except edited
+COLUMNS = ('approved', 'title_language', 'needs_translation', 'published', 'translation_status', 'edited',
+           'feed')
+INDEXED_COLUMNS = ('approved', 'title_language', 'needs_translation', 'published', 'feed', 'translation_status')
+
+SORT_ORDERS = {
+    "added": "position",
+    "newest": "published DESC, position",
+    "oldest": "published, position",
+}
+REVIEW_CONDITIONS = {
+    "approved": "approved = 1",
+    "rejected": "approved = 0",
+    "unreviewed": "approved IS NULL",
+}
+
+# Total and approved counters, kept up to date by triggers instead of recounted
+COUNTER_TRIGGERS = """
+    CREATE TRIGGER IF NOT EXISTS articles_count_insert AFTER INSERT ON articles BEGIN
+        UPDATE article_counters SET value = value + 1 WHERE name = 'total';
+        UPDATE article_counters SET value = value + (NEW.approved IS 1) WHERE name = 'approved';
+    END;
+    CREATE TRIGGER IF NOT EXISTS articles_count_delete AFTER DELETE ON articles BEGIN
+        UPDATE article_counters SET value = value - 1 WHERE name = 'total';
+        UPDATE article_counters SET value = value - (OLD.approved IS 1) WHERE name = 'approved';
+    END;
+    CREATE TRIGGER IF NOT EXISTS articles_count_approve AFTER UPDATE OF approved ON articles BEGIN
+        UPDATE article_counters SET value = value + (NEW.approved IS 1) - (OLD.approved IS 1)
+            WHERE name = 'approved';
+    END;
+"""
+
+def _flag(value):
+    """Boolean article field as a column value (None if the field is not set)"""
+    return None if value is None else int(bool(value))
+
+def _column_values(article):
+    """Values of the indexed columns for an article"""
+    return (
+        _flag(article.get('approved')),
+        article.get('title_language'),
+        _flag(article.get('needs_translation')),
+        published_date(article.get('published')),
+        article.get('translation_status'),
+        _flag(article.get('edited')),
+        article.get('feed'),
+    )
+
+class ArticleRepository:
+    """
+    SQLite store of processed articles
+
+    Safe to share between threads. Articles returned are copies; change
+    them through update() or update_many().
+    """
+
+    def __init__(self, filepath=ARTICLE_DB_FILE):
+        self.filepath = filepath
+        self.lock = threading.Lock()
+
+        ensure_dir_exists(os.path.dirname(filepath))
+        self.connection = sqlite3.connect(filepath, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS articles (
+                position INTEGER PRIMARY KEY AUTOINCREMENT,
+                key TEXT NOT NULL UNIQUE,
+                approved INTEGER,
+                title_language TEXT,
+                needs_translation INTEGER,
+                published TEXT,
+                translation_status TEXT,
+                edited INTEGER,
+                feed TEXT,
+                data TEXT NOT NULL
+            )
+        """)
+        # Databases created before the feed column existed
+        columns = [row[1] for row in self.connection.execute("PRAGMA table_info(articles)")]
+        if 'feed' not in columns:
+            self.connection.execute("ALTER TABLE articles ADD COLUMN feed TEXT")
+            self.connection.execute("UPDATE articles SET feed = json_extract(data, '$.feed')")
+        for column in INDEXED_COLUMNS:
+            self.connection.execute(
+                f"CREATE INDEX IF NOT EXISTS articles_{column} ON articles ({column})")
+
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS article_counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        if self.connection.execute("SELECT COUNT(*) FROM article_counters").fetchone()[0] == 0:
+            # One full count when the counters are created; triggers keep them current after that
+            self.connection.execute("""
+                INSERT INTO article_counters
+                SELECT 'total', COUNT(*) FROM articles
+                UNION ALL SELECT 'approved', COUNT(*) FROM articles WHERE approved = 1
+            """)
+        self.connection.executescript(COUNTER_TRIGGERS)
+
+        # Near-duplicate band keys (see dedup.band_keys), so a scrape looks up candidates by index
+        has_bands = self.connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'article_bands'").fetchone()
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS article_bands (band_key TEXT NOT NULL, key TEXT NOT NULL)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS article_bands_band_key ON article_bands (band_key)")
+        if not has_bands:
+            # Databases created before band keys were stored
+            for data, in self.connection.execute("SELECT data FROM articles").fetchall():
+                article = json.loads(data)
+                self._insert_bands(article['key'], band_keys(article))
+        self.connection.commit()
+
+    def _select(self, where="", params=(), order="position", limit=-1, offset=0):
+        """Articles matching a WHERE clause, in stored order unless given another (lock held)"""
+        rows = self.connection.execute(
+            f"SELECT data FROM articles {where} ORDER BY {order} LIMIT ? OFFSET ?",
+            (*params, limit, offset)).fetchall()
+        return [json.loads(data) for data, in rows]
+
+    def _insert(self, article):
+        """Insert an article unless its key is stored already (lock held)"""
+        key = article_key(article)
+        article = dict(article, key=key)
+        placeholders = ", ".join("?" for _ in COLUMNS)
+        cursor = self.connection.execute(
+            f"INSERT OR IGNORE INTO articles (key, {', '.join(COLUMNS)}, data) VALUES (?, {placeholders}, ?)",
+            (key, *_column_values(article), json.dumps(article, ensure_ascii=False)))
+        if cursor.rowcount:
+            self._insert_bands(key, band_keys(article))
+        return cursor.rowcount
+
+    def _insert_bands(self, key, keys):
+        """Store an article's near-duplicate band keys (lock held)"""
+        self.connection.executemany("INSERT INTO article_bands (band_key, key) VALUES (?, ?)",
+                                    [(band_key, key) for band_key in keys])
+
+    def _write(self, article):
+        """Store the new state of an existing article (lock held)"""
+        self.connection.execute(
+            f"UPDATE articles SET {', '.join(f'{column} = ?' for column in COLUMNS)}, data = ? WHERE key = ?",
+            (*_column_values(article), json.dumps(article, ensure_ascii=False), article['key']))
+
+    def all(self):
+        """
+        All articles, in stored order
+
+        Returns:
+        - List of article dictionaries
+        """
+        with self.lock:
+            return self._select()
+
+    def get(self, key):
+        """
+        One article by key
+
+        Parameters:
+        - key: Article key (see seen_index.article_key)
+
+        Returns:
+        - Article dictionary, or None if there is no such article
+        """
+        with self.lock:
+            articles = self._select("WHERE key = ?", (key,))
+        return articles[0] if articles else None
+
+    def approved(self):
+        """
+        Approved articles, in stored order
+
+        Returns:
+        - List of article dictionaries
+        """
+        with self.lock:
+            return self._select("WHERE approved = 1")
+
+    def translation_candidates(self, statuses):
+        """
+        Articles the background translation stage may have to work on
+
+        Parameters:
+        - statuses: Translation statuses to include
+
+        Returns:
+        - List of article dictionaries not edited by a reviewer whose status is one
+          of statuses, or that have no status yet and need translation
+        """
+        placeholders = ", ".join("?" for _ in statuses)
+        with self.lock:
+            return self._select(
+                f"WHERE edited IS NOT 1 AND (translation_status IN ({placeholders}) "
+                "OR (translation_status IS NULL AND needs_translation = 1))", tuple(statuses))
+
+    def list_articles(self, filters=None, sort="added", page=1, per_page=ARTICLE_PAGE_SIZE):
+        """
+        One page of articles matching filters
+
+        Parameters:
+        - filters: Dictionary with any of language, review ('approved', 'rejected' or
+                   'unreviewed'), needs_translation, feed, since and until (ISO dates;
+                   until includes the whole day or time given) (default: none)
+        - sort: 'added' (stored order), 'newest' or 'oldest' (by publication date)
+        - page: Page number, from 1
+        - per_page: Articles per page
+
+        Returns:
+        - (list of article dictionaries, number of matching articles)
+        """
+        filters = filters or {}
+        conditions = []
+        params = []
+        if filters.get('language'):
+            conditions.append("title_language = ?")
+            params.append(filters['language'])
+        if filters.get('review'):
+            conditions.append(REVIEW_CONDITIONS[filters['review']])
+        if filters.get('needs_translation') is not None:
+            conditions.append("needs_translation = ?")
+            params.append(int(filters['needs_translation']))
+        if filters.get('feed'):
+            conditions.append("feed = ?")
+            params.append(filters['feed'])
+        if filters.get('since'):
+            conditions.append("published >= ?")
+            params.append(filters['since'])
+        if filters.get('until'):
+            # A plain comparison, so the published index can be used
+            conditions.append("published < ?")
+            params.append(until_bound(filters['until']))
+        where = "WHERE " + " AND ".join(conditions) if conditions else ""
+
+        with self.lock:
+            matching = self.connection.execute(
+                f"SELECT COUNT(*) FROM articles {where}", params).fetchone()[0]
+            articles = self._select(where, params, SORT_ORDERS[sort], per_page, (page - 1) * per_page)
+        return articles, matching
+
+    def counters(self):
+        """
+        Article counters, kept up to date by triggers as articles change
+
+        Returns:
+        - Dictionary with total and approved
+        """
+        with self.lock:
+            return dict(self.connection.execute("SELECT name, value FROM article_counters").fetchall())
+
+    def similar_articles(self, keys):
+        """
+        Stored articles sharing at least one near-duplicate band key
+
+        Parameters:
+        - keys: Band keys from dedup.band_keys
+
+        Returns:
+        - List of candidate article dictionaries
+        """
+        placeholders = ", ".join("?" for _ in keys)
+        with self.lock:
+            return self._select(
+                f"WHERE key IN (SELECT key FROM article_bands WHERE band_key IN ({placeholders}))", keys)
+
+    def update(self, key, fields):
+        """
+        Change fields of one article and save
+
+        Parameters:
+        - key: Article key
+        - fields: Dictionary of fields to set
+
+        Returns:
+        - The updated article, or None if there is no such article
+        """
+        with self.lock:
+            articles = self._select("WHERE key = ?", (key,))
+            if not articles:
+                return None
+            article = articles[0]
+            article.update(fields)
+            self._write(article)
+            self.connection.commit()
+            return article
+
+    def update_many(self, updates, condition=None):
+        """
+        Change fields of several articles in one transaction
+
+        Parameters:
+        - updates: Dictionary of article key -> fields to set
+        - condition: Only update articles for which condition(article) is true (default: all)
+
+        Returns:
+        - Number of articles updated
+        """
+        def fields_for(fields):
+            return lambda article: fields if condition is None or condition(article) else None
+        results = self.apply_updates({key: fields_for(fields) for key, fields in updates.items()})
+        return sum(1 for article in results.values() if article is not None)
+
+    def apply_updates(self, functions):
+        """
+        Change several articles, each by its own function, in one transaction
+
+        If a function raises, the transaction is rolled back and every
+        article is left as it was.
+
+        Parameters:
+        - functions: Dictionary of article key -> function called with the
+                     article and returning the fields to set, or None to skip it
+
+        Returns:
+        - Dictionary of article key -> updated article, or None if the article
+          does not exist or was skipped
+        """
+        results = {}
+        with self.lock, self.connection:
+            for key, function in functions.items():
+                articles = self._select("WHERE key = ?", (key,))
+                fields = function(articles[0]) if articles else None
+                if fields is None:
+                    results[key] = None
+                    continue
+                articles[0].update(fields)
+                self._write(articles[0])
+                results[key] = articles[0]
+        return results
+
+    def add(self, articles):
+        """
+        Insert articles whose keys are not stored yet
+
+        Parameters:
+        - articles: Processed article dictionaries
+
+        Returns:
+        - Number of articles added
+        """
+        with self.lock:
+            added = sum(self._insert(article) for article in articles)
+            self.connection.commit()
+        return added
+
+    def replace(self, articles):
+        """
+        Replace all stored articles in one transaction
+
+        Parameters:
+        - articles: Processed article dictionaries
+        """
+        with self.lock:
+            self.connection.execute("DELETE FROM articles")
+            self.connection.execute("DELETE FROM article_bands")
+            for article in articles:
+                self._insert(article)
+            self.connection.commit()
+
+    def count(self):
+        """Number of stored articles"""
+        return self.counters()['total']
+
+def import_json_articles(repository, filepath=PROCESSED_NEWS_FILE, approved_filepath=APPROVED_NEWS_FILE):
+    """
+    Add the articles of the JSON files to a repository
+
+    Articles already in the repository are left as they are. Articles listed
+    in the approved file are marked approved.
+
+    Parameters:
+    - repository: ArticleRepository to fill
+    - filepath: Processed articles file (default: "data/processed_news.json")
+    - approved_filepath: Approved articles file (default: "data/approved_news.json")
+
+    Returns:
+    - Number of articles added
+    """
+    articles = load_json_file(filepath) or []
+    approved_keys = {article_key(article) for article in load_json_file(approved_filepath) or []}
+    for article in articles:
+        if article_key(article) in approved_keys:
+            article['approved'] = True
+
+    added = repository.add(articles)
+    print(f"Imported {added} of {len(articles)} articles from {filepath} into {repository.filepath}")
+    return added
+
+_repository = None
+_repository_lock = threading.Lock()
+
+def get_article_repository(backend=None):
+    """
+    Shared article storage for this process
+
+    Parameters:
+    - backend: "sqlite" or "json" (default: ARTICLE_BACKEND)
+
+    Returns:
+    - ArticleRepository, or the ArticleStore for the "json" backend
+    """
+    global _repository
+    if (backend or ARTICLE_BACKEND) == 'json':
+        return get_article_store(PROCESSED_NEWS_FILE)
+
+    with _repository_lock:
+        if _repository is None:
+            _repository = ArticleRepository()
+            if _repository.count() == 0 and os.path.exists(PROCESSED_NEWS_FILE):
+                import_json_articles(_repository)
+        return _repository
+
+if __name__ == "__main__":
+    import_json_articles(ArticleRepository())
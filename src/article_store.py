@@ -0,0 +1,533 @@
+"""
+Process-level store for processed articles
+
+The articles file is parsed once and served from memory. Before every
+access the store compares the modification time and size of the file and
+its journal with what it last saw, and reloads only if another process
+(e.g. the scheduler) changed them.
+
+Changes to single articles (approve, reject, edit, translation results)
+are not written by rewriting the file: each one is appended to a journal
+next to it (processed_news.json.journal) and fsync'd, so a review action
+costs one small write however many articles there are. Once the journal
+has JOURNAL_COMPACT_ENTRIES entries a background thread folds it into the
+snapshot (written to a temp file and renamed into place) and empties it.
+Loading replays the journal over the snapshot, so changes made before a
+crash are recovered; a torn last line is ignored. Writers in this process
+share one lock, and writers in other processes are kept out by a lock file.
+
+This is the "json" backend of src/article_repository.py and has the same
+interface as the SQLite ArticleRepository.
+"""
+import os
+import sys
+import json
+import datetime
+import threading
+from contextlib import contextmanager
+
+# Fix import paths
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(current_dir))  # Add parent directory to path
+
+from src.utils import ensure_dir_exists
+from src.seen_index import article_key
+from src.dedup import band_keys
+from src.feed_stream import parse_entry_date
+
+# File locks between processes (not available on Windows)
+try:
+    import fcntl
+    FILE_LOCKS_AVAILABLE = True
+except ImportError:
+    FILE_LOCKS_AVAILABLE = False
+
+PROCESSED_NEWS_FILE = os.path.join("data", "processed_news.json")
+
+# Fold the journal into the snapshot once it has this many entries
+JOURNAL_COMPACT_ENTRIES = int(os.environ.get('ARTICLE_JOURNAL_COMPACT_ENTRIES', 200))
+
+# Article listings
+ARTICLE_PAGE_SIZE = 20
+SORT_ORDERS = ("added", "newest", "oldest")
+REVIEW_STATES = ("approved", "rejected", "unreviewed")
+
+def published_date(value):
+    """Publication date as a sortable ISO string (None if there is none)"""
+    parsed = parse_entry_date(value) if isinstance(value, str) else None
+    return parsed.isoformat() if parsed else value
+
+# Length of an 'until' filter value -> the step to its exclusive upper bound
+UNTIL_PRECISION = {
+    10: datetime.timedelta(days=1),      # 2024-05-01
+    13: datetime.timedelta(hours=1),     # 2024-05-01T10
+    16: datetime.timedelta(minutes=1),   # 2024-05-01T10:30
+    19: datetime.timedelta(seconds=1),   # 2024-05-01T10:30:15
+}
+
+def until_bound(until):
+    """
+    Exclusive upper bound of an 'until' filter, which includes the whole day or time given
+
+    Parameters:
+    - until: ISO date or date and time
+
+    Returns:
+    - ISO string; an article matches when its published date sorts before it
+    """
+    step = UNTIL_PRECISION.get(len(until), datetime.timedelta(microseconds=1))
+    try:
+        bound = datetime.datetime.fromisoformat(until) + step
+    except (ValueError, OverflowError):
+        # Not a date, or the last day there is: everything that starts with it still sorts before this
+        return until + "\uffff"
+    return bound.date().isoformat() if len(until) == 10 else bound.isoformat()
+
+def review_state(article):
+    """'approved', 'rejected' or 'unreviewed'"""
+    approved = article.get('approved')
+    if approved is None:
+        return "unreviewed"
+    return "approved" if approved else "rejected"
+
+def article_matches(article, filters):
+    """
+    Whether an article passes listing filters
+
+    Parameters:
+    - article: Article dictionary
+    - filters: Dictionary with any of language, review, needs_translation, feed,
+               since and until (ISO dates; until includes the whole day or time given)
+
+    Returns:
+    - True if every filter given matches
+    """
+    if filters.get('language') and article.get('title_language') != filters['language']:
+        return False
+    if filters.get('review') and review_state(article) != filters['review']:
+        return False
+    if filters.get('needs_translation') is not None and \
+            bool(article.get('needs_translation')) != filters['needs_translation']:
+        return False
+    if filters.get('feed') and article.get('feed') != filters['feed']:
+        return False
+    published = published_date(article.get('published')) or ""
+    if filters.get('since') and published < filters['since']:
+        return False
+    if filters.get('until') and published >= until_bound(filters['until']):
+        return False
+    return True
+
+def _file_state(filepath):
+    """(mtime_ns, size) of a file, or None if it does not exist"""
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+class ArticleStore:
+    """
+    In-memory copy of an articles file and its journal, reloaded when they change on disk
+
+    Safe to share between threads and processes. Lists and articles returned
+    by the store are shared; change them only through the store's methods.
+    """
+
+    def __init__(self, filepath=PROCESSED_NEWS_FILE, compact_entries=JOURNAL_COMPACT_ENTRIES):
+        self.filepath = filepath
+        self.journal_path = f"{filepath}.journal"
+        self.compact_entries = compact_entries
+        self.lock = threading.RLock()
+        self.articles = []
+        self.positions = {}          # Article key -> position in self.articles
+        self.counts = {"total": 0, "approved": 0}
+        self.bands = None            # Near-duplicate band key -> article keys, built on first use
+        self.file_state = None       # States of the snapshot and journal when last read or written
+        self.journal_entries = 0
+        self.journal_torn = False    # Journal ends in a partly written entry
+        self.compactor = None
+
+    def _stat(self):
+        return _file_state(self.filepath), _file_state(self.journal_path)
+
+    @contextmanager
+    def _file_lock(self):
+        """Hold the lock file shared with other processes writing the same articles"""
+        if not FILE_LOCKS_AVAILABLE:
+            yield
+            return
+        ensure_dir_exists(os.path.dirname(self.filepath))
+        with open(f"{self.filepath}.lock", 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _refresh(self):
+        """Reload the snapshot and replay the journal if either changed (lock held)"""
+        file_state = self._stat()
+        if file_state == self.file_state:
+            return
+        articles = []
+        if file_state[0] is not None:
+            try:
+                with open(self.filepath, 'r', encoding='utf-8') as f:
+                    articles = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Error loading articles from {self.filepath}: {e}")
+                return
+        self.articles = articles
+        self.bands = None
+        self._index()
+        self._replay()
+        self.counts = {"total": len(self.articles),
+                       "approved": sum(1 for article in self.articles if article.get('approved'))}
+        self.file_state = file_state
+
+    def _replay(self):
+        """Apply the journal's entries to the loaded articles (lock held)"""
+        self.journal_entries = 0
+        self.journal_torn = False
+        try:
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            print(f"Error reading article journal {self.journal_path}: {e}")
+            return
+
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # Only the last entry can be partly written, by a crash mid-append
+                print(f"Ignoring incomplete entry at the end of {self.journal_path}")
+                self.journal_torn = True
+                break
+            position = self.positions.get(entry['key'])
+            if position is not None:
+                self.articles[position].update(entry['fields'])
+            self.journal_entries += 1
+
+    def _index(self):
+        """Give every article a key and rebuild the key lookup (lock held)"""
+        self.positions = {}
+        for position, article in enumerate(self.articles):
+            article.setdefault('key', article_key(article))
+            self.positions[article['key']] = position
+
+    def _apply(self, article, fields):
+        """Change an article's fields, keeping the counters up to date (lock held)"""
+        was_approved = bool(article.get('approved'))
+        article.update(fields)
+        self.counts['approved'] += bool(article.get('approved')) - was_approved
+
+    def _append(self, changes):
+        """
+        Record changes to single articles in the journal (lock and file lock held)
+
+        Parameters:
+        - changes: List of (article key, fields set) pairs
+        """
+        if self.journal_torn:
+            # Start from a clean journal rather than appending after a partial entry
+            self._write()
+        now = datetime.datetime.now().isoformat()
+        lines = "".join(json.dumps({"time": now, "key": key, "fields": fields}, ensure_ascii=False) + "\n"
+                        for key, fields in changes)
+        ensure_dir_exists(os.path.dirname(self.journal_path))
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        self.journal_entries += len(changes)
+        self.file_state = self._stat()
+        if self.journal_entries >= self.compact_entries:
+            self._start_compaction()
+
+    def _write(self):
+        """Write all articles to a new snapshot atomically and empty the journal (lock and file lock held)"""
+        ensure_dir_exists(os.path.dirname(self.filepath))
+        temp_path = f"{self.filepath}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.articles, f, ensure_ascii=False, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.filepath)
+        # Replaying the journal over the new snapshot would be harmless, so a
+        # crash before it is emptied loses nothing
+        if os.path.exists(self.journal_path):
+            open(self.journal_path, 'w').close()
+        self.journal_entries = 0
+        self.journal_torn = False
+        self._index()
+        self.file_state = self._stat()
+
+    def compact(self):
+        """
+        Fold the journal into the snapshot
+
+        Returns:
+        - Number of journal entries folded
+        """
+        with self.lock, self._file_lock():
+            self._refresh()
+            entries = self.journal_entries
+            if entries or self.journal_torn:
+                self._write()
+            return entries
+
+    def _start_compaction(self):
+        """Compact in a background thread unless one is already running (lock held)"""
+        if self.compactor is not None and self.compactor.is_alive():
+            return
+
+        def run():
+            try:
+                entries = self.compact()
+                print(f"Compacted {entries} journal entries into {self.filepath}")
+            except Exception as e:
+                print(f"Error compacting article journal: {e}")
+
+        self.compactor = threading.Thread(target=run, name="article-compactor", daemon=True)
+        self.compactor.start()
+
+    def all(self):
+        """
+        All articles, in stored order
+
+        Returns:
+        - List of article dictionaries (shared, do not modify)
+        """
+        with self.lock:
+            self._refresh()
+            return self.articles
+
+    def get(self, key):
+        """
+        One article by key
+
+        Parameters:
+        - key: Article key (see seen_index.article_key)
+
+        Returns:
+        - Article dictionary, or None if there is no such article
+        """
+        with self.lock:
+            self._refresh()
+            position = self.positions.get(key)
+            return self.articles[position] if position is not None else None
+
+    def approved(self):
+        """
+        Approved articles, in stored order
+
+        Returns:
+        - List of article dictionaries (shared, do not modify)
+        """
+        return [article for article in self.all() if article.get('approved', False)]
+
+    def translation_candidates(self, statuses):
+        """
+        Articles the background translation stage may have to work on
+
+        Parameters:
+        - statuses: Translation statuses to include
+
+        Returns:
+        - List of article dictionaries not edited by a reviewer whose status is one
+          of statuses, or that have no status yet and need translation (shared, do not modify)
+        """
+        return [article for article in self.all() if not article.get('edited') and
+                (article.get('translation_status') in statuses or
+                 (article.get('translation_status') is None and article.get('needs_translation')))]
+
+    def list_articles(self, filters=None, sort="added", page=1, per_page=ARTICLE_PAGE_SIZE):
+        """
+        One page of articles matching filters
+
+        Parameters:
+        - filters: Listing filters (see article_matches; default: none)
+        - sort: 'added' (stored order), 'newest' or 'oldest' (by publication date)
+        - page: Page number, from 1
+        - per_page: Articles per page
+
+        Returns:
+        - (list of article dictionaries, number of matching articles)
+        """
+        with self.lock:
+            self._refresh()
+            matching = [article for article in self.articles if article_matches(article, filters or {})]
+        if sort in ("newest", "oldest"):
+            matching = sorted(matching, key=lambda article: published_date(article.get('published')) or "",
+                              reverse=sort == "newest")
+        start = (page - 1) * per_page
+        return matching[start:start + per_page], len(matching)
+
+    def counters(self):
+        """
+        Article counters, kept up to date as articles change
+
+        Returns:
+        - Dictionary with total and approved
+        """
+        with self.lock:
+            self._refresh()
+            return dict(self.counts)
+
+    def _add_bands(self, key, keys):
+        """Add an article's near-duplicate band keys to the lookup (lock held)"""
+        for band_key in keys:
+            self.bands.setdefault(band_key, set()).add(key)
+
+    def similar_articles(self, keys):
+        """
+        Stored articles sharing at least one near-duplicate band key
+
+        Parameters:
+        - keys: Band keys from dedup.band_keys
+
+        Returns:
+        - List of candidate article dictionaries (shared, do not modify)
+        """
+        with self.lock:
+            self._refresh()
+            if self.bands is None:
+                self.bands = {}
+                for article in self.articles:
+                    self._add_bands(article['key'], band_keys(article))
+            matches = set()
+            for band_key in keys:
+                matches.update(self.bands.get(band_key, ()))
+            return [self.articles[self.positions[key]] for key in matches]
+
+    def update(self, key, fields):
+        """
+        Change fields of one article and record the change in the journal
+
+        Parameters:
+        - key: Article key
+        - fields: Dictionary of fields to set
+
+        Returns:
+        - The updated article, or None if there is no such article
+        """
+        with self.lock, self._file_lock():
+            self._refresh()
+            position = self.positions.get(key)
+            if position is None:
+                return None
+            self._apply(self.articles[position], fields)
+            self._append([(key, fields)])
+            return self.articles[position]
+
+    def update_many(self, updates, condition=None):
+        """
+        Change fields of several articles and save them in one journal write
+
+        Parameters:
+        - updates: Dictionary of article key -> fields to set
+        - condition: Only update articles for which condition(article) is true (default: all)
+
+        Returns:
+        - Number of articles updated
+        """
+        def fields_for(fields):
+            return lambda article: fields if condition is None or condition(article) else None
+        results = self.apply_updates({key: fields_for(fields) for key, fields in updates.items()})
+        return sum(1 for article in results.values() if article is not None)
+
+    def apply_updates(self, functions):
+        """
+        Change several articles, each by its own function, as one journal write
+
+        The functions are all called before anything is changed, so an error
+        leaves every article as it was.
+
+        Parameters:
+        - functions: Dictionary of article key -> function called with the
+                     article and returning the fields to set, or None to skip it
+
+        Returns:
+        - Dictionary of article key -> updated article, or None if the article
+          does not exist or was skipped
+        """
+        with self.lock, self._file_lock():
+            self._refresh()
+            results = {key: None for key in functions}
+            changes = []
+            for key, function in functions.items():
+                position = self.positions.get(key)
+                fields = function(self.articles[position]) if position is not None else None
+                if fields is not None:
+                    changes.append((key, fields))
+            for key, fields in changes:
+                article = self.articles[self.positions[key]]
+                self._apply(article, fields)
+                results[key] = article
+            if changes:
+                self._append(changes)
+            return results
+
+    def add(self, articles):
+        """
+        Append articles whose keys are not stored yet and save
+
+        Parameters:
+        - articles: Processed article dictionaries
+
+        Returns:
+        - Number of articles added
+        """
+        with self.lock, self._file_lock():
+            self._refresh()
+            new_articles = []
+            for article in articles:
+                key = article_key(article)
+                if key not in self.positions:
+                    self.positions[key] = None
+                    new_articles.append(dict(article, key=key))
+            for article in new_articles:
+                if self.bands is not None:
+                    self._add_bands(article['key'], band_keys(article))
+            self.articles = self.articles + new_articles
+            self.counts['total'] += len(new_articles)
+            self.counts['approved'] += sum(1 for article in new_articles if article.get('approved'))
+            self._write()
+            return len(new_articles)
+
+    def replace(self, articles):
+        """
+        Replace all stored articles and save
+
+        Parameters:
+        - articles: Processed article dictionaries
+        """
+        with self.lock, self._file_lock():
+            self.articles = [dict(article) for article in articles]
+            self.bands = None
+            self.counts = {"total": len(self.articles),
+                           "approved": sum(1 for article in self.articles if article.get('approved'))}
+            self._write()
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+def get_article_store(filepath=PROCESSED_NEWS_FILE):
+    """
+    Shared ArticleStore for an articles file
+
+    Parameters:
+    - filepath: Articles file (default: "data/processed_news.json")
+
+    Returns:
+    - ArticleStore instance
+    """
+    key = os.path.abspath(filepath)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = ArticleStore(filepath)
+        return _stores[key]
@@ -0,0 +1,173 @@
+"""
+MP3 frame handling for joining synthesized speech segments
+
+MP3 files are a sequence of independent frames, so segments can be joined
+by concatenating their frames, without decoding or re-encoding. ID3 tags
+and Xing/Info header frames are stripped from each segment (their lengths
+and tables would be wrong for the joined file), and silence is made of
+frames whose side information is all zeros, using the same header as the
+speech so every frame in the file has the same format.
+"""
+import os
+import sys
+
+# Fix import paths
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(current_dir))  # Add parent directory to path
+
+# Bitrates in kbps, by [MPEG-1 or not][bitrate index], for Layer III
+BITRATES = {
+    True: [None, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, None],
+    False: [None, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160, None],
+}
+# Sample rates in Hz, by MPEG version bits
+SAMPLE_RATES = {
+    0b11: [44100, 48000, 32000],   # MPEG-1
+    0b10: [22050, 24000, 16000],   # MPEG-2
+    0b00: [11025, 12000, 8000],    # MPEG-2.5
+}
+
+def parse_frame_header(data, offset=0):
+    """
+    Parse the 4-byte Layer III frame header at an offset
+
+    Parameters:
+    - data: MP3 bytes
+    - offset: Position of the header
+
+    Returns:
+    - Dictionary with length, samples, sample_rate, mpeg1 and mono, or None if
+      there is no valid Layer III header at the offset
+    """
+    if offset + 4 > len(data) or data[offset] != 0xFF or data[offset + 1] & 0xE0 != 0xE0:
+        return None
+
+    version = (data[offset + 1] >> 3) & 0b11
+    layer = (data[offset + 1] >> 1) & 0b11
+    bitrate_index = data[offset + 2] >> 4
+    rate_index = (data[offset + 2] >> 2) & 0b11
+    if version not in SAMPLE_RATES or layer != 0b01 or rate_index == 0b11:
+        return None
+
+    mpeg1 = version == 0b11
+    bitrate = BITRATES[mpeg1][bitrate_index]
+    if bitrate is None:
+        return None
+
+    sample_rate = SAMPLE_RATES[version][rate_index]
+    samples = 1152 if mpeg1 else 576
+    padding = (data[offset + 2] >> 1) & 1
+    length = samples // 8 * bitrate * 1000 // sample_rate + padding
+    return {
+        "length": length,
+        "samples": samples,
+        "sample_rate": sample_rate,
+        "mpeg1": mpeg1,
+        "mono": data[offset + 3] >> 6 == 0b11,
+    }
+
+def _id3v2_size(data):
+    """Size of an ID3v2 tag at the start of the data (0 if there is none)"""
+    if len(data) < 10 or data[:3] != b'ID3':
+        return 0
+    # Tag size is a 28-bit "syncsafe" integer, plus a 10-byte header (and footer if flagged)
+    size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+def _is_info_frame(data, offset, header):
+    """Whether a frame is a Xing/Info (VBR/encoder) header rather than audio"""
+    if header['mpeg1']:
+        side_info = 17 if header['mono'] else 32
+    else:
+        side_info = 9 if header['mono'] else 17
+    tag = data[offset + 4 + side_info:offset + 8 + side_info]
+    return tag in (b'Xing', b'Info', b'VBRI') or data[offset + 36:offset + 40] == b'VBRI'
+
+def iter_frames(data):
+    """
+    Yield (offset, header) for every audio frame in MP3 data
+
+    ID3v2 tags, Xing/Info frames and any junk between frames are skipped.
+
+    Parameters:
+    - data: MP3 bytes
+    """
+    offset = _id3v2_size(data)
+    end = len(data) - 128 if data[-128:-125] == b'TAG' else len(data)   # ID3v1 tag
+    first = True
+    while offset + 4 <= end:
+        header = parse_frame_header(data, offset)
+        if header is None or offset + header['length'] > end:
+            # Resynchronise on the next frame sync
+            offset = data.find(b'\xFF', offset + 1, end)
+            if offset < 0:
+                return
+            continue
+        if not (first and _is_info_frame(data, offset, header)):
+            yield offset, header
+        first = False
+        offset += header['length']
+
+def audio_frames(data):
+    """
+    Audio frames of an MP3 file without tags or info frames
+
+    Parameters:
+    - data: MP3 bytes
+
+    Returns:
+    - Bytes containing only the audio frames
+    """
+    return b''.join(data[offset:offset + header['length']] for offset, header in iter_frames(data))
+
+def silence_frames(reference, seconds):
+    """
+    Silent frames in the same format as a reference frame
+
+    Parameters:
+    - reference: MP3 bytes whose first frame header is copied
+    - seconds: Length of the silence
+
+    Returns:
+    - Bytes of silent frames (empty if the reference has no frames)
+    """
+    for offset, header in iter_frames(reference):
+        raw = bytearray(reference[offset:offset + 4])
+        raw[1] |= 0x01    # No CRC
+        raw[2] &= ~0x02   # No padding, so every frame has the same length
+        length = parse_frame_header(raw)['length']
+        frame = bytes(raw) + b'\x00' * (length - 4)
+        count = round(seconds * header['sample_rate'] / header['samples'])
+        return frame * count
+    return b''
+
+def segment_with_pause(data, pause=0):
+    """
+    Audio frames of one segment followed by silence in the same format
+
+    Parameters:
+    - data: MP3 bytes of the segment
+    - pause: Seconds of silence after the segment
+
+    Returns:
+    - MP3 frame bytes, ready to append to a file of the same format
+    """
+    frames = audio_frames(data)
+    if pause and frames:
+        return frames + silence_frames(frames, pause)
+    return frames
+
+def concatenate_mp3(segments, pauses=None):
+    """
+    Join MP3 segments frame by frame, with optional silence after each one
+
+    Parameters:
+    - segments: List of MP3 bytes, all in the same format
+    - pauses: Seconds of silence after each segment (default: none)
+
+    Returns:
+    - MP3 bytes of the joined audio
+    """
+    pauses = pauses or [0] * len(segments)
+    return b''.join(segment_with_pause(data, pause) for data, pause in zip(segments, pauses))
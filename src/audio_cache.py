@@ -0,0 +1,152 @@
+"""
+On-disk cache of synthesized speech segments
+
+Each segment's MP3 is stored under a hash of (text, voice, model), so
+regenerating an episode only synthesizes segments whose text changed. The
+cache is capped by size and evicts the least recently used files first
+(file modification times are bumped on every hit).
+"""
+import os
+import sys
+import hashlib
+import threading
+
+# Fix import paths
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(current_dir))  # Add parent directory to path
+
+from src.utils import ensure_dir_exists
+
+AUDIO_CACHE_DIR = os.path.join("data", "audio_cache")
+AUDIO_CACHE_MAX_BYTES = int(os.environ.get('AUDIO_CACHE_MAX_BYTES', 500 * 1024 * 1024))
+
+def audio_key(text, voice, model):
+    """
+    Cache key for a synthesized segment
+
+    Parameters:
+    - text: Segment text
+    - voice: TTS voice
+    - model: TTS model
+
+    Returns:
+    - Hex digest identifying the audio
+    """
+    text_hash = hashlib.sha256(text.encode('utf-8')).hexdigest()
+    return hashlib.sha256(f"{text_hash}|{voice}|{model}".encode('utf-8')).hexdigest()
+
+class AudioCache:
+    """
+    Size-capped LRU cache of MP3 segments, one file per segment
+
+    Safe to share between threads; statistics cover the life of the process.
+    """
+
+    def __init__(self, directory=AUDIO_CACHE_DIR, max_bytes=AUDIO_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "bytes_reused": 0}
+
+        ensure_dir_exists(directory)
+        self.total_bytes = sum(entry.stat().st_size for entry in os.scandir(directory)
+                               if entry.name.endswith('.mp3'))
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.mp3")
+
+    def get(self, text, voice, model):
+        """
+        Look up a cached segment
+
+        Parameters:
+        - text: Segment text
+        - voice: TTS voice
+        - model: TTS model
+
+        Returns:
+        - MP3 bytes, or None if the segment is not cached
+        """
+        path = self._path(audio_key(text, voice, model))
+        with self.lock:
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+                os.utime(path)   # Mark as recently used
+            except OSError:
+                self.stats['misses'] += 1
+                return None
+            self.stats['hits'] += 1
+            self.stats['bytes_reused'] += len(data)
+            return data
+
+    def put(self, text, voice, model, data):
+        """
+        Store a segment and evict old segments if the cache is over its size cap
+
+        Parameters:
+        - text: Segment text
+        - voice: TTS voice
+        - model: TTS model
+        - data: MP3 bytes
+        """
+        path = self._path(audio_key(text, voice, model))
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with self.lock:
+            previous = os.path.getsize(path) if os.path.exists(path) else 0
+            try:
+                with open(temp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(temp_path, path)
+            except OSError as e:
+                print(f"Error caching audio segment: {e}")
+                return
+            self.total_bytes += len(data) - previous
+            self._evict()
+
+    def _evict(self):
+        """Delete least recently used segments until under max_bytes (lock held)"""
+        if self.total_bytes <= self.max_bytes:
+            return
+        entries = sorted((entry for entry in os.scandir(self.directory) if entry.name.endswith('.mp3')),
+                         key=lambda entry: entry.stat().st_mtime)
+        for entry in entries:
+            if self.total_bytes <= self.max_bytes:
+                break
+            size = entry.stat().st_size
+            try:
+                os.remove(entry.path)
+            except OSError:
+                continue
+            self.total_bytes -= size
+
+    def summary(self):
+        """
+        Statistics for reporting
+
+        Returns:
+        - Dictionary with hits, misses, bytes reused and stored size
+        """
+        with self.lock:
+            return {
+                "hits": self.stats['hits'],
+                "misses": self.stats['misses'],
+                "bytes_reused": self.stats['bytes_reused'],
+                "stored_bytes": self.total_bytes,
+            }
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_audio_cache():
+    """
+    Shared AudioCache for this process
+
+    Returns:
+    - AudioCache instance
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = AudioCache()
+        return _cache
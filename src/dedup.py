@@ -0,0 +1,191 @@
+"""
+Near-duplicate story clustering across feeds
+
+Each article is reduced to its set of content words (the "shingles": title
+and summary words, lowercased, without stopwords and common suffixes). Two
+articles are the same story when the Jaccard similarity of their shingles
+is at least MIN_JACCARD; outlets reword headlines heavily, so this is far
+more tolerant than comparing hashes of the text.
+
+Candidates are found with MinHash LSH: a MinHash signature of the shingles
+is cut into bands, and only articles sharing a band key are compared. The
+band keys of stored articles are kept by the article repository, so a
+scrape only looks up the stored articles that can match instead of
+fingerprinting the whole store. Shingles themselves are never stored; they
+are recomputed from the text of the few candidates.
+"""
+import os
+import re
+import sys
+import hashlib
+
+# Fix import paths
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(current_dir))  # Add parent directory to path
+
+from src.utils import clean_html
+
+MIN_JACCARD = 0.35  # Shingle sets at least this similar are considered the same story
+
+# MinHash LSH: NUM_BANDS bands of ROWS_PER_BAND values. Pairs at MIN_JACCARD
+# share a band with probability 1 - (1 - 0.35 ** 2) ** 32, about 98.5%.
+NUM_BANDS = 32
+ROWS_PER_BAND = 2
+NUM_PERMUTATIONS = NUM_BANDS * ROWS_PER_BAND
+
+# Random-looking but fixed (a * x + b) mod p permutations, so band keys stay stable across runs
+_PRIME = (1 << 61) - 1
+_PERMUTATIONS = [
+    (int.from_bytes(hashlib.blake2b(f"a{index}".encode(), digest_size=8).digest(), 'big') % (_PRIME - 1) + 1,
+     int.from_bytes(hashlib.blake2b(f"b{index}".encode(), digest_size=8).digest(), 'big') % _PRIME)
+    for index in range(NUM_PERMUTATIONS)
+]
+
+# Common words that carry no information about the story itself
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "of", "to", "in", "on", "at", "for", "with",
+    "by", "from", "as", "is", "are", "was", "were", "be", "been", "it", "its",
+    "this", "that", "after", "over", "into", "says", "said", "will", "has", "have",
+    "his", "her", "their",
+}
+SUFFIXES = ("ing", "ed", "es", "s")
+
+# \w alone splits Tamil words at their vowel signs
+TOKEN_PATTERN = re.compile(r'[\w\u0B80-\u0BFF]+', re.UNICODE)
+
+def _stem(word):
+    """Strip one common English suffix, so 'rains' and 'rain' match"""
+    for suffix in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    return word
+
+def shingles(text):
+    """
+    Content words of a text
+
+    Parameters:
+    - text: Cleaned text
+
+    Returns:
+    - Set of stemmed words, without stopwords
+    """
+    return {_stem(word) for word in TOKEN_PATTERN.findall(text.lower()) if word not in STOPWORDS}
+
+def article_shingles(article):
+    """
+    Shingles of an article's title and summary
+
+    Parameters:
+    - article: Processed article dictionary
+
+    Returns:
+    - Set of words
+    """
+    if 'normalized_title' in article:
+        text = f"{article['normalized_title']} {article.get('normalized_summary', '')}"
+    else:
+        text = clean_html(f"{article.get('original_title', '')} {article.get('original_summary', '')}")
+    return shingles(text)
+
+def jaccard(first, second):
+    """Jaccard similarity of two sets (0.0 if both are empty)"""
+    union = len(first | second)
+    return len(first & second) / union if union else 0.0
+
+def minhash_signature(words):
+    """
+    MinHash signature of a set of words
+
+    Parameters:
+    - words: Set of shingles
+
+    Returns:
+    - List of NUM_PERMUTATIONS minimum hash values (empty if there are no words)
+    """
+    if not words:
+        return []
+    hashes = [int.from_bytes(hashlib.blake2b(word.encode('utf-8'), digest_size=8).digest(), 'big')
+              for word in words]
+    return [min((a * value + b) % _PRIME for value in hashes) for a, b in _PERMUTATIONS]
+
+def band_keys(article, words=None):
+    """
+    LSH band keys of an article; articles sharing a key are candidate duplicates
+
+    Parameters:
+    - article: Processed article dictionary
+    - words: The article's shingles, if already computed (default: computed here)
+
+    Returns:
+    - List of NUM_BANDS strings (empty if the article has no words)
+    """
+    signature = minhash_signature(article_shingles(article) if words is None else words)
+    keys = []
+    for band in range(len(signature) // ROWS_PER_BAND):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(repr(rows).encode(), digest_size=6).hexdigest()
+        keys.append(f"{band:02d}:{digest}")
+    return keys
+
+def deduplicate_articles(articles, existing=None, min_jaccard=MIN_JACCARD):
+    """
+    Keep one representative per cluster of near-duplicate articles
+
+    The first article of each cluster (in input order) is kept and records the
+    links of the copies it replaces under 'duplicate_links'. New articles that
+    match a stored article are dropped entirely.
+
+    Parameters:
+    - articles: Newly processed articles
+    - existing: Article repository to check for stored copies (default: None)
+    - min_jaccard: Minimum shingle similarity between duplicates
+
+    Returns:
+    - List of representative articles, in input order
+    """
+    parent = list(range(len(articles)))
+
+    def find(index):
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    words = [article_shingles(article) for article in articles]
+    buckets = {}
+    stored_copy = set()
+    for index, article in enumerate(articles):
+        keys = band_keys(article, words[index])
+
+        if existing is not None and keys:
+            for stored in existing.similar_articles(keys):
+                if jaccard(words[index], article_shingles(stored)) >= min_jaccard:
+                    stored_copy.add(index)
+                    break
+
+        candidates = {other for key in keys for other in buckets.get(key, ())}
+        for other in sorted(candidates):
+            if jaccard(words[index], words[other]) >= min_jaccard:
+                root, other_root = find(index), find(other)
+                if root != other_root:
+                    # Keep the earliest article as the cluster root
+                    parent[max(root, other_root)] = min(root, other_root)
+        for key in keys:
+            buckets.setdefault(key, []).append(index)
+
+    # A cluster with a stored copy is dropped as a whole
+    stored_roots = {find(index) for index in stored_copy}
+    representatives = []
+    for index, article in enumerate(articles):
+        root = find(index)
+        if root in stored_roots:
+            print(f"Skipping duplicate of stored article: {article.get('original_title')}")
+        elif root == index:
+            representatives.append(article)
+        else:
+            print(f"Merging duplicate story: {article.get('original_title')}")
+            articles[root].setdefault('duplicate_links', []).append(article.get('link', ""))
+
+    print(f"Deduplication kept {len(representatives)} of {len(articles)} articles")
+    return representatives
@@ -0,0 +1,292 @@
+"""
+Catalog of generated podcast episodes backed by SQLite
+
+Every episode (audio and script files in data/) is recorded with its
+metadata, so listing, feeds and cleanup read an index instead of scanning
+the data directory. Listings use keyset pagination on (created, id), which
+costs the same for every page however many episodes there are.
+
+Retention (off unless configured): after EPISODE_AUDIO_RETENTION_DAYS an
+episode is compacted (its audio is deleted, its script and catalog entry
+are kept); after EPISODE_RETENTION_DAYS it is deleted completely.
+"""
+import os
+import re
+import sys
+import json
+import time
+import sqlite3
+import datetime
+import threading
+
+# Fix import paths
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(current_dir))  # Add parent directory to path
+
+from src.utils import ensure_dir_exists
+from src.audio import iter_frames
+
+DATA_DIR = "data"
+EPISODE_CATALOG_FILE = os.path.join(DATA_DIR, "episodes.db")
+
+# Retention periods in days; 0 keeps episodes forever
+EPISODE_AUDIO_RETENTION_DAYS = int(os.environ.get('EPISODE_AUDIO_RETENTION_DAYS', 0))
+EPISODE_RETENTION_DAYS = int(os.environ.get('EPISODE_RETENTION_DAYS', 0))
+
+EPISODE_FILE_PATTERN = re.compile(r'^(podcast_(\d{8}_\d{6})_[0-9a-f]+)\.(mp3|txt)$')
+
+def audio_duration(filepath):
+    """
+    Duration of an MP3 file, from its frame headers
+
+    Parameters:
+    - filepath: Path to the MP3 file
+
+    Returns:
+    - Duration in seconds (0.0 if the file is missing)
+    """
+    try:
+        with open(filepath, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return 0.0
+    return sum(header['samples'] / header['sample_rate'] for _, header in iter_frames(data))
+
+def encode_cursor(episode):
+    """Opaque pagination cursor pointing just after an episode"""
+    return f"{episode['created']!r}:{episode['id']}"
+
+def decode_cursor(cursor):
+    """(created, id) from a pagination cursor"""
+    created, episode_id = cursor.split(':', 1)
+    return float(created), episode_id
+
+class EpisodeCatalog:
+    """
+    SQLite index of podcast episodes
+
+    Safe to share between threads.
+    """
+
+    def __init__(self, filepath=EPISODE_CATALOG_FILE, data_dir=DATA_DIR):
+        self.filepath = filepath
+        self.data_dir = data_dir
+        self.lock = threading.Lock()
+
+        ensure_dir_exists(os.path.dirname(filepath))
+        self.connection = sqlite3.connect(filepath, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS episodes (
+                id TEXT PRIMARY KEY,
+                created REAL NOT NULL,
+                title TEXT NOT NULL,
+                audio_file TEXT,
+                script_file TEXT,
+                duration REAL NOT NULL DEFAULT 0,
+                size INTEGER NOT NULL DEFAULT 0,
+                article_ids TEXT NOT NULL DEFAULT '[]',
+                voice TEXT,
+                compacted INTEGER NOT NULL DEFAULT 0,
+                failed_segments INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        # Catalogs created before failed segments were recorded
+        columns = [row[1] for row in self.connection.execute("PRAGMA table_info(episodes)")]
+        if 'failed_segments' not in columns:
+            self.connection.execute(
+                "ALTER TABLE episodes ADD COLUMN failed_segments INTEGER NOT NULL DEFAULT 0")
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS episodes_created ON episodes (created, id)")
+        self.connection.commit()
+
+    def _episode(self, row):
+        """Dictionary for a catalog row"""
+        episode = dict(row)
+        episode['article_ids'] = json.loads(episode['article_ids'])
+        episode['compacted'] = bool(episode['compacted'])
+        return episode
+
+    def add_episode(self, episode_id, audio_file=None, script_file=None, article_ids=None,
+                    voice=None, title=None, created=None, failed_segments=0):
+        """
+        Record an episode, reading its size and duration from the audio file
+
+        Parameters:
+        - episode_id: Episode name (e.g. 'podcast_20250318_084904_447f4122')
+        - audio_file: File name of the audio in the data directory
+        - script_file: File name of the script in the data directory
+        - article_ids: Keys of the articles in the episode
+        - voice: TTS voice used
+        - title: Episode title (default: built from the creation date)
+        - created: Creation time as a Unix timestamp (default: now)
+        - failed_segments: Number of speech segments left out of the audio
+
+        Returns:
+        - The stored episode dictionary
+        """
+        created = created or time.time()
+        title = title or "Tamil Kids News - " + datetime.datetime.fromtimestamp(created).strftime("%d %b %Y %H:%M")
+        size, duration = 0, 0.0
+        if audio_file:
+            audio_path = os.path.join(self.data_dir, audio_file)
+            if os.path.exists(audio_path):
+                size = os.path.getsize(audio_path)
+                duration = audio_duration(audio_path)
+
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO episodes (id, created, title, audio_file, script_file, duration, "
+                "size, article_ids, voice, compacted, failed_segments) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0, ?)",
+                (episode_id, created, title, audio_file, script_file, duration, size,
+                 json.dumps(article_ids or []), voice, failed_segments))
+            self.connection.commit()
+        return self.get_episode(episode_id)
+
+    def get_episode(self, episode_id):
+        """
+        Look up one episode
+
+        Parameters:
+        - episode_id: Episode name
+
+        Returns:
+        - Episode dictionary, or None if it is not in the catalog
+        """
+        with self.lock:
+            row = self.connection.execute("SELECT * FROM episodes WHERE id = ?", (episode_id,)).fetchone()
+        return self._episode(row) if row else None
+
+    def list_episodes(self, limit=20, cursor=None, with_audio=False):
+        """
+        List episodes, newest first, one page at a time
+
+        Parameters:
+        - limit: Maximum episodes per page
+        - cursor: Cursor returned with the previous page (default: first page)
+        - with_audio: Skip compacted episodes whose audio was deleted (default: False)
+
+        Returns:
+        - (list of episode dictionaries, cursor for the next page or None)
+        """
+        conditions = []
+        params = []
+        if cursor:
+            # Keyset pagination: continue after the last row of the previous page
+            conditions.append("(created, id) < (?, ?)")
+            params.extend(decode_cursor(cursor))
+        if with_audio:
+            conditions.append("compacted = 0 AND audio_file IS NOT NULL")
+        query = "SELECT * FROM episodes"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY created DESC, id DESC LIMIT ?"
+        params.append(limit + 1)
+
+        with self.lock:
+            rows = self.connection.execute(query, params).fetchall()
+        episodes = [self._episode(row) for row in rows[:limit]]
+        next_cursor = encode_cursor(episodes[-1]) if len(rows) > limit else None
+        return episodes, next_cursor
+
+    def count(self):
+        """Number of episodes in the catalog"""
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM episodes").fetchone()[0]
+
+    def _remove_file(self, filename):
+        """Delete a file from the data directory, ignoring files that are already gone"""
+        if not filename:
+            return
+        try:
+            os.remove(os.path.join(self.data_dir, filename))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Error deleting {filename}: {e}")
+
+    def apply_retention(self, audio_days=EPISODE_AUDIO_RETENTION_DAYS, keep_days=EPISODE_RETENTION_DAYS):
+        """
+        Compact and delete old episodes
+
+        Parameters:
+        - audio_days: Delete the audio of episodes older than this (0 keeps audio forever)
+        - keep_days: Delete episodes older than this completely (0 keeps them forever)
+
+        Returns:
+        - (number of episodes compacted, number deleted)
+        """
+        now = time.time()
+        deleted = []
+        compacted = []
+        with self.lock:
+            if keep_days:
+                deleted = self.connection.execute(
+                    "SELECT id, audio_file, script_file FROM episodes WHERE created < ?",
+                    (now - keep_days * 86400,)).fetchall()
+            if audio_days:
+                compacted = self.connection.execute(
+                    "SELECT id, audio_file FROM episodes WHERE created < ? AND compacted = 0 AND created >= ?",
+                    (now - audio_days * 86400, now - keep_days * 86400 if keep_days else 0)).fetchall()
+
+            for row in deleted:
+                self._remove_file(row['audio_file'])
+                self._remove_file(row['script_file'])
+            for row in compacted:
+                self._remove_file(row['audio_file'])
+
+            self.connection.executemany("DELETE FROM episodes WHERE id = ?", [(row['id'],) for row in deleted])
+            self.connection.executemany(
+                "UPDATE episodes SET compacted = 1, audio_file = NULL, size = 0 WHERE id = ?",
+                [(row['id'],) for row in compacted])
+            self.connection.commit()
+
+        if deleted or compacted:
+            print(f"Episode retention: compacted {len(compacted)}, deleted {len(deleted)}")
+        return len(compacted), len(deleted)
+
+    def import_existing(self):
+        """
+        Add episodes found in the data directory that are not in the catalog yet
+
+        Only needed once, for episodes generated before the catalog existed.
+
+        Returns:
+        - Number of episodes added
+        """
+        found = {}
+        for filename in sorted(os.listdir(self.data_dir)):
+            match = EPISODE_FILE_PATTERN.match(filename)
+            if match:
+                episode_id, timestamp, extension = match.groups()
+                entry = found.setdefault(episode_id, {'timestamp': timestamp})
+                entry['audio_file' if extension == 'mp3' else 'script_file'] = filename
+
+        added = 0
+        for episode_id, entry in found.items():
+            if self.get_episode(episode_id) is None:
+                created = datetime.datetime.strptime(entry['timestamp'], "%Y%m%d_%H%M%S").timestamp()
+                self.add_episode(episode_id, entry.get('audio_file'), entry.get('script_file'),
+                                 created=created)
+                added += 1
+        if added:
+            print(f"Imported {added} existing episodes into the catalog")
+        return added
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+def get_episode_catalog():
+    """
+    Shared EpisodeCatalog for this process; existing episodes are imported on first use
+
+    Returns:
+    - EpisodeCatalog instance
+    """
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = EpisodeCatalog()
+            if _catalog.count() == 0:
+                _catalog.import_existing()
+        return _catalog
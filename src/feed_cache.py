@@ -0,0 +1,131 @@
+"""
+Conditional-GET cache for RSS feeds
+
+Keeps the ETag, Last-Modified and content hash of every feed we fetch so that
+unchanged feeds can be answered with a 304 (or a matching hash) and skip parsing.
+"""
+import os
+import sys
+import hashlib
+import threading
+
+# Fix import paths
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(current_dir))  # Add parent directory to path
+
+from src.utils import load_json_file, save_json_file
+
+FEED_CACHE_FILE = os.path.join("data", "feed_cache.json")
+
+def content_hash(data):
+    """
+    Hash raw feed bytes
+
+    Parameters:
+    - data: Feed body as bytes
+
+    Returns:
+    - Hex digest of the content
+    """
+    return hashlib.sha256(data).hexdigest()
+
+class FeedCache:
+    """
+    Per-feed validators and last results, persisted as a small JSON file
+
+    Safe to share between the threads used for concurrent scraping.
+    """
+
+    def __init__(self, filepath=FEED_CACHE_FILE):
+        self.filepath = filepath
+        self.entries = load_json_file(filepath) or {}
+        self.lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Start counting hits, misses and bytes saved for a new run"""
+        self.stats = {"hits": 0, "misses": 0, "not_modified": 0, "bytes_saved": 0}
+
+    def request_headers(self, rss_url, params):
+        """
+        Build conditional request headers for a feed
+
+        Parameters:
+        - rss_url: URL of the RSS feed
+        - params: String describing the fetch parameters; cached results are
+                  only reused when they were produced with the same parameters
+
+        Returns:
+        - Dictionary of HTTP headers (empty if nothing is cached)
+        """
+        with self.lock:
+            entry = self.entries.get(rss_url)
+        if not entry or entry.get('params') != params:
+            return {}
+
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def lookup(self, rss_url, params, digest=None):
+        """
+        Return cached articles for a feed that has not changed
+
+        Parameters:
+        - rss_url: URL of the RSS feed
+        - params: Fetch parameters the cached result must match
+        - digest: Hash of a freshly downloaded body, or None after a 304
+
+        Returns:
+        - List of cached articles, or None if the cache cannot answer
+        """
+        with self.lock:
+            entry = self.entries.get(rss_url)
+            if not entry or entry.get('params') != params:
+                return None
+            if digest is not None and digest != entry.get('hash'):
+                return None
+
+            self.stats['hits'] += 1
+            if digest is None:
+                # Server answered 304, so the body was never transferred
+                self.stats['not_modified'] += 1
+                self.stats['bytes_saved'] += entry.get('size', 0)
+            return list(entry.get('articles', []))
+
+    def store(self, rss_url, params, headers, digest, size, articles):
+        """
+        Remember validators and parsed articles for a feed
+
+        Parameters:
+        - rss_url: URL of the RSS feed
+        - params: Fetch parameters used to produce the articles
+        - headers: Response headers (mapping with case-insensitive get)
+        - digest: Hash of the body bytes that were read
+        - size: Number of body bytes that were read
+        - articles: Articles parsed from the body
+        """
+        with self.lock:
+            self.stats['misses'] += 1
+            self.entries[rss_url] = {
+                'params': params,
+                'etag': headers.get('ETag'),
+                'last_modified': headers.get('Last-Modified'),
+                'hash': digest,
+                'size': size,
+                'articles': articles,
+            }
+
+    def save(self):
+        """Write the cache back to disk"""
+        with self.lock:
+            return save_json_file(self.entries, self.filepath)
+
+    def report(self):
+        """Print the statistics collected during this run"""
+        stats = self.stats
+        print(f"Feed cache: {stats['hits']} hits ({stats['not_modified']} not modified), "
+              f"{stats['misses']} misses, {stats['bytes_saved']} bytes saved")
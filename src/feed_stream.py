@@ -0,0 +1,180 @@
+"""
+Streaming RSS/Atom parser for large feeds
+
+Feeds are parsed incrementally with expat as bytes arrive, so entries can be
+handed out one at a time and the download stopped as soon as we have enough.
+Only the entry currently being parsed is held in memory.
+"""
+import os
+import sys
+import zlib
+import datetime
+import email.utils
+import html.entities
+import xml.parsers.expat
+from collections import deque
+
+# Fix import paths
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(current_dir))  # Add parent directory to path
+
+CHUNK_SIZE = 16 * 1024  # Bytes read from the network per parser feed
+
+# Element names (without namespace) that start a feed entry
+ENTRY_TAGS = ('item', 'entry')
+
+# Entry fields we keep, mapped to the key they are stored under
+ENTRY_FIELDS = {
+    'title': 'title',
+    'link': 'link',
+    'guid': 'guid',
+    'id': 'guid',
+    'description': 'summary',
+    'summary': 'summary',
+    'encoded': 'content',
+    'content': 'content',
+    'pubDate': 'published',
+    'published': 'published',
+    'date': 'published',
+    'updated': 'updated',
+    'modified': 'updated',
+}
+
+def utc_now():
+    """Current time as a naive UTC datetime, the convention used for entry dates"""
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+def parse_entry_date(value):
+    """
+    Parse an RSS (RFC 822) or Atom (ISO 8601) date
+
+    Parameters:
+    - value: Date string from the feed
+
+    Returns:
+    - Naive UTC datetime, or None if the date cannot be parsed
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    try:
+        parsed = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+
+    # feedparser reports UTC times, so normalise to the same convention
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return parsed
+
+class _EntryCollector:
+    """expat handlers that turn feed elements into flat entry dictionaries"""
+
+    def __init__(self):
+        self.entries = deque()
+        self.depth = 0
+        self.entry_depth = None
+        self.entry = None
+        self.field = None
+        self.field_depth = None
+        self.text = []
+
+    def start(self, tag, attrs):
+        self.depth += 1
+        name = tag.rsplit('}', 1)[-1]
+
+        if self.entry is None:
+            if name in ENTRY_TAGS:
+                self.entry = {}
+                self.entry_depth = self.depth
+            return
+
+        if self.field is None and self.depth == self.entry_depth + 1 and name in ENTRY_FIELDS:
+            self.field = ENTRY_FIELDS[name]
+            self.field_depth = self.depth
+            self.text = []
+
+            # Atom links carry the URL in an attribute
+            if name == 'link' and 'href' in attrs:
+                if attrs.get('rel', 'alternate') == 'alternate' and 'link' not in self.entry:
+                    self.entry['link'] = attrs['href']
+                self.field = None
+
+    def end(self, tag):
+        if self.field is not None and self.depth == self.field_depth:
+            value = "".join(self.text).strip()
+            if value and self.field not in self.entry:
+                self.entry[self.field] = value
+            self.field = None
+            self.text = []
+        elif self.entry is not None and self.depth == self.entry_depth:
+            self.entries.append(self.entry)
+            self.entry = None
+
+        self.depth -= 1
+
+    def data(self, text):
+        if self.field is not None:
+            self.text.append(text)
+
+    def entity(self, name, is_parameter_entity):
+        # Feeds often use HTML entities that plain XML does not define
+        if self.field is not None and not is_parameter_entity:
+            self.text.append(html.entities.html5.get(name + ';', f"&{name};"))
+
+def iter_feed_entries(chunks):
+    """
+    Parse feed entries incrementally
+
+    Parameters:
+    - chunks: Iterable of raw feed bytes
+
+    Yields:
+    - One dictionary per entry with title, link, guid, summary, content,
+      published and updated (whichever the feed provides)
+    """
+    collector = _EntryCollector()
+    parser = xml.parsers.expat.ParserCreate(namespace_separator='}')
+    parser.UseForeignDTD(True)
+    parser.buffer_text = True
+    parser.StartElementHandler = collector.start
+    parser.EndElementHandler = collector.end
+    parser.CharacterDataHandler = collector.data
+    parser.SkippedEntityHandler = collector.entity
+
+    for chunk in chunks:
+        parser.Parse(chunk, False)
+        while collector.entries:
+            yield collector.entries.popleft()
+
+    parser.Parse(b"", True)
+    while collector.entries:
+        yield collector.entries.popleft()
+
+def iter_response_chunks(response, chunk_size=CHUNK_SIZE):
+    """
+    Read an HTTP response in chunks, decompressing gzip on the fly
+
+    Parameters:
+    - response: File-like HTTP response
+    - chunk_size: Number of bytes to read at a time
+
+    Yields:
+    - Decoded body chunks
+    """
+    decompressor = None
+    if response.headers.get('Content-Encoding') == 'gzip':
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    while True:
+        chunk = response.read(chunk_size)
+        if not chunk:
+            break
+        yield decompressor.decompress(chunk) if decompressor else chunk
+
+    if decompressor:
+        yield decompressor.flush()
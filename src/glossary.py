@@ -0,0 +1,133 @@
+"""
+Glossary-based word substitution for the offline fallback translator
+
+The glossary (English term -> Tamil) is loaded from a JSON file and compiled
+into a single regular expression built from a trie of the terms, so text is
+scanned once no matter how many entries the glossary has. Terms match whole
+words only, case-insensitively, and the longest term wins (e.g. "New Delhi"
+before "New"). Spaces inside a term match any run of whitespace.
+"""
+import os
+import re
+import sys
+import threading
+
+# Fix import paths
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(current_dir))  # Add parent directory to path
+
+from src.utils import load_json_file
+
+GLOSSARY_FILE = os.environ.get('GLOSSARY_FILE', os.path.join("data", "glossary.json"))
+
+def _term_key(term):
+    """Lookup key of a term: lowercase with single spaces"""
+    return ' '.join(term.split()).lower()
+
+def _trie_pattern(node):
+    """Regex source for a trie node; '' marks the end of a term"""
+    branches = []
+    leaves = []
+    for char, child in sorted(item for item in node.items() if item[0]):
+        if char != ' ' and list(child) == ['']:
+            # Terms that end one character later share a character class
+            leaves.append(re.escape(char))
+        else:
+            char_pattern = r'\s+' if char == ' ' else re.escape(char)
+            branches.append(char_pattern + _trie_pattern(child))
+    if leaves:
+        branches.append(leaves[0] if len(leaves) == 1 else '[' + ''.join(leaves) + ']')
+
+    if not branches:
+        return ''
+    if '' in node:
+        # A term ends here: try the longer terms first, then stop
+        return '(?:' + '|'.join(branches) + ')?'
+    if len(branches) == 1:
+        return branches[0]
+    return '(?:' + '|'.join(branches) + ')'
+
+def compile_glossary(terms):
+    """
+    Compile glossary terms into one whole-word, case-insensitive pattern
+
+    Parameters:
+    - terms: Iterable of terms
+
+    Returns:
+    - Compiled regular expression, or None for an empty glossary
+    """
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in _term_key(term):
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    if not trie:
+        return None
+    return re.compile(r'(?<!\w)' + _trie_pattern(trie) + r'(?!\w)', re.IGNORECASE)
+
+class Glossary:
+    """Compiled glossary that replaces known terms in one pass over the text"""
+
+    def __init__(self, entries):
+        """
+        Parameters:
+        - entries: Dictionary of English term -> Tamil translation
+        """
+        self.entries = {_term_key(term): translation for term, translation in entries.items()
+                        if term.strip()}
+        self.pattern = compile_glossary(self.entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _replace(self, match):
+        text = match.group(0)
+        return self.entries.get(_term_key(text), text)
+
+    def translate(self, text):
+        """
+        Replace every glossary term in a text with its translation
+
+        Parameters:
+        - text: Cleaned text
+
+        Returns:
+        - Text with known terms replaced
+        """
+        if not text or self.pattern is None:
+            return text
+        return self.pattern.sub(self._replace, text)
+
+def load_glossary(filepath=GLOSSARY_FILE):
+    """
+    Load and compile a glossary file
+
+    Parameters:
+    - filepath: JSON file mapping English terms to Tamil (default: "data/glossary.json")
+
+    Returns:
+    - Glossary instance (empty if the file is missing)
+    """
+    entries = load_json_file(filepath) or {}
+    glossary = Glossary(entries)
+    print(f"Loaded glossary with {len(glossary)} terms from {filepath}")
+    return glossary
+
+_glossary = None
+_glossary_lock = threading.Lock()
+
+def get_glossary():
+    """
+    Shared Glossary for this process, loaded on first use
+
+    Returns:
+    - Glossary instance
+    """
+    global _glossary
+    with _glossary_lock:
+        if _glossary is None:
+            _glossary = load_glossary()
+        return _glossary
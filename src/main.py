@@ -1,18 +1,150 @@
 import os
-import json
 import datetime
 import sys
+import gzip
+import hashlib
+import urllib.request
+import urllib.error
+import xml.parsers.expat
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urlparse
 
 # Fix import paths
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(os.path.dirname(current_dir))  # Add parent directory to path
 
 # Now use the correct imports
-from src.utils import ensure_dir_exists
-from src.translation import detect_language
+from src.utils import normalize_text
+from src.translation import detect_languages
+from src.feed_cache import FeedCache, content_hash
+from src.seen_index import SeenIndex, article_key
+from src.article_repository import get_article_repository
+from src.dedup import deduplicate_articles
+from src.pretranslate import initial_status, start_pretranslation, wait_for_pretranslation
+from src.feed_stream import iter_feed_entries, iter_response_chunks, parse_entry_date, utc_now
 import feedparser
 
-def fetch_rss_articles(rss_url, num_articles=5, since_date=None):
+# Concurrent fetch settings (override with environment variables)
+MAX_FEEDS_IN_FLIGHT = int(os.environ.get('SCRAPER_MAX_IN_FLIGHT', 8))
+MAX_FEEDS_PER_HOST = int(os.environ.get('SCRAPER_MAX_PER_HOST', 2))
+CONCURRENT_SCRAPING = os.environ.get('SCRAPER_CONCURRENT', '1') != '0'
+STREAMING_PARSE = os.environ.get('SCRAPER_STREAMING', '0') == '1'
+FEED_TIMEOUT = 30  # Seconds to wait for a feed server
+
+def download_feed(rss_url, headers=None, timeout=FEED_TIMEOUT):
+    """
+    Download a feed, honouring conditional request headers
+
+    Parameters:
+    - rss_url: URL of the RSS feed
+    - headers: Extra request headers, e.g. If-None-Match (default: None)
+    - timeout: Socket timeout in seconds
+
+    Returns:
+    - Tuple of (status, response headers, body bytes); body is empty for a 304
+    """
+    request_headers = {
+        'User-Agent': feedparser.USER_AGENT,
+        'Accept-Encoding': 'gzip',
+    }
+    request_headers.update(headers or {})
+    request = urllib.request.Request(rss_url, headers=request_headers)
+
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            data = response.read()
+            if response.headers.get('Content-Encoding') == 'gzip':
+                data = gzip.decompress(data)
+            return response.status, response.headers, data
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return 304, e.headers, b""
+        raise
+
+def stream_rss_articles(rss_url, num_articles=5, since_date=None, cache=None,
+                        params="", headers=None, timeout=FEED_TIMEOUT):
+    """
+    Fetch articles by parsing the feed while it downloads
+
+    Reading stops as soon as num_articles entries were collected or an entry
+    older than since_date is reached (feeds list the newest entries first),
+    so large feeds are never downloaded or held in memory in full.
+
+    Parameters:
+    - rss_url: URL of the RSS feed
+    - num_articles: Number of articles to fetch (default: 5)
+    - since_date: Stop at the first article published before this date (default: None)
+    - cache: FeedCache used for conditional requests (default: None)
+    - params: Fetch parameters recorded with the cache entry; must differ from the
+              parameters of full downloads, since a partial read has another hash and size
+    - headers: Conditional request headers (default: None)
+    - timeout: Socket timeout in seconds
+
+    Returns:
+    - List of dictionaries containing article details
+    """
+    request_headers = {
+        'User-Agent': feedparser.USER_AGENT,
+        'Accept-Encoding': 'gzip',
+    }
+    request_headers.update(headers or {})
+    request = urllib.request.Request(rss_url, headers=request_headers)
+
+    try:
+        response = urllib.request.urlopen(request, timeout=timeout)
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and cache:
+            cached = cache.lookup(rss_url, params)
+            if cached is not None:
+                print(f"Feed unchanged, using cached articles for {rss_url}")
+                return cached
+        raise
+
+    digest = hashlib.sha256()
+    size = 0
+
+    def read_chunks():
+        nonlocal size
+        for chunk in iter_response_chunks(response):
+            digest.update(chunk)
+            size += len(chunk)
+            yield chunk
+
+    articles = []
+    complete = True
+    with response:
+        for entry in iter_feed_entries(read_chunks()):
+            pub_date = (parse_entry_date(entry.get('published')) or
+                        parse_entry_date(entry.get('updated')) or
+                        utc_now())   # Undated entries are stamped in UTC like the rest
+
+            # Everything after this entry is older still
+            if since_date and pub_date < since_date:
+                complete = False
+                break
+
+            articles.append({
+                'title': entry.get('title', ""),
+                'summary': entry.get('summary') or entry.get('content') or "",
+                'link': entry.get('link', ""),
+                'guid': entry.get('guid', ""),
+                'published': pub_date.isoformat(),
+            })
+
+            if len(articles) >= num_articles:
+                complete = False
+                break
+
+    print(f"Read {size} bytes from {rss_url}")
+    if cache:
+        # The hash of a partly read body identifies nothing, so it is only kept for whole bodies
+        cache.store(rss_url, params, response.headers, digest.hexdigest() if complete else None,
+                    size, articles)
+
+    return articles
+
+def fetch_rss_articles(rss_url, num_articles=5, since_date=None, cache=None, stream=None):
     """
     Fetch articles from an RSS feed
 
@@ -20,13 +152,43 @@ def fetch_rss_articles(rss_url, num_articles=5, since_date=None):
     - rss_url: URL of the RSS feed
     - num_articles: Number of articles to fetch (default: 5)
     - since_date: Only fetch articles published after this date (default: None)
+    - cache: FeedCache used for conditional requests (default: None)
+    - stream: Use the streaming parser (default: STREAMING_PARSE)
 
     Returns:
     - List of dictionaries containing article details
     """
+    if stream is None:
+        stream = STREAMING_PARSE
+
     try:
+        params = f"{num_articles}|{since_date.isoformat() if since_date else ''}"
+
+        if stream:
+            # Streamed reads stop early, so their entries are kept apart from full downloads
+            stream_params = f"stream|{params}"
+            try:
+                return stream_rss_articles(rss_url, num_articles, since_date, cache, stream_params,
+                                           cache.request_headers(rss_url, stream_params) if cache else {})
+            except xml.parsers.expat.ExpatError as e:
+                # Malformed feeds are left to feedparser's forgiving parser
+                print(f"Streaming parse failed for {rss_url} ({e}), using feedparser")
+
+        headers = cache.request_headers(rss_url, params) if cache else {}
+        status, response_headers, data = download_feed(rss_url, headers)
+        digest = content_hash(data)
+
+        # Unchanged feeds are answered from the cache without parsing
+        if cache:
+            cached = cache.lookup(rss_url, params, None if status == 304 else digest)
+            if cached is not None:
+                print(f"Feed unchanged, using cached articles for {rss_url}")
+                return cached
+
         # Parse the feed
-        feed = feedparser.parse(rss_url)
+        feed = feedparser.parse(data, response_headers={
+            key.lower(): value for key, value in response_headers.items()
+        })
 
         # Check if feed parsing was successful
         if not hasattr(feed, 'entries') or len(feed.entries) == 0:
@@ -48,7 +210,7 @@ def fetch_rss_articles(rss_url, num_articles=5, since_date=None):
                         pub_date = datetime.datetime(*getattr(entry, date_field)[:6])
                         break
                 else:
-                    pub_date = datetime.datetime.now()  # Default to current time if no date available
+                    pub_date = utc_now()  # Default to current time (UTC) if no date available
 
             # Skip if article is older than since_date
             if since_date and pub_date < since_date:
@@ -72,6 +234,7 @@ def fetch_rss_articles(rss_url, num_articles=5, since_date=None):
                 'title': entry.title,
                 'summary': content,
                 'link': entry.link if hasattr(entry, 'link') else "",
+                'guid': entry.get('id', ""),
                 'published': pub_date.isoformat(),
             }
 
@@ -81,13 +244,16 @@ def fetch_rss_articles(rss_url, num_articles=5, since_date=None):
             if len(articles) >= num_articles:
                 break
 
+        if cache:
+            cache.store(rss_url, params, response_headers, digest, len(data), articles)
+
         return articles
 
     except Exception as e:
         print(f"Error fetching RSS feed: {e}")
         return []
 
-def process_news_for_kids(rss_url, num_articles=5, since_date=None):
+def process_news_for_kids(rss_url, num_articles=5, since_date=None, cache=None, seen=None):
     """
     Main function to fetch, process, and prepare news for kids
 
@@ -95,18 +261,37 @@ def process_news_for_kids(rss_url, num_articles=5, since_date=None):
     - rss_url: URL of the RSS feed
     - num_articles: Number of articles to fetch (default: 5)
     - since_date: Only fetch articles published after this date (default: None)
+    - cache: FeedCache used for conditional requests (default: None)
+    - seen: SeenIndex used to skip already processed articles (default: None)
 
     Returns:
     - List of processed articles
     """
     # Fetch articles
     print(f"Fetching news articles from {rss_url}...")
-    articles = fetch_rss_articles(rss_url, num_articles, since_date)
+    articles = fetch_rss_articles(rss_url, num_articles, since_date, cache)
 
     if not articles:
         print("No articles found.")
         return []
 
+    # Skip articles processed by an earlier run
+    if seen:
+        fetched_count = len(articles)
+        articles = seen.filter_new(rss_url, articles)
+        print(f"{fetched_count - len(articles)} of {fetched_count} articles already seen for {rss_url}")
+        if not articles:
+            return []
+
+    # Normalize each title and summary once; later stages reuse these
+    normalized_titles = [normalize_text(article['title']) for article in articles]
+    normalized_summaries = [normalize_text(article['summary']) for article in articles]
+
+    # Detect all title and summary languages in one batch
+    languages = detect_languages(normalized_titles + normalized_summaries, normalized=True)
+    title_languages = languages[:len(articles)]
+    summary_languages = languages[len(articles):]
+
     # Process each article
     processed_articles = []
 
@@ -116,24 +301,28 @@ def process_news_for_kids(rss_url, num_articles=5, since_date=None):
 
         # Create a processed article
         processed_article = {
+            'key': article_key(article),
+            'feed': rss_url,
             'original_title': article['title'],
             'original_summary': article['summary'],
+            'normalized_title': normalized_titles[i],
+            'normalized_summary': normalized_summaries[i],
             'link': article['link'],
             'published': article['published']
         }
 
         # Detect title language but don't translate yet
-        title_lang = detect_language(article['title'])
+        title_lang = title_languages[i]
         processed_article['title_language'] = title_lang
 
         # Initially set Tamil title to same as original (will be translated later if needed)
-        processed_article['tamil_title'] = article['title']
+        processed_article['tamil_title'] = normalized_titles[i]
 
         # Detect summary language but don't translate yet
-        if article['summary']:
-            summary_lang = detect_language(article['summary'])
+        if normalized_summaries[i]:
+            summary_lang = summary_languages[i]
             processed_article['summary_language'] = summary_lang
-            processed_article['tamil_summary'] = article['summary']
+            processed_article['tamil_summary'] = normalized_summaries[i]
         else:
             processed_article['tamil_summary'] = ""
             processed_article['summary_language'] = "unknown"
@@ -144,47 +333,177 @@ def process_news_for_kids(rss_url, num_articles=5, since_date=None):
             (processed_article['summary_language'] != "ta" and 
              processed_article['summary_language'] != "unknown")
         )
+        processed_article['translation_status'] = initial_status(processed_article)
 
         processed_articles.append(processed_article)
 
     return processed_articles
 
-def save_processed_articles(articles, filename="data/processed_news.json"):
+def _feed_host(rss_url):
+    """Return the host name used to group feeds for per-host limits"""
+    return urlparse(rss_url).netloc.lower()
+
+def process_feeds_concurrently(rss_urls, num_articles=5, since_date=None,
+                               max_in_flight=None, max_per_host=None, cache=None, seen=None):
     """
-    Save processed articles to a JSON file
+    Fetch and process several RSS feeds in parallel
+
+    Feeds are dispatched round-robin across hosts so that one host with many
+    feeds cannot occupy every worker, and no host ever has more than
+    max_per_host requests in flight.
+
+    Parameters:
+    - rss_urls: List of RSS feed URLs
+    - num_articles: Number of articles to fetch per feed (default: 5)
+    - since_date: Only fetch articles published after this date (default: None)
+    - max_in_flight: Maximum number of feeds fetched at once (default: MAX_FEEDS_IN_FLIGHT)
+    - max_per_host: Maximum number of feeds fetched at once from one host (default: MAX_FEEDS_PER_HOST)
+    - cache: FeedCache used for conditional requests (default: None)
+    - seen: SeenIndex used to skip already processed articles (default: None)
+
+    Returns:
+    - List of processed articles, grouped in the same order as rss_urls
+    """
+    max_in_flight = max(1, max_in_flight or MAX_FEEDS_IN_FLIGHT)
+    max_per_host = max(1, max_per_host or MAX_FEEDS_PER_HOST)
+
+    # Queue feed indexes per host, keeping hosts in first-seen order
+    host_queues = {}
+    for index, url in enumerate(rss_urls):
+        host_queues.setdefault(_feed_host(url), deque()).append(index)
+    host_order = deque(host_queues)
+    host_in_flight = {host: 0 for host in host_queues}
+
+    results = {}
+    running = {}
+
+    def dispatch(executor):
+        # Hand out one feed per host per pass until no worker or host slot is free
+        while len(running) < max_in_flight:
+            for _ in range(len(host_order)):
+                host = host_order[0]
+                host_order.rotate(-1)
+                if host_queues[host] and host_in_flight[host] < max_per_host:
+                    index = host_queues[host].popleft()
+                    future = executor.submit(process_news_for_kids, rss_urls[index],
+                                             num_articles, since_date, cache, seen)
+                    running[future] = (index, host)
+                    host_in_flight[host] += 1
+                    break
+            else:
+                return
+
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        dispatch(executor)
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, host = running.pop(future)
+                host_in_flight[host] -= 1
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    print(f"Error processing feed {rss_urls[index]}: {e}")
+                    results[index] = []
+            dispatch(executor)
+
+    # Merge in feed order so the output does not depend on completion order
+    all_articles = []
+    for index in range(len(rss_urls)):
+        all_articles.extend(results.get(index, []))
+    return all_articles
+
+def save_processed_articles(articles, merge=True, repository=None):
+    """
+    Save processed articles to the article repository
 
     Parameters:
     - articles: List of processed articles
-    - filename: Output filename (default: "data/processed_news.json")
+    - merge: Add to the stored articles instead of replacing them (default: True)
+    - repository: Article repository (default: the shared one)
     """
-    ensure_dir_exists(os.path.dirname(filename))
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(articles, f, ensure_ascii=False, indent=2)
-    print(f"Saved {len(articles)} articles to {filename}")
+    repository = repository or get_article_repository()
+    if merge:
+        added = repository.add(articles)
+        print(f"Saved {added} new articles")
+    else:
+        repository.replace(articles)
+        print(f"Saved {len(articles)} articles")
+
+# Example RSS feed URLs (modify as needed)
+RSS_FEEDS = [
+    "https://www.thehindu.com/news/national/feeder/default.rss",  # English - National news
+    "https://timesofindia.indiatimes.com/rssfeeds/4719148.cms",  # English - India news
+    "https://tamil.oneindia.com/rss/tamil-news.xml",              # Tamil news
+    # Add more RSS feeds as needed
+]
+
+def scrape_feeds(rss_urls, num_articles=5, since_date=None, feed_cache=None, seen_index=None,
+                 pretranslate=True):
+    """
+    Fetch, process, deduplicate and save new articles from several feeds
 
-def main():
-    # Example RSS feed URLs (modify as needed)
-    rss_urls = [
-        "https://www.thehindu.com/news/national/feeder/default.rss",  # English - National news
-        "https://timesofindia.indiatimes.com/rssfeeds/4719148.cms",  # English - India news
-        "https://tamil.oneindia.com/rss/tamil-news.xml",              # Tamil news
-        # Add more RSS feeds as needed
-    ]
+    Parameters:
+    - rss_urls: List of RSS feed URLs
+    - num_articles: Number of articles to fetch per feed (default: 5)
+    - since_date: Only fetch articles published after this date (default: None)
+    - feed_cache: FeedCache to reuse between runs (default: loaded from disk)
+    - seen_index: SeenIndex to reuse between runs (default: loaded from disk)
+    - pretranslate: Start translating new articles in the background (default: True)
+
+    Returns:
+    - List of newly saved articles
+    """
+    # Validators from previous runs let unchanged feeds skip download and parsing
+    if feed_cache is None:
+        feed_cache = FeedCache()
+    feed_cache.reset_stats()
+
+    # Articles processed by earlier runs are skipped before language detection
+    if seen_index is None:
+        seen_index = SeenIndex()
+    if not seen_index.articles:
+        seen_index.mark_seen(get_article_repository().all())
+
+    if CONCURRENT_SCRAPING:
+        all_processed_articles = process_feeds_concurrently(rss_urls, num_articles, since_date,
+                                                            cache=feed_cache, seen=seen_index)
+    else:
+        all_processed_articles = []
+
+        # Process each RSS feed
+        for url in rss_urls:
+            articles = process_news_for_kids(url, num_articles=num_articles,
+                                            since_date=since_date, cache=feed_cache,
+                                            seen=seen_index)
+            all_processed_articles.extend(articles)
+
+    feed_cache.save()
+    feed_cache.report()
+
+    # Mark every fetched copy as seen, then keep one article per story
+    seen_index.mark_seen(all_processed_articles)
+    all_processed_articles = deduplicate_articles(all_processed_articles,
+                                                  existing=get_article_repository())
+
+    # Save results
+    save_processed_articles(all_processed_articles)
+    seen_index.prune()
+    seen_index.save()
 
+    # Translate the new articles in the background so reviewers see Tamil text
+    if pretranslate and any(article['needs_translation'] for article in all_processed_articles):
+        start_pretranslation()
+
+    return all_processed_articles
+
+def main():
     # Optional: Filter by date (e.g., only articles from the last day)
     # since_date = datetime.datetime.now() - datetime.timedelta(days=1)
     since_date = None
 
-    all_processed_articles = []
-
-    # Process each RSS feed
-    for url in rss_urls:
-        articles = process_news_for_kids(url, num_articles=2,  # Reduced to 2 for faster testing
-                                        since_date=since_date)
-        all_processed_articles.extend(articles)
-
-    # Save results
-    save_processed_articles(all_processed_articles)
+    all_processed_articles = scrape_feeds(RSS_FEEDS, num_articles=2,  # Reduced to 2 for faster testing
+                                          since_date=since_date)
 
     # Print results
     print("\nProcessed News Articles:")
@@ -193,5 +512,8 @@ def main():
         print(f"   Language: {article['title_language']}")
         print(f"   Needs Translation: {'Yes' if article['needs_translation'] else 'No'}")
 
+    # Let the background translation finish before the process exits
+    wait_for_pretranslation()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
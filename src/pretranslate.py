@@ -0,0 +1,261 @@
+"""
+Background translation of newly scraped articles
+
+Right after scraping, articles flagged `needs_translation` are translated in
+a background thread, so reviewers see (and edit) Tamil text and podcast
+generation only has to assemble it. Progress is tracked per article in
+`translation_status`:
+
+- pending: waiting to be translated
+- translating: picked up by the background stage
+- done: translated by the translation API
+- fallback: the API failed, so known words were substituted; retried later
+  (after FALLBACK_RETRY_DELAY, doubling each time, up to
+  MAX_TRANSLATION_ATTEMPTS attempts in all)
+- edited: a reviewer wrote the Tamil text before it was translated
+- not_needed: the article is already in Tamil
+
+Usage: python src/pretranslate.py
+"""
+import os
+import sys
+import datetime
+import threading
+
+# Fix import paths
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(current_dir))  # Add parent directory to path
+
+from src.seen_index import article_key
+from src.article_repository import get_article_repository
+from src.translation import translate_segments, basic_translate
+from src.translation_memory import get_translation_memory
+
+# Texts shorter than this are kept as they are
+MIN_TRANSLATION_LENGTH = 5
+
+# Statuses the background stage still has to work on
+UNFINISHED_STATUSES = ("pending", "translating")
+
+# Retrying articles that fell back to word substitution
+MAX_TRANSLATION_ATTEMPTS = 4
+FALLBACK_RETRY_DELAY = 300  # Seconds before the first retry; doubles after each failed attempt
+
+_worker = None
+_worker_lock = threading.Lock()
+_rerun = threading.Event()
+
+def initial_status(article):
+    """
+    Translation status for a freshly processed article
+
+    Parameters:
+    - article: Processed article dictionary
+
+    Returns:
+    - 'pending' or 'not_needed'
+    """
+    return "pending" if article.get('needs_translation') else "not_needed"
+
+def needs_pretranslation(article):
+    """
+    Whether the background stage should translate an article
+
+    Articles from before this stage have no status and are picked up if they
+    need translation; articles a reviewer has edited are left alone.
+    """
+    if article.get('edited'):
+        return False
+    status = article.get('translation_status', initial_status(article))
+    if status == "fallback":
+        return fallback_retry_due(article)
+    return status in UNFINISHED_STATUSES
+
+def fallback_retry_due(article, now=None):
+    """
+    Whether an article that fell back to word substitution should be translated again
+
+    Parameters:
+    - article: Processed article with translation_status 'fallback'
+    - now: Current time (default: now)
+
+    Returns:
+    - True if attempts remain and the backoff since the last attempt has passed
+    """
+    attempts = article.get('translation_attempts', 1)
+    if attempts >= MAX_TRANSLATION_ATTEMPTS:
+        return False
+    try:
+        last_attempt = datetime.datetime.fromisoformat(article['translated_at'])
+    except (KeyError, TypeError, ValueError):
+        return True
+    delay = FALLBACK_RETRY_DELAY * 2 ** (attempts - 1)
+    return (now or datetime.datetime.now()) - last_attempt >= datetime.timedelta(seconds=delay)
+
+def article_segments(article):
+    """
+    Texts of an article that need translating
+
+    Parameters:
+    - article: Processed article dictionary
+
+    Returns:
+    - List of (field, source text) pairs, e.g. ('tamil_title', 'Rain in Chennai')
+    """
+    # Reuse the text normalized at ingest (older articles only have the raw HTML)
+    segments = []
+    if article.get('title_language') != "ta":
+        segments.append(('tamil_title', article.get('normalized_title', article['original_title'])))
+    if article.get('summary_language') != "ta":
+        segments.append(('tamil_summary', article.get('normalized_summary', article['original_summary'])))
+    return [(field, text) for field, text in segments
+            if text and len(text.strip()) >= MIN_TRANSLATION_LENGTH]
+
+def translate_articles(articles):
+    """
+    Translate the titles and summaries of articles in place
+
+    All segments go through translate_segments together, so they share
+    batches and the translation memory. Segments the API cannot translate
+    fall back to word substitution.
+
+    Parameters:
+    - articles: Processed articles to translate
+
+    Returns:
+    - The same articles, with tamil_title/tamil_summary and translation_status set
+    """
+    segments = [(article, field, text) for article in articles for field, text in article_segments(article)]
+    print(f"Translating {len(segments)} segments from {len(articles)} articles")
+    translations = translate_segments([text for _, _, text in segments])
+
+    fallback_keys = set()
+    for (article, field, text), translated in zip(segments, translations):
+        if translated is None:
+            print(f"Translation failed, using word substitution: {text[:50]}...")
+            translated = basic_translate(text)
+            fallback_keys.add(article_key(article))
+        article[field] = translated
+
+    now = datetime.datetime.now().isoformat()
+    for article in articles:
+        article['translation_status'] = "fallback" if article_key(article) in fallback_keys else "done"
+        article['translated_at'] = now
+        article['translation_attempts'] = article.get('translation_attempts', 0) + 1
+
+    print(f"Translation memory: {get_translation_memory().summary()}")
+    return articles
+
+def _update_articles(repository, updates, statuses=None):
+    """
+    Apply field updates to stored articles, matched by key
+
+    Changes made meanwhile (new articles, approvals, reviewer edits) are
+    kept. Articles edited by a reviewer keep their text.
+
+    Parameters:
+    - repository: Article repository
+    - updates: Dictionary of article key -> fields to set
+    - statuses: Only update articles whose status is one of these (default: any)
+    """
+    def applies(article):
+        if article.get('edited'):
+            return False
+        return not statuses or article.get('translation_status', initial_status(article)) in statuses
+
+    repository.update_many(updates, applies)
+
+def run_pretranslation(repository=None):
+    """
+    Translate every stored article that is still waiting for translation
+
+    Parameters:
+    - repository: Article repository (default: the shared one)
+
+    Returns:
+    - Number of articles translated
+    """
+    repository = repository or get_article_repository()
+
+    # Only articles that can still need work are read; fallback ones are then checked for a due retry.
+    # Translate copies; results are applied to the stored articles at the end
+    pending = [dict(article) for article in repository.translation_candidates(UNFINISHED_STATUSES + ("fallback",))
+               if needs_pretranslation(article)]
+    if not pending:
+        return 0
+
+    _update_articles(repository, {article_key(article): {'translation_status': "translating"}
+                                  for article in pending})
+
+    try:
+        translate_articles(pending)
+    except Exception as e:
+        # Leave the articles pending so the next run retries them
+        print(f"Error during background translation: {e}")
+        _update_articles(repository, {article_key(article): {'translation_status': "pending"}
+                                      for article in pending}, statuses=("translating",))
+        return 0
+
+    fields = ('tamil_title', 'tamil_summary', 'translation_status', 'translated_at', 'translation_attempts')
+    _update_articles(repository, {article_key(article): {field: article[field] for field in fields}
+                                  for article in pending}, statuses=("translating",))
+    print(f"Pre-translated {len(pending)} articles")
+    return len(pending)
+
+def _work():
+    """Background thread body: run until no new work was requested meanwhile"""
+    global _worker
+    while True:
+        _rerun.clear()
+        try:
+            run_pretranslation()
+        except Exception as e:
+            print(f"Error during background translation: {e}")
+        with _worker_lock:
+            if not _rerun.is_set():
+                _worker = None
+                return
+
+def start_pretranslation():
+    """
+    Translate pending articles in a background thread
+
+    If the stage is already running it makes one more pass when it finishes,
+    so articles saved meanwhile are not missed.
+
+    Returns:
+    - The background thread
+    """
+    global _worker
+    with _worker_lock:
+        _rerun.set()
+        if _worker is None:
+            _worker = threading.Thread(target=_work, name="pretranslate", daemon=True)
+            _worker.start()
+        return _worker
+
+def wait_for_pretranslation():
+    """Block until the background translation stage has finished"""
+    with _worker_lock:
+        worker = _worker
+    if worker is not None:
+        worker.join()
+
+def translation_progress(articles):
+    """
+    Count articles by translation status
+
+    Parameters:
+    - articles: Processed articles
+
+    Returns:
+    - Dictionary of status -> number of articles
+    """
+    progress = {}
+    for article in articles:
+        status = article.get('translation_status', initial_status(article))
+        progress[status] = progress.get(status, 0) + 1
+    return progress
+
+if __name__ == "__main__":
+    run_pretranslation()
@@ -0,0 +1,205 @@
+"""
+Registry of API clients for translation and text-to-speech providers
+
+Each client is created once per process and reused, so its keep-alive HTTP
+connection pool is shared by every request instead of paying connection
+setup and TLS handshakes on every call.
+
+Backends are pluggable: a backend is a mapping from provider name ('openai',
+'google') to a factory that builds a client. The 'live' backend talks to the
+real APIs; the 'mock' backend answers locally so the whole pipeline can be
+load-tested offline. Choose one with the PROVIDER_BACKEND environment
+variable, or register your own with register_backend().
+"""
+import os
+import sys
+import json
+import time
+import threading
+
+# Fix import paths
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(current_dir))  # Add parent directory to path
+
+from src.utils import ensure_dir_exists
+
+PROVIDER_BACKEND = os.environ.get('PROVIDER_BACKEND', 'live')
+
+# Connection pool shared by all requests to one provider
+HTTP_MAX_CONNECTIONS = int(os.environ.get('PROVIDER_MAX_CONNECTIONS', 20))
+HTTP_MAX_KEEPALIVE = int(os.environ.get('PROVIDER_MAX_KEEPALIVE', 10))
+HTTP_KEEPALIVE_EXPIRY = 60.0   # Seconds an idle connection is kept open
+HTTP_TIMEOUT = 60.0
+
+# Simulated response time of the mock backend, in seconds
+MOCK_LATENCY = float(os.environ.get('MOCK_PROVIDER_LATENCY', 0.2))
+
+def _openai_client():
+    """Build an OpenAI client with its own pooled HTTP client, or None if unavailable"""
+    try:
+        import httpx
+        from openai import OpenAI
+    except ImportError:
+        return None
+
+    if 'OPENAI_API_KEY' not in os.environ:
+        return None
+
+    http_client = httpx.Client(
+        timeout=HTTP_TIMEOUT,
+        limits=httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS,
+                            max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+                            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY))
+    # Retries are handled by src.rate_limit, so the SDK should not retry as well
+    return OpenAI(api_key=os.environ['OPENAI_API_KEY'], http_client=http_client, max_retries=0)
+
+def _google_client():
+    """Build a Google Cloud Translation client, or None if unavailable"""
+    try:
+        from google.cloud import translate_v2 as translate
+    except ImportError:
+        return None
+
+    if 'GOOGLE_APPLICATION_CREDENTIALS' not in os.environ:
+        return None
+
+    return translate.Client()
+
+# Mock backend: mirrors the parts of the client APIs the pipeline uses
+
+# One silent MPEG-1 Layer III frame (128 kbps, 44.1 kHz, 417 bytes, about 26 ms)
+SILENT_MP3_FRAME = b'\xFF\xFB\x90\x44' + b'\x00' * 413
+
+class _MockResponse:
+    """Object shaped like an OpenAI response"""
+
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+class _MockCompletions:
+    def create(self, model, messages, response_format=None, **kwargs):
+        time.sleep(MOCK_LATENCY)
+        request = messages[-1]['content']
+        if response_format and response_format.get('type') == 'json_object':
+            segments = json.loads(request)['segments']
+            content = json.dumps({"translations": [
+                {"id": segment['id'], "text": f"[ta] {segment['text']}"} for segment in segments]},
+                ensure_ascii=False)
+        else:
+            content = f"[ta] {request}"
+        message = _MockResponse(content=content)
+        return _MockResponse(choices=[_MockResponse(message=message)])
+
+class _MockSpeechResponse:
+    def __init__(self, content):
+        self.content = content
+
+    def stream_to_file(self, output_file):
+        ensure_dir_exists(os.path.dirname(output_file))
+        with open(output_file, 'wb') as f:
+            f.write(self.content)
+
+class _MockSpeech:
+    def create(self, model, voice, input, **kwargs):
+        time.sleep(MOCK_LATENCY)
+        # Roughly 15 characters of speech per second
+        frames = max(1, int(len(input) / 15 / 0.026))
+        return _MockSpeechResponse(SILENT_MP3_FRAME * frames)
+
+class MockOpenAIClient:
+    """Offline stand-in for the OpenAI client (chat completions and speech)"""
+
+    def __init__(self):
+        self.chat = _MockResponse(completions=_MockCompletions())
+        self.audio = _MockResponse(speech=_MockSpeech())
+
+class MockGoogleClient:
+    """Offline stand-in for the Google Cloud Translation client"""
+
+    def translate(self, text, target_language):
+        time.sleep(MOCK_LATENCY)
+        return {"translatedText": f"[{target_language}] {text}"}
+
+_backends = {
+    'live': {'openai': _openai_client, 'google': _google_client},
+    'mock': {'openai': MockOpenAIClient, 'google': MockGoogleClient},
+}
+_clients = {}
+_clients_lock = threading.Lock()
+
+def register_backend(name, factories):
+    """
+    Add or replace a provider backend
+
+    Parameters:
+    - name: Backend name, selected with PROVIDER_BACKEND
+    - factories: Dictionary mapping provider name to a function that builds
+                 its client (returning None if the provider is unavailable)
+    """
+    with _clients_lock:
+        _backends[name] = dict(factories)
+        for key in [key for key in _clients if key[0] == name]:
+            del _clients[key]
+
+def get_client(provider, backend=None):
+    """
+    Shared client for a provider, created on first use
+
+    Parameters:
+    - provider: Provider name ('openai' or 'google')
+    - backend: Backend name (default: PROVIDER_BACKEND)
+
+    Returns:
+    - Client object, or None if the provider is unavailable
+    """
+    backend = backend or PROVIDER_BACKEND
+    key = (backend, provider)
+    with _clients_lock:
+        if key not in _clients:
+            factory = _backends.get(backend, {}).get(provider)
+            if factory is None:
+                print(f"No {provider} provider in backend '{backend}'")
+                return None
+            client = factory()
+            if client is None:
+                # Not cached, so a key added later is picked up
+                return None
+            _clients[key] = client
+        return _clients[key]
+
+def provider_installed(provider, backend=None):
+    """
+    Whether a provider's client library is available (mock providers always are)
+
+    Parameters:
+    - provider: Provider name ('openai' or 'google')
+    - backend: Backend name (default: PROVIDER_BACKEND)
+
+    Returns:
+    - True if a client can be built once credentials are set
+    """
+    backend = backend or PROVIDER_BACKEND
+    if backend != 'live':
+        return provider in _backends.get(backend, {})
+    module = {'openai': 'openai', 'google': 'google.cloud.translate_v2'}.get(provider)
+    try:
+        __import__(module)
+        return True
+    except (ImportError, TypeError):
+        return False
+
+def memory_provider(provider, backend=None):
+    """
+    Provider name used in translation memory keys
+
+    Keeps translations from other backends (e.g. mock output) apart from real ones.
+
+    Parameters:
+    - provider: Provider name ('openai' or 'google')
+    - backend: Backend name (default: PROVIDER_BACKEND)
+
+    Returns:
+    - Name such as 'openai' or 'mock:openai'
+    """
+    backend = backend or PROVIDER_BACKEND
+    return provider if backend == 'live' else f"{backend}:{provider}"
@@ -0,0 +1,146 @@
+"""
+Rate limiting and retry helpers for calls to paid APIs
+
+A token bucket for requests per minute and one for tokens per minute keep
+concurrent workers under the provider's limits; rate-limit and server errors
+are retried with jittered exponential backoff.
+"""
+import os
+import sys
+import time
+import random
+import threading
+
+# Fix import paths
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(current_dir))  # Add parent directory to path
+
+# OpenAI limits for this account (override with environment variables)
+OPENAI_REQUESTS_PER_MINUTE = int(os.environ.get('OPENAI_REQUESTS_PER_MINUTE', 500))
+OPENAI_TOKENS_PER_MINUTE = int(os.environ.get('OPENAI_TOKENS_PER_MINUTE', 90000))
+
+# Retry policy for 429 and 5xx responses
+MAX_RETRIES = 5
+BACKOFF_BASE_DELAY = 1.0   # Seconds before the first retry (upper bound)
+BACKOFF_MAX_DELAY = 30.0
+
+# Errors the OpenAI client raises for transient failures
+RETRYABLE_ERROR_NAMES = {"RateLimitError", "InternalServerError", "APITimeoutError", "APIConnectionError"}
+
+class TokenBucket:
+    """
+    Classic token bucket: holds up to `capacity` tokens, refilled continuously
+
+    Safe to share between threads; acquire() blocks until enough tokens are available.
+    """
+
+    def __init__(self, rate_per_minute, capacity=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, amount=1):
+        """
+        Take tokens from the bucket, waiting until they are available
+
+        Parameters:
+        - amount: Number of tokens (capped at the bucket capacity)
+
+        Returns:
+        - Seconds spent waiting
+        """
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                delay = (amount - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute buckets for one provider"""
+
+    def __init__(self, requests_per_minute, tokens_per_minute):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+
+    def acquire(self, tokens):
+        """
+        Wait until one request using `tokens` tokens may be sent
+
+        Parameters:
+        - tokens: Estimated tokens the request will use
+
+        Returns:
+        - Seconds spent waiting
+        """
+        return self.requests.acquire(1) + self.tokens.acquire(tokens)
+
+def is_retryable(error):
+    """
+    Whether an API error is worth retrying (rate limits, server errors, timeouts)
+
+    Parameters:
+    - error: Exception raised by the API client
+
+    Returns:
+    - True for 429, 5xx and connection problems
+    """
+    status = getattr(error, 'status_code', None)
+    if status is None:
+        status = getattr(getattr(error, 'response', None), 'status_code', None)
+    if status is not None:
+        return status == 429 or status >= 500
+    return type(error).__name__ in RETRYABLE_ERROR_NAMES
+
+def call_with_backoff(function, *args, max_retries=MAX_RETRIES,
+                      base_delay=BACKOFF_BASE_DELAY, max_delay=BACKOFF_MAX_DELAY, **kwargs):
+    """
+    Call a function, retrying transient API errors with jittered exponential backoff
+
+    Parameters:
+    - function: Function to call with *args and **kwargs
+    - max_retries: Number of retries after the first attempt
+    - base_delay: Upper bound of the first backoff delay in seconds
+    - max_delay: Upper bound of any backoff delay in seconds
+
+    Returns:
+    - The function's return value; the last error is raised if all attempts fail
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return function(*args, **kwargs)
+        except Exception as e:
+            if attempt == max_retries or not is_retryable(e):
+                raise
+            # "Full jitter": spreads retries from concurrent workers apart
+            delay = random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+            print(f"Transient API error ({e}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+_openai_limiter = None
+_limiter_lock = threading.Lock()
+
+def get_openai_rate_limiter():
+    """
+    Shared OpenAI rate limiter for this process
+
+    Returns:
+    - RateLimiter instance
+    """
+    global _openai_limiter
+    with _limiter_lock:
+        if _openai_limiter is None:
+            _openai_limiter = RateLimiter(OPENAI_REQUESTS_PER_MINUTE, OPENAI_TOKENS_PER_MINUTE)
+        return _openai_limiter
@@ -0,0 +1,261 @@
+"""
+Circuit breakers and hedged requests for translation providers
+
+Each provider has a circuit breaker that tracks the outcome and latency of
+its recent calls. When too many calls fail (or are too slow) the breaker
+opens and the provider is skipped until a cool-down has passed; then one
+trial call decides whether it closes again.
+
+Hedging: if the primary provider has not answered within a high percentile
+of its recent latencies, the same request is also sent to the next provider
+and whichever answer arrives first is used.
+
+Breaker state changes and hedge outcomes are appended to
+data/resilience_events.jsonl so thresholds can be tuned from real traffic.
+"""
+import os
+import sys
+import json
+import time
+import datetime
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# Fix import paths
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(current_dir))  # Add parent directory to path
+
+from src.utils import ensure_dir_exists
+
+RESILIENCE_EVENTS_FILE = os.path.join("data", "resilience_events.jsonl")
+
+# Circuit breaker policy
+BREAKER_WINDOW = 50             # Recent calls considered per provider
+BREAKER_MIN_CALLS = 10          # Calls needed before the breaker can open
+BREAKER_FAILURE_RATE = 0.5      # Open when this share of recent calls failed...
+BREAKER_SLOW_CALL_SECONDS = 20.0
+BREAKER_SLOW_RATE = 0.8         # ...or this share was slower than BREAKER_SLOW_CALL_SECONDS
+BREAKER_OPEN_SECONDS = 30.0     # Cool-down before a trial call is let through
+
+# Hedging policy
+HEDGE_REQUESTS = os.environ.get('TRANSLATION_HEDGING', '1') == '1'
+HEDGE_PERCENTILE = 0.95         # Hedge once the primary is slower than this share of its calls
+HEDGE_DEFAULT_DELAY = 5.0       # Seconds, used until enough latencies are recorded
+HEDGE_MIN_DELAY = 0.5
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_events_lock = threading.Lock()
+
+def record_event(event, **fields):
+    """
+    Append a resilience event to the events log
+
+    Parameters:
+    - event: Event name (e.g. 'breaker_state', 'hedge')
+    - fields: Event details
+    """
+    entry = {"time": datetime.datetime.now().isoformat(), "event": event, **fields}
+    print(f"Resilience event: {entry}")
+    with _events_lock:
+        try:
+            ensure_dir_exists(os.path.dirname(RESILIENCE_EVENTS_FILE))
+            with open(RESILIENCE_EVENTS_FILE, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"Error writing resilience event: {e}")
+
+class CircuitBreaker:
+    """
+    Error-rate and latency circuit breaker for one provider
+
+    Safe to share between threads.
+    """
+
+    def __init__(self, name, window=BREAKER_WINDOW, min_calls=BREAKER_MIN_CALLS,
+                 failure_rate=BREAKER_FAILURE_RATE, slow_call_seconds=BREAKER_SLOW_CALL_SECONDS,
+                 slow_rate=BREAKER_SLOW_RATE, open_seconds=BREAKER_OPEN_SECONDS):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_rate = slow_rate
+        self.open_seconds = open_seconds
+        self.calls = deque(maxlen=window)   # (succeeded, latency) of recent calls
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+        self.lock = threading.Lock()
+
+    def _set_state(self, state, reason):
+        """Change state and log it (lock held)"""
+        if state != self.state:
+            record_event("breaker_state", provider=self.name, previous=self.state,
+                         state=state, reason=reason)
+            self.state = state
+
+    def allow(self):
+        """
+        Whether a call to the provider may be made now
+
+        Returns:
+        - True if the breaker is closed, or half-open and no trial call is running
+        """
+        with self.lock:
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.open_seconds:
+                self._set_state(HALF_OPEN, "cool-down over")
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self.trial_in_flight:
+                self.trial_in_flight = True
+                return True
+            return False
+
+    def record(self, succeeded, latency):
+        """
+        Record the outcome of a call
+
+        Parameters:
+        - succeeded: Whether the call returned a usable result
+        - latency: Seconds the call took
+        """
+        with self.lock:
+            self.calls.append((succeeded, latency))
+
+            if self.state == HALF_OPEN:
+                self.trial_in_flight = False
+                if succeeded and latency < self.slow_call_seconds:
+                    self.calls.clear()
+                    self._set_state(CLOSED, "trial call succeeded")
+                else:
+                    self.opened_at = time.monotonic()
+                    self._set_state(OPEN, "trial call failed")
+                return
+
+            if self.state != CLOSED or len(self.calls) < self.min_calls:
+                return
+            failures = sum(1 for ok, _ in self.calls if not ok) / len(self.calls)
+            slow = sum(1 for _, seconds in self.calls if seconds >= self.slow_call_seconds) / len(self.calls)
+            if failures >= self.failure_rate or slow >= self.slow_rate:
+                self.opened_at = time.monotonic()
+                self._set_state(OPEN, f"failure rate {failures:.0%}, slow rate {slow:.0%}")
+
+    def latency_percentile(self, percentile):
+        """
+        Latency of recent successful calls at a percentile
+
+        Parameters:
+        - percentile: Between 0 and 1 (e.g. 0.95)
+
+        Returns:
+        - Seconds, or None if fewer than min_calls calls succeeded recently
+        """
+        with self.lock:
+            latencies = sorted(seconds for ok, seconds in self.calls if ok)
+        if len(latencies) < self.min_calls:
+            return None
+        return latencies[min(len(latencies) - 1, int(percentile * len(latencies)))]
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+def get_breaker(provider):
+    """
+    Shared circuit breaker for a provider
+
+    Parameters:
+    - provider: Provider name
+
+    Returns:
+    - CircuitBreaker instance
+    """
+    with _breakers_lock:
+        if provider not in _breakers:
+            _breakers[provider] = CircuitBreaker(provider)
+        return _breakers[provider]
+
+# Threads for hedged calls; a losing call keeps running here until it returns
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="hedge")
+
+def _submit(name, function, argument):
+    """Start a provider call whose outcome is recorded on the provider's breaker"""
+    breaker = get_breaker(name)
+    start = time.monotonic()
+
+    def call():
+        try:
+            result = function(argument)
+        except Exception as e:
+            print(f"{name} call failed: {e}")
+            result = None
+        breaker.record(bool(result), time.monotonic() - start)
+        return name, result, time.monotonic() - start
+
+    return _executor.submit(call)
+
+def call_with_hedging(providers, argument, hedge=None, percentile=HEDGE_PERCENTILE):
+    """
+    Call providers in order of preference, skipping open breakers and hedging slow calls
+
+    A provider that fails moves on to the next one straight away. A provider
+    that is slower than `percentile` of its recent calls gets the next
+    provider started alongside it, and the first usable answer wins.
+
+    Parameters:
+    - providers: List of (name, function) pairs in order of preference;
+                 each function takes `argument` and returns a result or None
+    - argument: Argument passed to the provider functions
+    - hedge: Whether to hedge slow calls (default: HEDGE_REQUESTS)
+    - percentile: Latency percentile after which a call is hedged
+
+    Returns:
+    - (provider name, result, seconds taken) of the winning call, or (None, None, seconds)
+    """
+    hedge = HEDGE_REQUESTS if hedge is None else hedge
+    start = time.monotonic()
+    remaining = [(name, function) for name, function in providers]
+    in_flight = {}
+    hedged_provider = None
+
+    while remaining or in_flight:
+        # Start the next provider whose breaker lets calls through
+        started = None
+        while remaining and started is None:
+            name, function = remaining.pop(0)
+            if get_breaker(name).allow():
+                started = name
+                in_flight[_submit(name, function, argument)] = name
+            else:
+                print(f"Skipping {name}: circuit breaker open")
+
+        if not in_flight:
+            break
+
+        # Wait until the newest call is due to be hedged, or for everything if it can't be
+        timeout = None
+        if hedge and remaining and started is not None:
+            timeout = get_breaker(started).latency_percentile(percentile) or HEDGE_DEFAULT_DELAY
+            timeout = max(HEDGE_MIN_DELAY, timeout)
+
+        done, _ = wait(list(in_flight), timeout=timeout, return_when=FIRST_COMPLETED)
+        if not done:
+            hedged_provider = started
+            record_event("hedge", slow_provider=started, hedged_after=round(timeout, 2),
+                         hedge_provider=remaining[0][0])
+            continue
+
+        for future in done:
+            name = in_flight.pop(future)
+            _, result, _ = future.result()
+            if result:
+                elapsed = time.monotonic() - start
+                if hedged_provider is not None:
+                    # Did the hedge beat the slow call it was started for?
+                    record_event("hedge_result", winner=name, slow_provider=hedged_provider,
+                                 hedge_won=name != hedged_provider, seconds=round(elapsed, 2))
+                return name, result, elapsed
+
+    return None, None, time.monotonic() - start
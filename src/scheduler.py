@@ -0,0 +1,144 @@
+"""
+Adaptive feed polling scheduler
+
+Runs the scraper continuously. Each feed gets its own polling interval, learnt
+from the gaps between the publish times we have seen for it: busy feeds are
+polled more often, feeds that come back empty back off, and every interval is
+jittered so feeds do not all fire at the same moment.
+
+Usage: python src/scheduler.py
+"""
+import os
+import sys
+import time
+import random
+import datetime
+import statistics
+
+# Fix import paths
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(current_dir))  # Add parent directory to path
+
+from src.utils import load_json_file, save_json_file
+from src.main import RSS_FEEDS, scrape_feeds
+from src.feed_cache import FeedCache
+from src.seen_index import SeenIndex
+
+SCHEDULER_STATE_FILE = os.path.join("data", "scheduler_state.json")
+
+# Polling policy (all intervals in seconds)
+MIN_INTERVAL = 5 * 60
+MAX_INTERVAL = 6 * 60 * 60
+DEFAULT_INTERVAL = 30 * 60
+BACKOFF_FACTOR = 1.5      # Interval growth after a poll that found nothing new
+POLLS_PER_ARTICLE = 2     # Poll this many times per expected new article
+CADENCE_SAMPLES = 20      # Number of recent publish times used to learn cadence
+JITTER = 0.1              # Random spread of +/-10% on every interval
+ARTICLES_PER_POLL = 10
+
+def learn_interval(publish_times):
+    """
+    Work out a polling interval from a feed's publish history
+
+    Parameters:
+    - publish_times: Sorted ISO publish times seen for the feed
+
+    Returns:
+    - Interval in seconds, or None if there is not enough history
+    """
+    recent = publish_times[-CADENCE_SAMPLES:]
+    if len(recent) < 3:
+        return None
+
+    times = [datetime.datetime.fromisoformat(value) for value in recent]
+    gaps = [(later - earlier).total_seconds() for earlier, later in zip(times, times[1:])]
+    gaps = [gap for gap in gaps if gap > 0]
+    if not gaps:
+        return None
+
+    # The median ignores the occasional burst or overnight gap
+    interval = statistics.median(gaps) / POLLS_PER_ARTICLE
+    return min(MAX_INTERVAL, max(MIN_INTERVAL, interval))
+
+def next_interval(feed_state, publish_times, found_new):
+    """
+    Choose the interval until a feed's next poll
+
+    Parameters:
+    - feed_state: Scheduler state for the feed
+    - publish_times: Sorted ISO publish times seen for the feed
+    - found_new: Whether the last poll produced new articles
+
+    Returns:
+    - Interval in seconds (before jitter)
+    """
+    learned = learn_interval(publish_times) or DEFAULT_INTERVAL
+    if found_new:
+        return learned
+
+    # Back off from whichever is longer: the learned cadence or the current interval
+    current = max(feed_state.get('interval', learned), learned)
+    return min(MAX_INTERVAL, current * BACKOFF_FACTOR)
+
+def with_jitter(interval):
+    """Spread an interval randomly by +/-JITTER"""
+    return interval * random.uniform(1 - JITTER, 1 + JITTER)
+
+def run_scheduler(rss_urls=None, max_cycles=None, state_file=SCHEDULER_STATE_FILE):
+    """
+    Poll feeds forever (or for max_cycles), each on its own adaptive schedule
+
+    Parameters:
+    - rss_urls: Feeds to poll (default: RSS_FEEDS)
+    - max_cycles: Stop after this many polling cycles (default: run forever)
+    - state_file: Where per-feed schedules are persisted
+    """
+    rss_urls = rss_urls or RSS_FEEDS
+    state = load_json_file(state_file) or {}
+    feed_cache = FeedCache()
+    seen_index = SeenIndex()
+
+    # Spread the first polls of unknown feeds over a short window
+    now = time.time()
+    for url in rss_urls:
+        state.setdefault(url, {'interval': DEFAULT_INTERVAL,
+                               'next_poll': now + random.uniform(0, MIN_INTERVAL * JITTER)})
+
+    cycles = 0
+    while True:
+        now = time.time()
+        due = [url for url in rss_urls if state[url]['next_poll'] <= now]
+
+        if due:
+            print(f"Polling {len(due)} due feeds")
+            keys_before = {url: seen_index.feed_keys(url) for url in due}
+            try:
+                scrape_feeds(due, num_articles=ARTICLES_PER_POLL,
+                             feed_cache=feed_cache, seen_index=seen_index)
+            except Exception as e:
+                print(f"Error during scheduled scrape: {e}")
+
+            now = time.time()
+            for url in due:
+                feed_state = state[url]
+                # Late or backdated stories count too, so compare keys rather than the high-water mark
+                found_new = bool(seen_index.feed_keys(url) - keys_before[url])
+                interval = next_interval(feed_state, seen_index.publish_times(url), found_new)
+                feed_state['interval'] = interval
+                feed_state['last_poll'] = now
+                feed_state['empty_polls'] = 0 if found_new else feed_state.get('empty_polls', 0) + 1
+                feed_state['next_poll'] = now + with_jitter(interval)
+                print(f"Next poll of {url} in {interval / 60:.1f} minutes"
+                      f"{'' if found_new else ' (no new articles)'}")
+
+            save_json_file(state, state_file)
+            cycles += 1
+            if max_cycles is not None and cycles >= max_cycles:
+                break
+
+        # Sleep until the next feed is due
+        next_due = min(state[url]['next_poll'] for url in rss_urls)
+        time.sleep(max(1, next_due - time.time()))
+
+if __name__ == "__main__":
+    run_scheduler()
@@ -0,0 +1,156 @@
+"""
+Persistent index of articles the scraper has already processed
+
+Articles are keyed by a hash of their GUID (or link); the key index decides
+what is new. Each feed also keeps a high-water mark on publish time, used
+only to reject entries older than the key retention window (whose keys may
+have been pruned), so late or backdated stories are still picked up.
+"""
+import os
+import sys
+import hashlib
+import datetime
+import threading
+
+# Fix import paths
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(current_dir))  # Add parent directory to path
+
+from src.utils import load_json_file, save_json_file
+
+SEEN_INDEX_FILE = os.path.join("data", "seen_articles.json")
+SEEN_RETENTION_DAYS = 30  # Forget articles first seen longer ago than this
+
+def article_key(article):
+    """
+    Stable key for an article, based on its link or GUID
+
+    Parameters:
+    - article: Raw or processed article dictionary
+
+    Returns:
+    - Short hex hash identifying the article
+    """
+    if article.get('key'):
+        return article['key']
+
+    identity = (article.get('link') or article.get('guid') or
+                article.get('title') or article.get('original_title') or "")
+    return hashlib.sha1(identity.strip().encode('utf-8')).hexdigest()[:16]
+
+class SeenIndex:
+    """
+    Seen-article keys plus a per-feed high-water mark on publish time
+
+    Safe to share between the threads used for concurrent scraping.
+    """
+
+    def __init__(self, filepath=SEEN_INDEX_FILE):
+        self.filepath = filepath
+        data = load_json_file(filepath) or {}
+        self.articles = data.get('articles', {})
+        self.high_water = data.get('high_water', {})
+        self.lock = threading.Lock()
+
+    def filter_new(self, feed_url, articles):
+        """
+        Drop articles that were already processed
+
+        Parameters:
+        - feed_url: URL of the feed the articles came from
+        - articles: Raw articles from fetch_rss_articles
+
+        Returns:
+        - Articles that are not in the index and were published within the
+          retention window before the feed's high-water mark
+        """
+        with self.lock:
+            cutoff = None
+            high_water = self.high_water.get(feed_url)
+            if high_water:
+                try:
+                    cutoff = (datetime.datetime.fromisoformat(high_water) -
+                              datetime.timedelta(days=SEEN_RETENTION_DAYS)).isoformat()
+                except ValueError:
+                    cutoff = None
+            new_articles = []
+            for article in articles:
+                if article_key(article) in self.articles:
+                    continue
+                # Keys older than the retention window are pruned, so the mark rejects those
+                if cutoff and article.get('published', '') < cutoff:
+                    continue
+                new_articles.append(article)
+            return new_articles
+
+    def mark_seen(self, articles, feed_url=None):
+        """
+        Record processed articles and advance the feed high-water mark
+
+        Parameters:
+        - articles: Raw or processed articles
+        - feed_url: Feed the articles came from (default: each article's 'feed')
+        """
+        now = datetime.datetime.now().isoformat()
+        # Publish times are naive UTC; a date in the future must not move the mark past real items
+        latest = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None).isoformat()
+        with self.lock:
+            for article in articles:
+                key = article_key(article)
+                feed = feed_url or article.get('feed')
+                published = article.get('published', '')
+                if key not in self.articles:
+                    self.articles[key] = {'feed': feed, 'published': published, 'first_seen': now}
+                if feed and self.high_water.get(feed, '') < published <= latest:
+                    self.high_water[feed] = published
+
+    def feed_keys(self, feed_url):
+        """
+        Keys of the articles seen from one feed
+
+        Parameters:
+        - feed_url: URL of the feed
+
+        Returns:
+        - Set of article keys
+        """
+        with self.lock:
+            return {key for key, info in self.articles.items() if info.get('feed') == feed_url}
+
+    def publish_times(self, feed_url):
+        """
+        Publish times of the articles seen from one feed
+
+        Parameters:
+        - feed_url: URL of the feed
+
+        Returns:
+        - Sorted list of ISO publish time strings
+        """
+        with self.lock:
+            return sorted(info['published'] for info in self.articles.values()
+                          if info.get('feed') == feed_url and info.get('published'))
+
+    def prune(self, max_age_days=SEEN_RETENTION_DAYS):
+        """
+        Forget old keys so the index stays small
+
+        Articles published more than the retention window before the feed's
+        high-water mark are still rejected by filter_new, so they are not
+        processed again.
+
+        Parameters:
+        - max_age_days: Number of days to keep keys for
+        """
+        cutoff = (datetime.datetime.now() - datetime.timedelta(days=max_age_days)).isoformat()
+        with self.lock:
+            self.articles = {
+                key: info for key, info in self.articles.items()
+                if info.get('first_seen', '') >= cutoff
+            }
+
+    def save(self):
+        """Write the index back to disk"""
+        with self.lock:
+            return save_json_file({'articles': self.articles, 'high_water': self.high_water},
+                                  self.filepath)
@@ -1,44 +1,101 @@
 import os
 import re
-from html import unescape
-import time
 import sys
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 # Fix import paths
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(os.path.dirname(current_dir))  # Add parent directory to path
 
+from src.utils import clean_html
+from src.translation_memory import get_translation_memory
+from src.rate_limit import call_with_backoff, get_openai_rate_limiter
+from src.providers import get_client, provider_installed, memory_provider
+from src.glossary import get_glossary
+from src.resilience import call_with_hedging
+
 try:
-    from langdetect import detect
+    from langdetect import DetectorFactory
+    from langdetect import detector_factory
+    # langdetect is randomised; a fixed seed makes results repeatable
+    DetectorFactory.seed = 0
     LANGDETECT_AVAILABLE = True
 except ImportError:
     LANGDETECT_AVAILABLE = False
     print("Warning: langdetect package not available. Will use basic language detection.")
 
-try:
-    import openai
-    from openai import OpenAI
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+if not provider_installed('openai'):
     print("OpenAI package not available. Will use alternative translation methods.")
 
-try:
-    from google.cloud import translate_v2 as translate
-    GOOGLE_TRANSLATE_AVAILABLE = True
-except ImportError:
-    GOOGLE_TRANSLATE_AVAILABLE = False
+if not provider_installed('google'):
     print("Google Cloud Translation not available. Will use alternative translation methods.")
 
-def clean_html(html_text):
-    """Remove HTML tags and decode HTML entities"""
-    # Remove HTML tags
-    clean_text = re.sub(r'<[^>]+>', ' ', html_text)
-    # Decode HTML entities
-    clean_text = unescape(clean_text)
-    # Remove extra whitespace
-    clean_text = re.sub(r'\s+', ' ', clean_text).strip()
-    return clean_text
+# Model and prompt versions are part of the translation memory key;
+# bump the prompt version whenever the prompt text changes
+OPENAI_TRANSLATION_MODEL = "gpt-3.5-turbo"
+OPENAI_PROMPT_VERSION = "kids-v1"
+GOOGLE_TRANSLATION_MODEL = "translate-v2"
+
+# Podcast translation: many segments per request with a JSON response
+PODCAST_TRANSLATION_MODEL = "gpt-3.5-turbo"
+PODCAST_PROMPT_VERSION = "podcast-v2"
+PODCAST_SYSTEM_PROMPT = (
+    "You are a translator converting English to Tamil. Produce natural, conversational Tamil "
+    "suitable for children. Do not include any English text or prefixes like '[Translation]' "
+    "in your translations. You receive a JSON object with a list of segments, each with an "
+    "\"id\" and a \"text\". Translate every segment separately and reply only with a JSON "
+    "object of the form {\"translations\": [{\"id\": <id>, \"text\": <Tamil translation>}]}, "
+    "with exactly one entry per segment id."
+)
+
+# Batches are capped by an estimate of their input tokens; Tamil output is much
+# longer than the English input, so this keeps replies within the output limit
+TRANSLATION_BATCH_TOKEN_BUDGET = 1000
+TRANSLATION_BATCH_MAX_SEGMENTS = 20
+
+# Batches translated at the same time; rate limits still apply across all of them
+TRANSLATION_MAX_CONCURRENCY = int(os.environ.get('TRANSLATION_MAX_CONCURRENCY', 4))
+# Tokens charged to the rate limiter per estimated input token (input plus the longer Tamil output)
+REQUEST_TOKEN_MULTIPLIER = 4
+
+# Unicode script ranges used for quick language checks
+TAMIL_PATTERN = re.compile(r'[\u0B80-\u0BFF]')
+DEVANAGARI_PATTERN = re.compile(r'[\u0900-\u097F]')
+
+def _build_script_table():
+    """
+    str.translate table that reduces text to one marker per letter
+
+    Tamil characters become 'T', Latin letters become 'L', digits, spaces and
+    punctuation are dropped, and letters of any other script are kept as-is.
+    """
+    table = {}
+    for code in range(0x0B80, 0x0C00):
+        table[code] = 'T'
+    for code in list(range(0x41, 0x5B)) + list(range(0x61, 0x7B)) + list(range(0xC0, 0x250)):
+        table[code] = 'L'
+    for code in (list(range(0x00, 0x41)) + list(range(0x5B, 0x61)) + list(range(0x7B, 0xC0)) +
+                 list(range(0x2000, 0x2070)) + list(range(0x20A0, 0x20D0)) + [0xD7, 0xF7]):
+        table[code] = None
+    return table
+
+SCRIPT_TABLE = _build_script_table()
+
+# Share of letters in one script needed to skip the statistical model
+SCRIPT_CONFIDENCE = 0.95
+
+# Batches at least this large are spread over a process pool
+PROCESS_POOL_THRESHOLD = 5000
+DETECTION_CHUNK_SIZE = 500
+
+DETECTION_CACHE_SIZE = 10000
+_detection_cache = OrderedDict()
+_detection_cache_lock = threading.Lock()
 
 def basic_language_detection(text):
     """
@@ -46,24 +103,119 @@ def basic_language_detection(text):
     Only detects a few languages based on character sets
     """
     # Check for Tamil characters
-    tamil_chars = re.findall(r'[\u0B80-\u0BFF]', text)
+    tamil_chars = TAMIL_PATTERN.findall(text)
     if len(tamil_chars) > len(text) * 0.3:  # If >30% characters are Tamil
         return "ta"
 
     # Check for other Indian scripts (simplified)
-    devanagari = re.findall(r'[\u0900-\u097F]', text)  # Hindi, Marathi, etc.
+    devanagari = DEVANAGARI_PATTERN.findall(text)  # Hindi, Marathi, etc.
     if len(devanagari) > len(text) * 0.3:
         return "hi"  # Default to Hindi
 
     # Default to English for Latin script or unknown
     return "en"
 
-def detect_language(text):
+def _hint_from_profile(profile):
+    """Turn a SCRIPT_TABLE-reduced string into a language hint"""
+    letters = len(profile)
+    if not letters:
+        return None
+    if profile.count('T') >= letters * SCRIPT_CONFIDENCE:
+        return "ta"
+    if profile.count('L') >= letters * SCRIPT_CONFIDENCE:
+        return "en"
+    return None
+
+def script_language_hint(text):
+    """
+    Settle the language from the Unicode script alone when it is unambiguous
+
+    Text written almost entirely in Tamil script maps to 'ta' and plain Latin
+    text maps to 'en', the only Latin-script language our feeds carry. Mixed
+    or other scripts are left to the statistical model.
+
+    Parameters:
+    - text: Cleaned text
+
+    Returns:
+    - Language code, or None if the script does not decide it
+    """
+    return _hint_from_profile(text.translate(SCRIPT_TABLE))
+
+def script_language_hints(texts):
+    """
+    Script hints for a batch of cleaned texts
+
+    Parameters:
+    - texts: List of cleaned texts
+
+    Returns:
+    - List of language codes or None, one per text
+    """
+    return [_hint_from_profile(profile)
+            for profile in (text.translate(SCRIPT_TABLE) for text in texts)]
+
+def _detect_with_model(texts):
+    """
+    Run langdetect over cleaned texts, loading its profiles only once
+
+    Parameters:
+    - texts: List of cleaned texts
+
+    Returns:
+    - List of language codes
+    """
+    if not LANGDETECT_AVAILABLE:
+        return [basic_language_detection(text) for text in texts]
+
+    detector_factory.init_factory()
+    factory = detector_factory._factory
+
+    languages = []
+    for text in texts:
+        # Detection is seeded, so retrying would only give the same answer
+        try:
+            detector = factory.create()
+            detector.append(text)
+            languages.append(detector.detect())
+        except Exception as e:
+            print(f"Language detection error: {e}")
+            languages.append(basic_language_detection(text))
+    return languages
+
+def _detect_uncached(text):
+    """Detect the language of cleaned text without consulting the cache"""
+    return script_language_hint(text) or _detect_with_model([text])[0]
+
+def _cache_key(text):
+    """Detection cache key for cleaned text"""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+def _cache_get(key):
+    """Look up a cached detection result"""
+    with _detection_cache_lock:
+        if key in _detection_cache:
+            _detection_cache.move_to_end(key)
+            return _detection_cache[key]
+    return None
+
+def _cache_put(key, language):
+    """Store a detection result, evicting the least recently used entry"""
+    with _detection_cache_lock:
+        _detection_cache[key] = language
+        if len(_detection_cache) > DETECTION_CACHE_SIZE:
+            _detection_cache.popitem(last=False)
+
+def detect_language(text, normalized=False):
     """
-    Detect the language of a text with retry
+    Detect the language of a text
+
+    Results are cached by a hash of the cleaned text, so repeated headlines
+    and summaries are only detected once per process.
 
     Parameters:
     - text: The text to detect
+    - normalized: The text was already cleaned with normalize_text (default: False)
 
     Returns:
     - Language code (e.g., 'en', 'ta')
@@ -72,54 +224,116 @@ def detect_language(text):
         return "unknown"
 
     # Clean text before detection
-    text = clean_html(text)
+    if not normalized:
+        text = clean_html(text)
 
-    if not LANGDETECT_AVAILABLE:
-        return basic_language_detection(text)
+    key = _cache_key(text)
+    language = _cache_get(key)
+    if language is None:
+        language = _detect_uncached(text)
+        _cache_put(key, language)
+    return language
 
-    # Try up to 3 times with langdetect
-    for attempt in range(3):
-        try:
-            return detect(text)
-        except Exception as e:
-            print(f"Language detection error (attempt {attempt+1}): {e}")
-            if attempt < 2:
-                time.sleep(1)  # Wait before retry
+def detect_languages(texts, processes=None, normalized=False):
+    """
+    Detect the languages of many texts in one call
+
+    Texts are cleaned once, repeated texts are detected once, script hints are
+    computed for the whole batch, and only the remaining texts go through
+    langdetect. Large batches are spread over a process pool.
 
-    # Fallback to basic detection if langdetect fails
-    return basic_language_detection(text)
+    In one process this is barely faster than calling detect_language per
+    text (1.25s vs 1.32s for 3000 distinct headlines in
+    benchmarks/bench_language_detection.py): both share the loaded profiles,
+    and langdetect's per-text sampling dominates. The batch API pays off for
+    batches with repeated texts and with the process pool on several cores.
+
+    Parameters:
+    - texts: List of texts
+    - processes: Number of worker processes; None picks a pool only for
+                 batches of PROCESS_POOL_THRESHOLD or more, 0 disables it
+    - normalized: The texts were already cleaned with normalize_text (default: False)
 
-def translate_to_tamil_openai(text, api_key=None):
+    Returns:
+    - List of language codes, in the same order as texts
+    """
+    results = ["unknown"] * len(texts)
+
+    # Clean each text once and group positions by cache key
+    pending = {}
+    for index, text in enumerate(texts):
+        if not text or len(text.strip()) < 10:
+            continue
+        cleaned = text if normalized else clean_html(text)
+        key = _cache_key(cleaned)
+        language = _cache_get(key)
+        if language is not None:
+            results[index] = language
+        else:
+            pending.setdefault(key, (cleaned, []))[1].append(index)
+
+    keys = list(pending)
+    cleaned_texts = [pending[key][0] for key in keys]
+    languages = script_language_hints(cleaned_texts)
+
+    # Whatever the script does not settle goes to the statistical model
+    unresolved = [position for position, language in enumerate(languages) if language is None]
+    model_texts = [cleaned_texts[position] for position in unresolved]
+
+    if processes is None:
+        processes = os.cpu_count() if len(model_texts) >= PROCESS_POOL_THRESHOLD else 0
+
+    if processes and processes > 1 and len(model_texts) > DETECTION_CHUNK_SIZE:
+        chunks = [model_texts[start:start + DETECTION_CHUNK_SIZE]
+                  for start in range(0, len(model_texts), DETECTION_CHUNK_SIZE)]
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            model_languages = [language for chunk in executor.map(_detect_with_model, chunks)
+                               for language in chunk]
+    else:
+        model_languages = _detect_with_model(model_texts)
+
+    for position, language in zip(unresolved, model_languages):
+        languages[position] = language
+
+    for key, language in zip(keys, languages):
+        _cache_put(key, language)
+        for index in pending[key][1]:
+            results[index] = language
+
+    return results
+
+def translate_to_tamil_openai(text, client=None):
     """
     Translate text to conversational Tamil using OpenAI's models
 
     Parameters:
     - text: Text to translate
-    - api_key: OpenAI API key (optional)
+    - client: OpenAI client (default: the shared client from src.providers)
 
     Returns:
     - Translated text or None if translation failed
     """
-    if not OPENAI_AVAILABLE:
-        return None
-
-    if api_key:
-        client = OpenAI(api_key=api_key)
-    elif 'OPENAI_API_KEY' in os.environ:
-        client = OpenAI(api_key=os.environ['OPENAI_API_KEY'])
-    else:
+    client = client or get_client('openai')
+    if client is None:
         print("OpenAI API key not found")
         return None
 
-    try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
+    estimated_tokens = estimate_tokens(text) * REQUEST_TOKEN_MULTIPLIER
+
+    def send_request():
+        # Wait for rate-limit capacity on every attempt, including retries
+        get_openai_rate_limiter().acquire(estimated_tokens)
+        return client.chat.completions.create(
+            model=OPENAI_TRANSLATION_MODEL,
             messages=[
                 {"role": "system", "content": "You are a highly skilled translator. Translate the given text into conversational Tamil that would be easily understood by children. Keep the translation natural and appropriate for young audiences."},
                 {"role": "user", "content": f"Translate this text to conversational Tamil suitable for children: \"{text}\""}
             ]
         )
 
+    try:
+        response = call_with_backoff(send_request)
+
         # Extract translated text from response
         translated_text = response.choices[0].message.content.strip()
         return translated_text
@@ -128,6 +342,211 @@ def translate_to_tamil_openai(text, api_key=None):
         print(f"OpenAI translation error: {e}")
         return None
 
+def estimate_tokens(text):
+    """Rough token count for an English segment, including JSON overhead"""
+    return len(text) // 4 + 8
+
+def pack_translation_batches(texts, token_budget=TRANSLATION_BATCH_TOKEN_BUDGET,
+                             max_segments=TRANSLATION_BATCH_MAX_SEGMENTS):
+    """
+    Group segments into batches that fit the token budget
+
+    Parameters:
+    - texts: List of segment texts
+    - token_budget: Maximum estimated input tokens per batch
+    - max_segments: Maximum number of segments per batch
+
+    Returns:
+    - List of batches, each a list of indexes into texts (in order)
+    """
+    batches = []
+    current = []
+    current_tokens = 0
+    for index, text in enumerate(texts):
+        tokens = estimate_tokens(text)
+        if current and (current_tokens + tokens > token_budget or len(current) >= max_segments):
+            batches.append(current)
+            current = []
+            current_tokens = 0
+        # A segment larger than the budget still gets a batch of its own
+        current.append(index)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+def translate_batch_openai(texts, client=None, model=PODCAST_TRANSLATION_MODEL,
+                           system_prompt=PODCAST_SYSTEM_PROMPT):
+    """
+    Translate several segments with one chat completion
+
+    Parameters:
+    - texts: List of segment texts
+    - client: OpenAI client (default: the shared client from src.providers)
+    - model: Chat model to use
+    - system_prompt: Instructions describing the JSON request/response format
+
+    Returns:
+    - List with the translation of each segment, or None for segments that
+      are missing or malformed in the response
+    """
+    client = client or get_client('openai')
+    if client is None:
+        print("OpenAI API key not found")
+        return [None] * len(texts)
+
+    request = {"segments": [{"id": index, "text": text} for index, text in enumerate(texts)]}
+    estimated_tokens = sum(estimate_tokens(text) for text in texts) * REQUEST_TOKEN_MULTIPLIER
+
+    def send_request():
+        # Wait for rate-limit capacity on every attempt, including retries
+        get_openai_rate_limiter().acquire(estimated_tokens)
+        return client.chat.completions.create(
+            model=model,
+            response_format={"type": "json_object"},
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": json.dumps(request, ensure_ascii=False)}
+            ]
+        )
+
+    try:
+        response = call_with_backoff(send_request)
+        content = response.choices[0].message.content
+    except Exception as e:
+        print(f"OpenAI batch translation error: {e}")
+        return [None] * len(texts)
+
+    results = [None] * len(texts)
+    try:
+        translations = json.loads(content).get("translations", [])
+    except (ValueError, AttributeError) as e:
+        print(f"Malformed batch translation response: {e}")
+        return results
+
+    for item in translations:
+        if not isinstance(item, dict):
+            continue
+        index, text = item.get("id"), item.get("text")
+        if isinstance(index, str) and index.isdigit():
+            index = int(index)
+        if isinstance(index, int) and 0 <= index < len(texts) and isinstance(text, str) and text.strip():
+            results[index] = text.strip()
+    return results
+
+def _translate_batch_with_retry(texts, client, model, system_prompt):
+    """
+    Translate one batch, retrying segments the reply did not cover one at a time
+
+    Returns:
+    - List with the translation of each segment, or None if no segment was translated
+    """
+    translations = translate_batch_openai(texts, client, model, system_prompt)
+
+    results = []
+    for index, (text, translated) in enumerate(zip(texts, translations)):
+        if translated is None and len(texts) > 1:
+            print(f"Retrying segment {index} of batch on its own")
+            translated = translate_batch_openai([text], client, model, system_prompt)[0]
+        results.append(translated)
+    # An empty reply counts as a failure on the provider's circuit breaker
+    return results if any(translated is not None for translated in results) else None
+
+def _translate_batch_google(texts):
+    """
+    Translate one batch segment by segment with Google Cloud Translation
+
+    Returns:
+    - List with the translation of each segment, or None if no segment was translated
+    """
+    results = [translate_to_tamil_google(text) for text in texts]
+    return results if any(translated is not None for translated in results) else None
+
+def segment_providers(client=None, model=PODCAST_TRANSLATION_MODEL, prompt_version=PODCAST_PROMPT_VERSION,
+                      system_prompt=PODCAST_SYSTEM_PROMPT):
+    """
+    Providers that can translate a batch of segments, in order of preference
+
+    Parameters:
+    - client: OpenAI client (default: the shared client from src.providers)
+    - model: Chat model to use
+    - prompt_version: Prompt version used in the translation memory key
+    - system_prompt: Instructions for the batch request
+
+    Returns:
+    - List of (memory provider name, model, prompt version, function); each
+      function takes a list of texts and returns their translations, or None
+    """
+    providers = []
+    client = client or get_client('openai')
+    if client is not None:
+        providers.append((memory_provider('openai'), model, prompt_version,
+                          lambda texts: _translate_batch_with_retry(texts, client, model, system_prompt)))
+    if get_client('google') is not None:
+        providers.append((memory_provider('google'), GOOGLE_TRANSLATION_MODEL, "", _translate_batch_google))
+    return providers
+
+def translate_segments(texts, client=None, model=PODCAST_TRANSLATION_MODEL,
+                       prompt_version=PODCAST_PROMPT_VERSION, system_prompt=PODCAST_SYSTEM_PROMPT,
+                       token_budget=TRANSLATION_BATCH_TOKEN_BUDGET,
+                       max_concurrency=TRANSLATION_MAX_CONCURRENCY, providers=None):
+    """
+    Translate many segments using the translation memory and concurrent batched requests
+
+    Segments found in the translation memory are not sent again. The rest
+    are packed into batches under the token budget, and up to
+    max_concurrency batches are in flight at once. Requests share the
+    process-wide OpenAI rate limiter, and 429/5xx errors are retried with
+    backoff. Segments missing or malformed in a batch reply are retried one
+    at a time. Each batch goes through call_with_hedging, so a provider
+    whose circuit breaker is open is skipped and a slow one is hedged with
+    the next provider.
+
+    Parameters:
+    - texts: List of segment texts
+    - client: OpenAI client (default: the shared client from src.providers)
+    - model: Chat model to use
+    - prompt_version: Prompt version used in the translation memory key
+    - system_prompt: Instructions for the batch request
+    - token_budget: Maximum estimated input tokens per batch
+    - max_concurrency: Maximum number of batches translated at once
+    - providers: Providers as returned by segment_providers (default: built from the arguments above)
+
+    Returns:
+    - List with the translation of each segment (in input order), or None where translation failed
+    """
+    if providers is None:
+        providers = segment_providers(client, model, prompt_version, system_prompt)
+
+    memory = get_translation_memory()
+    candidates = [(provider, model, prompt_version) for provider, model, prompt_version, _ in providers]
+    results = [memory.get_any(text, candidates) for text in texts]
+    pending = [index for index, result in enumerate(results) if result is None]
+    if not pending or not providers:
+        return results
+
+    batches = [[pending[position] for position in batch]
+               for batch in pack_translation_batches([texts[index] for index in pending], token_budget)]
+
+    def run_batch(indexes):
+        return call_with_hedging([(provider, function) for provider, _, _, function in providers],
+                                 [texts[index] for index in indexes])
+
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(batches)))) as executor:
+        # map() yields batch results in submission order, whatever order they finish in
+        for indexes, (winner, translations, latency) in zip(batches, executor.map(run_batch, batches)):
+            if translations is None:
+                continue
+            key = next(entry[:3] for entry in providers if entry[0] == winner)
+            for index, translated in zip(indexes, translations):
+                if translated is not None:
+                    memory.put(texts[index], *key, translated, latency / len(indexes))
+                results[index] = translated
+
+    print(f"Translated {len(pending)} segments in {len(batches)} batches in {time.time() - start:.1f}s")
+    return results
+
 def translate_to_tamil_google(text):
     """
     Translate text to Tamil using Google Cloud Translation API
@@ -138,64 +557,57 @@ def translate_to_tamil_google(text):
     Returns:
     - Translated text or None if translation failed
     """
-    if not GOOGLE_TRANSLATE_AVAILABLE:
+    client = get_client('google')
+    if client is None:
         return None
 
     try:
-        client = translate.Client()
         result = client.translate(text, target_language='ta')
         return result['translatedText']
     except Exception as e:
         print(f"Google translation error: {e}")
         return None
 
-def translate_to_tamil_fallback(text):
+def translate_to_tamil_fallback(text, normalized=False):
     """
     Basic fallback translation method
 
     Parameters:
     - text: Text to translate
+    - normalized: The text was already cleaned with normalize_text (default: False)
 
     Returns:
     - Simple translated text
     """
     # Clean the text first
-    text = clean_html(text)
+    if not normalized:
+        text = clean_html(text)
 
     print("Using basic fallback translation - output will be limited")
-    # This is just a placeholder - in a real implementation you'd use a more robust fallback
-    basic_translations = {
-        "News": "செய்திகள்",
-        "Today": "இன்று",
-        "India": "இந்தியா",
-        "World": "உலகம்",
-        "Sports": "விளையாட்டு",
-        "Health": "ஆரோக்கியம்",
-        "Education": "கல்வி",
-        "Weather": "வானிலை",
-        "Politics": "அரசியல்",
-        "Technology": "தொழில்நுட்பம்",
-        "Science": "அறிவியல்",
-        "Environment": "சுற்றுச்சூழல்",
-        "Entertainment": "பொழுதுபோக்கு",
-        "Business": "வணிகம்",
-        "Economy": "பொருளாதாரம்",
-        "Government": "அரசு"
-    }
-
     # Very basic word replacement - this is NOT a proper translation
-    result = text
-    for eng, tam in basic_translations.items():
-        result = result.replace(eng, tam)
+    result = basic_translate(text)
 
     return f"[Need proper translation] {result}"
 
-def translate_to_tamil(text):
+def basic_translate(text):
+    """
+    Replace known words using the glossary, without the "[Need proper translation]" prefix
+
+    Parameters:
+    - text: Cleaned text
+
+    Returns:
+    - Text with glossary terms replaced by their Tamil translations
+    """
+    return get_glossary().translate(text)
+
+def translate_to_tamil(text, normalized=False):
     """
     Translate text to Tamil using preferred method with fallbacks
 
     Parameters:
     - text: Text to translate
+    - normalized: The text was already cleaned with normalize_text (default: False)
 
     Returns:
     - Translated text
@@ -203,24 +615,38 @@ def translate_to_tamil(text):
     if not text:
         return ""
 
-    # Clean the text first
-    text = clean_html(text)
+    # Clean the text once; every later step reuses it
+    if not normalized:
+        text = clean_html(text)
 
-    if detect_language(text) == "ta":
+    if detect_language(text, normalized=True) == "ta":
         return text
 
-    # Try OpenAI first if available
-    translated = None
-    if 'OPENAI_API_KEY' in os.environ:
-        translated = translate_to_tamil_openai(text)
-        if translated:
-            return translated
-
-    # Try Google Cloud Translation if available
-    if 'GOOGLE_APPLICATION_CREDENTIALS' in os.environ:
-        translated = translate_to_tamil_google(text)
+    # Providers in order of preference: (memory provider name, model, prompt version, function)
+    providers = []
+    if get_client('openai') is not None:
+        providers.append((memory_provider('openai'), OPENAI_TRANSLATION_MODEL, OPENAI_PROMPT_VERSION,
+                          translate_to_tamil_openai))
+    if get_client('google') is not None:
+        providers.append((memory_provider('google'), GOOGLE_TRANSLATION_MODEL, "",
+                          translate_to_tamil_google))
+
+    # Earlier translations of the same text are reused from the translation memory
+    memory = get_translation_memory()
+    translated = memory.get_any(text, [(provider, model, prompt_version)
+                                       for provider, model, prompt_version, _ in providers])
+    if translated:
+        return translated
+
+    # Failing providers are skipped by their circuit breakers, and a slow
+    # primary is hedged with the next provider
+    if providers:
+        winner, translated, latency = call_with_hedging(
+            [(provider, function) for provider, _, _, function in providers], text)
         if translated:
+            provider, model, prompt_version, _ = next(entry for entry in providers if entry[0] == winner)
+            memory.put(text, provider, model, prompt_version, translated, latency)
             return translated
 
     # Final fallback
-    return translate_to_tamil_fallback(text)
\ No newline at end of file
+    return translate_to_tamil_fallback(text, normalized=True)
\ No newline at end of file
@@ -0,0 +1,190 @@
+"""
+Persistent translation memory backed by SQLite
+
+Translations are stored under a hash of (source text, provider, model, prompt
+version), so regenerating an episode reuses earlier API results. The store is
+capped by size and evicts the least recently used translations first.
+"""
+import os
+import sys
+import time
+import sqlite3
+import hashlib
+import threading
+
+# Fix import paths
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(current_dir))  # Add parent directory to path
+
+from src.utils import ensure_dir_exists
+
+TRANSLATION_MEMORY_FILE = os.path.join("data", "translation_memory.db")
+TRANSLATION_MEMORY_MAX_BYTES = int(os.environ.get('TRANSLATION_MEMORY_MAX_BYTES', 50 * 1024 * 1024))
+
+def memory_key(text, provider, model, prompt_version):
+    """
+    Cache key for a translation
+
+    Parameters:
+    - text: Source text
+    - provider: Translation provider name (e.g. 'openai')
+    - model: Model name used by the provider
+    - prompt_version: Version of the prompt the translation was made with
+
+    Returns:
+    - Hex digest identifying the translation
+    """
+    source_hash = hashlib.sha256(text.encode('utf-8')).hexdigest()
+    return hashlib.sha256(f"{source_hash}|{provider}|{model}|{prompt_version}".encode('utf-8')).hexdigest()
+
+class TranslationMemory:
+    """
+    SQLite-backed translation cache with size-based LRU eviction
+
+    Safe to share between threads; statistics cover the life of the process.
+    """
+
+    def __init__(self, filepath=TRANSLATION_MEMORY_FILE, max_bytes=TRANSLATION_MEMORY_MAX_BYTES):
+        self.filepath = filepath
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "latency_saved": 0.0}
+
+        ensure_dir_exists(os.path.dirname(filepath))
+        self.connection = sqlite3.connect(filepath, check_same_thread=False)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS translations (
+                key TEXT PRIMARY KEY,
+                provider TEXT NOT NULL,
+                model TEXT NOT NULL,
+                prompt_version TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                latency REAL NOT NULL,
+                created REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS translations_last_used ON translations (last_used)")
+        self.connection.commit()
+        self.total_bytes = self.connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM translations").fetchone()[0]
+
+    def get(self, text, provider, model, prompt_version):
+        """
+        Look up a stored translation
+
+        Parameters:
+        - text: Source text
+        - provider: Translation provider name
+        - model: Model name used by the provider
+        - prompt_version: Version of the prompt
+
+        Returns:
+        - Translated text, or None if it is not in the memory
+        """
+        return self.get_any(text, [(provider, model, prompt_version)])
+
+    def get_any(self, text, candidates):
+        """
+        Look up a stored translation from the first of several providers that has one
+
+        Counts as a single hit or miss however many providers are checked.
+
+        Parameters:
+        - text: Source text
+        - candidates: List of (provider, model, prompt_version) in order of preference
+
+        Returns:
+        - Translated text, or None if no provider's translation is in the memory
+        """
+        with self.lock:
+            for provider, model, prompt_version in candidates:
+                key = memory_key(text, provider, model, prompt_version)
+                row = self.connection.execute(
+                    "SELECT translation, latency FROM translations WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    continue
+
+                self.connection.execute("UPDATE translations SET last_used = ? WHERE key = ?",
+                                        (time.time(), key))
+                self.connection.commit()
+                self.stats['hits'] += 1
+                self.stats['latency_saved'] += row[1]
+                return row[0]
+
+            self.stats['misses'] += 1
+            return None
+
+    def put(self, text, provider, model, prompt_version, translation, latency=0.0):
+        """
+        Store a translation and evict old entries if the memory is over its size cap
+
+        Parameters:
+        - text: Source text
+        - provider: Translation provider name
+        - model: Model name used by the provider
+        - prompt_version: Version of the prompt
+        - translation: Translated text
+        - latency: Seconds the provider took, reported as saved on later hits
+        """
+        key = memory_key(text, provider, model, prompt_version)
+        size = len(translation.encode('utf-8'))
+        now = time.time()
+        with self.lock:
+            previous = self.connection.execute(
+                "SELECT size FROM translations WHERE key = ?", (key,)).fetchone()
+            self.connection.execute(
+                "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, provider, model, str(prompt_version), translation, size, latency, now, now))
+            self.total_bytes += size - (previous[0] if previous else 0)
+            self._evict()
+            self.connection.commit()
+
+    def _evict(self):
+        """Delete least recently used translations until under max_bytes (lock held)"""
+        while self.total_bytes > self.max_bytes:
+            rows = self.connection.execute(
+                "SELECT key, size FROM translations ORDER BY last_used LIMIT 100").fetchall()
+            if not rows:
+                self.total_bytes = 0
+                return
+            for key, size in rows:
+                if self.total_bytes <= self.max_bytes:
+                    break
+                self.connection.execute("DELETE FROM translations WHERE key = ?", (key,))
+                self.total_bytes -= size
+
+    def summary(self):
+        """
+        Statistics for reporting
+
+        Returns:
+        - Dictionary with hits, misses, hit rate, seconds saved and stored size
+        """
+        with self.lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return {
+                "hits": self.stats['hits'],
+                "misses": self.stats['misses'],
+                "hit_rate": round(self.stats['hits'] / lookups, 3) if lookups else 0.0,
+                "latency_saved_seconds": round(self.stats['latency_saved'], 2),
+                "stored_bytes": self.total_bytes,
+            }
+
+_memory = None
+_memory_lock = threading.Lock()
+
+def get_translation_memory():
+    """
+    Shared TranslationMemory for this process
+
+    Returns:
+    - TranslationMemory instance
+    """
+    global _memory
+    with _memory_lock:
+        if _memory is None:
+            _memory = TranslationMemory()
+        return _memory
@@ -2,12 +2,46 @@
 Text-to-Speech module using OpenAI for Tamil kids news
 """
 import os
+import re
 import sys
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # Fix import paths
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(os.path.dirname(current_dir))  # Add parent directory to path
 
+from src.providers import get_client, memory_provider, PROVIDER_BACKEND
+from src.rate_limit import call_with_backoff
+from src.audio import segment_with_pause, silence_frames
+from src.audio_cache import get_audio_cache
+
+TTS_MODEL = "tts-1"
+TTS_VOICE = "nova"
+# The API accepts up to 4096 characters; shorter segments synthesize in parallel
+TTS_SEGMENT_MAX_CHARS = 1000
+TTS_MAX_CONCURRENCY = int(os.environ.get('TTS_MAX_CONCURRENCY', 4))
+# Attempts per segment before it is replaced by silence
+TTS_SEGMENT_ATTEMPTS = 2
+# An episode with a larger share of failed segments is discarded instead of published
+TTS_MAX_FAILED_SHARE = float(os.environ.get('TTS_MAX_FAILED_SHARE', 0.2))
+
+# Silence inserted between segments, in seconds
+ARTICLE_PAUSE = 0.8
+SENTENCE_PAUSE = 0.15
+
+SENTENCE_END_PATTERN = re.compile(r'(?<=[.!?।])\s+')
+
+# Streaming: how long to wait for the first segment, and how often a reader checks for more audio
+STREAM_FIRST_SEGMENT_TIMEOUT = 30
+STREAM_POLL_INTERVAL = 0.1
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Audio files still being written: absolute path -> Event set when the file is complete
+_active_streams = {}
+_streams_lock = threading.Lock()
+
 def text_to_speech_fallback(text, output_file="output.mp3"):
     """
     Placeholder for text-to-speech functionality
@@ -33,53 +67,187 @@ def text_to_speech_fallback(text, output_file="output.mp3"):
 
     return output_file
 
-def text_to_speech_openai(text, output_file="data/output.mp3", voice="nova"):
+def _split_long(sentence, max_chars):
+    """Split a sentence longer than max_chars at spaces"""
+    pieces = []
+    current = ""
+    for word in sentence.split():
+        if current and len(current) + 1 + len(word) > max_chars:
+            pieces.append(current)
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    if current:
+        pieces.append(current)
+    return pieces
+
+def split_script(script, max_chars=TTS_SEGMENT_MAX_CHARS):
+    """
+    Split a podcast script into segments for speech synthesis
+
+    Articles (separated by blank lines in the script) always start a new
+    segment; within an article, whole sentences are packed into segments of
+    up to max_chars characters.
+
+    Parameters:
+    - script: Podcast script text
+    - max_chars: Maximum characters per segment
+
+    Returns:
+    - List of (segment text, seconds of silence after it)
+    """
+    segments = []
+    for paragraph in re.split(r'\n\s*\n', script):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+
+        pieces = []
+        current = ""
+        for sentence in SENTENCE_END_PATTERN.split(paragraph):
+            for piece in (_split_long(sentence, max_chars) if len(sentence) > max_chars else [sentence]):
+                if current and len(current) + 1 + len(piece) > max_chars:
+                    pieces.append(current)
+                    current = piece
+                else:
+                    current = f"{current} {piece}" if current else piece
+        if current:
+            pieces.append(current)
+
+        segments.extend((piece, SENTENCE_PAUSE) for piece in pieces)
+        segments[-1] = (segments[-1][0], ARTICLE_PAUSE)
+
+    if segments:
+        segments[-1] = (segments[-1][0], 0)
+    return segments
+
+def synthesize_segment(client, text, voice=TTS_VOICE):
+    """
+    Synthesize one segment of speech
+
+    Parameters:
+    - client: OpenAI client
+    - text: Segment text (at most 4096 characters)
+    - voice: Voice to use
+
+    Returns:
+    - MP3 bytes
+    """
+    response = call_with_backoff(
+        client.audio.speech.create,
+        model=TTS_MODEL,
+        voice=voice,
+        input=text
+    )
+    return response.content
+
+def synthesize_segment_or_none(client, text, voice=TTS_VOICE, attempts=TTS_SEGMENT_ATTEMPTS):
+    """
+    Synthesize one segment, retrying it if it fails
+
+    Parameters:
+    - client: OpenAI client
+    - text: Segment text (at most 4096 characters)
+    - voice: Voice to use
+    - attempts: Maximum number of attempts
+
+    Returns:
+    - MP3 bytes, or None if every attempt failed
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            return synthesize_segment(client, text, voice)
+        except Exception as e:
+            print(f"Error synthesizing segment (attempt {attempt} of {attempts}): {e}")
+    return None
+
+def text_to_speech_openai(text, output_file="data/output.mp3", voice=TTS_VOICE, on_segment=None):
     """
     Convert text to speech using OpenAI's TTS API
 
+    The text is split into segments at article and sentence boundaries.
+    Segments already in the audio cache are reused, the rest are
+    synthesized in parallel. Their MP3 frames are appended to the output
+    file in order (with short silences) as soon as each one is ready, without
+    re-encoding, so the file can be played while it grows. A segment that
+    still fails after retrying is left out and only its pause is written;
+    if more than TTS_MAX_FAILED_SHARE of the segments fail, the file is
+    deleted.
+
     Parameters:
     - text: Text to convert to speech
     - output_file: Path to save audio file
     - voice: Voice to use (options: alloy, echo, fable, onyx, nova, shimmer)
                 Nova is most natural, Shimmer is more expressive
+    - on_segment: Called after each segment has been written (optional)
 
     Returns:
-    - Path to output file or None if failed
+    - (path to output file or None if failed, number of segments left out)
     """
     if not text:
-        return None
+        return None, 0
 
+    written = 0
+    failed = 0
     try:
-        from openai import OpenAI
-
-        # Check for API key
-        if 'OPENAI_API_KEY' not in os.environ:
+        # Shared client, so its connection pool is reused between requests
+        client = get_client('openai')
+        if client is None:
             print("OpenAI API key not found in environment variables")
-            return text_to_speech_fallback(text, output_file)
-
-        # Initialize OpenAI client
-        client = OpenAI(api_key=os.environ['OPENAI_API_KEY'])
+            return None, 0
 
         # Ensure output directory exists
         ensure_dir_exists(os.path.dirname(output_file))
 
-        # Generate speech
-        print(f"Generating speech with OpenAI using voice: {voice}")
-        response = client.audio.speech.create(
-            model="tts-1",
-            voice=voice,
-            input=text
-        )
+        segments = split_script(text)
+        print(f"Generating speech with OpenAI using voice: {voice} ({len(segments)} segments)")
+
+        # Only segments whose text changed since an earlier episode are synthesized
+        cache = get_audio_cache()
+        cache_model = f"{memory_provider('openai')}/{TTS_MODEL}"
+        audio = [cache.get(segment, voice, cache_model) for segment, _ in segments]
+        pending = [index for index, data in enumerate(audio) if data is None]
 
-        # Save to file
-        response.stream_to_file(output_file)
+        start = time.time()
+        with ThreadPoolExecutor(max_workers=max(1, min(TTS_MAX_CONCURRENCY, len(pending) or 1))) as executor:
+            futures = {index: executor.submit(synthesize_segment_or_none, client, segments[index][0], voice)
+                       for index in pending}
+
+            # Write segments in script order while later ones are still being synthesized
+            reference = next((data for data in audio if data), None)
+            with open(output_file, 'wb') as f:
+                for index, (segment, pause) in enumerate(segments):
+                    if audio[index] is None:
+                        audio[index] = futures[index].result()
+                        if audio[index] is None:
+                            # Keep the segments already written; this one is skipped
+                            failed += 1
+                            if reference:
+                                f.write(silence_frames(reference, pause))
+                            continue
+                        cache.put(segment, voice, cache_model, audio[index])
+                    reference = reference or audio[index]
+                    f.write(segment_with_pause(audio[index], pause))
+                    f.flush()
+                    written += 1
+                    if on_segment:
+                        on_segment()
+        print(f"Synthesized {len(pending) - failed} of {len(segments)} segments in {time.time() - start:.1f}s, "
+              f"{failed} failed (audio cache: {cache.summary()})")
+
+        if failed > TTS_MAX_FAILED_SHARE * len(segments):
+            print(f"{failed} of {len(segments)} segments could not be synthesized, discarding the audio")
+            os.remove(output_file)
+            return None, failed
 
         print(f"Generated audio file: {output_file}")
-        return output_file
+        return output_file, failed
 
     except Exception as e:
         print(f"Error generating speech with OpenAI: {e}")
-        return text_to_speech_fallback(text, output_file)
+        if not written and os.path.exists(output_file):
+            os.remove(output_file)
+        return None, failed
 
 def ensure_dir_exists(directory):
     """
@@ -115,20 +283,100 @@ def generate_podcast_script(articles):
 
     return script
 
-def text_to_speech(text, output_file="data/output.mp3"):
+def text_to_speech(text, output_file="data/output.mp3", on_segment=None):
     """
     Convert text to speech using available method
 
     Parameters:
     - text: Text to convert to speech
     - output_file: Path to save audio file
+    - on_segment: Called after each segment has been written (optional)
 
     Returns:
-    - Path to output file or None if failed
+    - (path to output file or None if failed, number of segments left out)
     """
-    # Try OpenAI TTS first if API key is available
-    if 'OPENAI_API_KEY' in os.environ:
-        return text_to_speech_openai(text, output_file)
+    # Try OpenAI TTS first if API key is available (or a mock backend is in use)
+    if 'OPENAI_API_KEY' in os.environ or PROVIDER_BACKEND != 'live':
+        return text_to_speech_openai(text, output_file, on_segment=on_segment)
 
     # Fall back to placeholder if OpenAI is not available
-    return text_to_speech_fallback(text, output_file)
\ No newline at end of file
+    return text_to_speech_fallback(text, output_file), 0
+
+def start_speech_stream(text, output_file="data/output.mp3", timeout=STREAM_FIRST_SEGMENT_TIMEOUT,
+                        on_complete=None):
+    """
+    Convert text to speech in a background thread, returning once playback can start
+
+    Parameters:
+    - text: Text to convert to speech
+    - output_file: Path to save audio file
+    - timeout: Maximum seconds to wait for the first segment
+    - on_complete: Called with the output path and the number of segments left out
+                   once the whole file is written (optional)
+
+    Returns:
+    - True if the first segment was written before the timeout
+    """
+    path = os.path.abspath(output_file)
+    first_segment = threading.Event()
+    complete = threading.Event()
+    with _streams_lock:
+        _active_streams[path] = complete
+
+    def generate():
+        result, failed = None, 0
+        try:
+            result, failed = text_to_speech(text, output_file, on_segment=first_segment.set)
+        except Exception as e:
+            print(f"Error generating streamed speech: {e}")
+        finally:
+            with _streams_lock:
+                _active_streams.pop(path, None)
+            complete.set()
+            first_segment.set()
+        if result and on_complete:
+            on_complete(result, failed)
+
+    threading.Thread(target=generate, name="tts-stream", daemon=True).start()
+    return first_segment.wait(timeout)
+
+def is_streaming(output_file):
+    """
+    Whether an audio file is still being written by start_speech_stream
+
+    Parameters:
+    - output_file: Path of the audio file
+
+    Returns:
+    - True while the file is growing
+    """
+    with _streams_lock:
+        return os.path.abspath(output_file) in _active_streams
+
+def follow_audio_file(output_file, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Yield the bytes of an audio file as it grows, until it is complete
+
+    Parameters:
+    - output_file: Path of the audio file
+    - chunk_size: Maximum bytes per chunk
+
+    Yields:
+    - Chunks of MP3 data
+    """
+    with _streams_lock:
+        complete = _active_streams.get(os.path.abspath(output_file))
+
+    with open(output_file, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if chunk:
+                yield chunk
+            elif complete is None or complete.is_set():
+                # One last read for data written just before completion
+                rest = f.read()
+                if rest:
+                    yield rest
+                return
+            else:
+                complete.wait(STREAM_POLL_INTERVAL)
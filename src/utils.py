@@ -1,6 +1,7 @@
 import os
 import re
 from html import unescape
+from html.entities import html5
 import sys
 
 # Fix import paths
@@ -17,6 +18,59 @@ def ensure_dir_exists(directory):
     if directory and not os.path.exists(directory):
         os.makedirs(directory)
 
+def _whitespace_entity_pattern():
+    """
+    Regex for every character reference that html.unescape decodes to whitespace
+
+    Named references are matched case-sensitively, as unescape does; numeric
+    ones in decimal or hex, with or without leading zeros and semicolon.
+    """
+    names = sorted((name for name, value in html5.items() if value.isspace()), key=len, reverse=True)
+    code_points = [code for code in range(0x3001)
+                   if chr(code).isspace() and unescape(f"&#{code};").isspace()]
+    decimal = "|".join(str(code) for code in code_points)
+    hexadecimal = "|".join(format(code, 'x') for code in code_points)
+    return (r'(?-i:&(?:' + "|".join(re.escape(name) for name in names) + r'))'
+            r'|&#0*(?:' + decimal + r')(?![0-9]);?'
+            r'|&#[xX]0*(?:' + hexadecimal + r')(?![0-9a-fA-F]);?')
+
+# One pattern for everything normalize_text rewrites. Markup (tags, comments,
+# <script>/<style> blocks, and entities that decode to whitespace such as
+# &nbsp; or &#10;) together with surrounding whitespace collapses to a single
+# space, as do whitespace runs; any other entity is decoded in place. Single
+# plain spaces are left alone so that ordinary prose needs no replacements.
+_MARKUP = (r'(?:<!--.*?-->|<(?:script|style)\b.*?</(?:script|style)\s*>|<[^>]+>|'
+           + _whitespace_entity_pattern() + r')')
+NORMALIZE_PATTERN = re.compile(
+    r'(?=[\s<&])'  # Lets the regex engine skip ordinary characters quickly
+    r'(?:(?P<space>\s*' + _MARKUP + r'(?:\s|' + _MARKUP + r')*|\s{2,}|[^\S ])'
+    r'|(?P<entity>&(?:#[0-9]+|#[xX][0-9a-fA-F]+|[A-Za-z][A-Za-z0-9]*);?))',
+    re.DOTALL | re.IGNORECASE
+)
+
+def _normalize_match(match):
+    if match.group('space') is not None:
+        return ' '
+    decoded = unescape(match.group('entity'))
+    return ' ' if decoded.isspace() else decoded
+
+def normalize_text(html_text):
+    """
+    Strip tags, decode entities and collapse whitespace in a single pass
+
+    Images, scripts, styles and comments are dropped along with other markup.
+
+    Parameters:
+    - html_text: HTML text to normalize
+
+    Returns:
+    - Plain text
+    """
+    if not html_text:
+        return ""
+
+    return NORMALIZE_PATTERN.sub(_normalize_match, html_text).strip()
+
 def clean_html(html_text):
     """
     Remove HTML tags and decode HTML entities
@@ -27,16 +81,7 @@ def clean_html(html_text):
     Returns:
     - Cleaned text
     """
-    if not html_text:
-        return ""
-
-    # Remove HTML tags
-    clean_text = re.sub(r'<[^>]+>', ' ', html_text)
-    # Decode HTML entities
-    clean_text = unescape(clean_text)
-    # Remove extra whitespace
-    clean_text = re.sub(r'\s+', ' ', clean_text).strip()
-    return clean_text
+    return normalize_text(html_text)
 
 def truncate_text(text, max_length=100, add_ellipsis=True):
     """
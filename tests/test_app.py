@@ -0,0 +1,74 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+import pytest
+
+import app as app_module
+from src.article_repository import ArticleRepository
+
+ARTICLES = [
+    {'link': "https://example.com/rain", 'original_title': "Heavy rain in Chennai",
+     'published': "2025-03-17T22:00:00", 'tamil_title': "சென்னையில் கனமழை"},
+    {'link': "https://example.com/metro", 'original_title': "Metro work begins in March",
+     'published': "2025-03-18T09:30:00", 'tamil_title': "மெட்ரோ பணி தொடக்கம்"},
+    {'link': "https://example.com/tiger", 'original_title': "Tiger cubs spotted in Mudumalai",
+     'published': "2025-03-19T06:00:00", 'tamil_title': "முதுமலையில் புலிக்குட்டிகள்"},
+]
+
+@pytest.fixture
+def repository(tmp_path, monkeypatch):
+    repository = ArticleRepository(str(tmp_path / "articles.db"))
+    repository.add(ARTICLES)
+    monkeypatch.setattr(app_module, "get_article_repository", lambda: repository)
+    return repository
+
+@pytest.fixture
+def client(repository):
+    return app_module.app.test_client()
+
+def listed_links(response):
+    assert response.status_code == 200
+    return [article['link'] for article in response.get_json()['articles']]
+
+def test_until_includes_the_whole_day(client):
+    assert listed_links(client.get("/api/articles?until=2025-03-18")) == \
+        ["https://example.com/rain", "https://example.com/metro"]
+    assert listed_links(client.get("/api/articles?since=2025-03-18&until=2025-03-18T09:30")) == \
+        ["https://example.com/metro"]
+
+def test_until_on_the_last_representable_day(client):
+    assert len(listed_links(client.get("/api/articles?until=9999-12-31"))) == 3
+
+@pytest.mark.parametrize("query", ["until=2025-03-18garbage", "since=18-03-2025", "until=2025-03-18T10:00%2B05:30"])
+def test_invalid_dates_are_rejected(client, query):
+    response = client.get(f"/api/articles?{query}")
+    assert response.status_code == 400
+    assert response.get_json()['status'] == "error"
+
+def test_bulk_review_applies_valid_items_and_reports_the_rest(client, repository):
+    rain, metro, tiger = (article['key'] for article in repository.all())
+    response = client.post("/api/review", json={"items": [
+        {"id": rain, "action": "approve"},
+        {"id": metro, "action": "edit", "fields": {"tamil_title": "மெட்ரோ ரயில் பணி"}},
+        {"id": tiger, "action": "edit", "fields": {"tamil_title": 5}},
+        {"id": "missing", "action": "reject"},
+    ]})
+    body = response.get_json()
+    assert body['status'] == "partial"
+    assert [result['status'] for result in body['results']] == ["success", "success", "error", "error"]
+    assert body['results'][2]['message'].startswith("Edited fields must be text")
+    assert body['results'][3]['message'] == "Article not found"
+
+    assert repository.get(rain)['approved'] is True
+    assert repository.get(metro)['tamil_title'] == "மெட்ரோ ரயில் பணி"
+    assert repository.get(metro)['edited'] is True
+    assert repository.get(tiger)['tamil_title'] == "முதுமலையில் புலிக்குட்டிகள்"
+    assert repository.counters()['approved'] == 1
+
+def test_bulk_review_rejects_malformed_requests(client):
+    assert client.post("/api/review", json={"items": []}).status_code == 400
+    body = client.post("/api/review", json={"items": [{"id": "x", "action": "delete"}]}).get_json()
+    assert body['results'][0]['status'] == "error"
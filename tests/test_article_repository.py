@@ -0,0 +1,84 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from src.article_repository import ArticleRepository
+from src.seen_index import article_key
+
+def make_articles(count):
+    return [{'link': f"https://example.com/{index}", 'original_title': f"Story {index} about topic{index}",
+             'title_language': "en" if index % 2 else "ta", 'needs_translation': bool(index % 2),
+             'published': f"2025-03-{10 + index:02d}T08:00:00", 'feed': "https://example.com/rss"}
+            for index in range(count)]
+
+@pytest.fixture
+def repository(tmp_path):
+    repository = ArticleRepository(str(tmp_path / "articles.db"))
+    repository.add(make_articles(7))
+    return repository
+
+def test_articles_are_stored_once_by_key(repository):
+    assert repository.add(make_articles(8)) == 1
+    assert repository.count() == 8
+    article = repository.get(article_key(make_articles(1)[0]))
+    assert article['link'] == "https://example.com/0"
+    assert repository.get("missing") is None
+
+def test_counters_follow_inserts_updates_and_deletes(repository, tmp_path):
+    keys = [article['key'] for article in repository.all()]
+    repository.update(keys[0], {'approved': True})
+    repository.update_many({keys[1]: {'approved': True}, keys[2]: {'approved': False}})
+    assert repository.counters() == {"total": 7, "approved": 2}
+
+    repository.update(keys[0], {'approved': False})
+    assert repository.counters() == {"total": 7, "approved": 1}
+
+    repository.replace(make_articles(3))
+    assert repository.counters() == {"total": 3, "approved": 0}
+
+    # Counters are stored, not recounted, and survive reopening
+    assert ArticleRepository(repository.filepath).counters() == {"total": 3, "approved": 0}
+
+def test_apply_updates_is_all_or_nothing(repository):
+    keys = [article['key'] for article in repository.all()]
+
+    def fail(article):
+        raise RuntimeError("reviewer lost connection")
+
+    with pytest.raises(RuntimeError):
+        repository.apply_updates({keys[0]: lambda article: {'approved': True}, keys[1]: fail})
+    assert repository.get(keys[0]).get('approved') is None
+    assert repository.counters()['approved'] == 0
+
+    results = repository.apply_updates({keys[0]: lambda article: {'approved': True},
+                                        keys[1]: lambda article: None,
+                                        "missing": lambda article: {'approved': True}})
+    assert results[keys[0]]['approved'] is True
+    assert results[keys[1]] is None and results["missing"] is None
+
+def test_update_many_respects_the_condition(repository):
+    keys = [article['key'] for article in repository.all()]
+    updated = repository.update_many({key: {'tamil_title': "தலைப்பு"} for key in keys},
+                                     lambda article: article['title_language'] == "en")
+    assert updated == 3
+    assert [bool(repository.get(key).get('tamil_title')) for key in keys] == [index % 2 == 1 for index in range(7)]
+
+def test_pages_and_filters(repository):
+    page, matching = repository.list_articles(sort="newest", page=2, per_page=3)
+    assert matching == 7
+    assert [article['link'] for article in page] == [f"https://example.com/{index}" for index in (3, 2, 1)]
+    last, _ = repository.list_articles(sort="newest", page=3, per_page=3)
+    assert [article['link'] for article in last] == ["https://example.com/0"]
+    assert repository.list_articles(page=4, per_page=3)[0] == []
+
+    english, matching = repository.list_articles({'language': "en", 'since': "2025-03-12"}, sort="oldest")
+    assert matching == 2
+    assert [article['link'] for article in english] == ["https://example.com/3", "https://example.com/5"]
+
+    repository.update(english[0]['key'], {'approved': True})
+    assert repository.list_articles({'review': "approved"})[1] == 1
+    assert repository.list_articles({'review': "unreviewed"})[1] == 6
+    assert repository.list_articles({'needs_translation': False, 'until': "2025-03-12"})[1] == 2
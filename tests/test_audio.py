@@ -0,0 +1,67 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.audio import (parse_frame_header, iter_frames, audio_frames, silence_frames,
+                       segment_with_pause, concatenate_mp3)
+
+# MPEG-1 Layer III, 128 kbps, 44.1 kHz, stereo: 417 bytes (418 with padding), 1152 samples
+HEADER = b'\xFF\xFB\x90\x44'
+PADDED_HEADER = b'\xFF\xFB\x92\x44'
+
+def frame(header=HEADER, fill=b'\x55'):
+    length = parse_frame_header(header)['length']
+    return header + fill * (length - 4)
+
+def info_frame():
+    # Xing/Info tag right after the 32 bytes of stereo MPEG-1 side information
+    data = bytearray(frame(fill=b'\x00'))
+    data[36:40] = b'Info'
+    return bytes(data)
+
+def id3v2_tag(size=20):
+    return b'ID3\x03\x00\x00' + bytes([0, 0, 0, size]) + b'\x00' * size
+
+def test_parse_frame_header():
+    header = parse_frame_header(HEADER)
+    assert header == {"length": 417, "samples": 1152, "sample_rate": 44100, "mpeg1": True, "mono": False}
+    assert parse_frame_header(PADDED_HEADER)['length'] == 418
+
+    # MPEG-2, 64 kbps, 24 kHz, mono
+    header = parse_frame_header(b'\xFF\xF3\x84\xC4')
+    assert header == {"length": 192, "samples": 576, "sample_rate": 24000, "mpeg1": False, "mono": True}
+
+def test_invalid_headers_are_rejected():
+    assert parse_frame_header(b'\x00\xFB\x90\x44') is None    # No frame sync
+    assert parse_frame_header(b'\xFF\xFD\x90\x44') is None    # Layer II
+    assert parse_frame_header(b'\xFF\xFB\xF0\x44') is None    # Bad bitrate index
+    assert parse_frame_header(b'\xFF\xFB\x9C\x44') is None    # Reserved sample rate
+    assert parse_frame_header(b'\xFF\xFB') is None            # Truncated
+
+def test_tags_info_frames_and_junk_are_skipped():
+    audio = frame() + frame(PADDED_HEADER) + frame()
+    data = id3v2_tag() + info_frame() + audio[:417] + b'junk' + audio[417:] + b'TAG' + b'\x00' * 125
+    assert [header['length'] for _, header in iter_frames(data)] == [417, 418, 417]
+    assert audio_frames(data) == audio
+
+def test_truncated_last_frame_is_dropped():
+    assert audio_frames(frame() + frame()[:200]) == frame()
+
+def test_silence_matches_the_reference_format():
+    silence = silence_frames(frame(PADDED_HEADER), 1.0)
+    frames = list(iter_frames(silence))
+    assert len(frames) == round(44100 / 1152)
+    assert all(header['length'] == 417 for _, header in frames)   # Padding cleared
+    assert silence[4:417] == b'\x00' * 413
+    assert silence_frames(b'no audio here', 1.0) == b''
+
+def test_segments_are_joined_with_pauses():
+    first = id3v2_tag() + info_frame() + frame() * 3
+    second = frame() * 2
+    joined = concatenate_mp3([first, second], [0.5, 0])
+    pause_frames = round(0.5 * 44100 / 1152)
+    assert len(list(iter_frames(joined))) == 3 + pause_frames + 2
+    assert joined.startswith(frame() * 3)
+    assert joined.endswith(frame() * 2)
+    assert segment_with_pause(b'', 1.0) == b''
@@ -0,0 +1,42 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.audio_cache import AudioCache, audio_key
+
+def backdate(cache, text, voice, model, seconds):
+    path = cache._path(audio_key(text, voice, model))
+    os.utime(path, (seconds, seconds))
+
+def test_segments_are_keyed_by_text_voice_and_model(tmp_path):
+    cache = AudioCache(str(tmp_path))
+    cache.put("வணக்கம்", "nova", "tts-1", b"audio")
+
+    assert cache.get("வணக்கம்", "nova", "tts-1") == b"audio"
+    assert cache.get("வணக்கம்", "alloy", "tts-1") is None
+    assert cache.get("வணக்கம்", "nova", "tts-1-hd") is None
+    assert cache.get("வணக்கம்!", "nova", "tts-1") is None
+    assert cache.summary() == {"hits": 1, "misses": 3, "bytes_reused": 5, "stored_bytes": 5}
+
+def test_least_recently_used_segments_are_evicted(tmp_path):
+    cache = AudioCache(str(tmp_path), max_bytes=30)
+    for age, text in enumerate(("one", "two", "three")):
+        cache.put(text, "nova", "tts-1", b"x" * 10)
+        backdate(cache, text, "nova", "tts-1", 1000 + age)
+
+    assert cache.get("one", "nova", "tts-1") is not None   # Bumped to most recently used
+    cache.put("four", "nova", "tts-1", b"x" * 10)
+
+    assert cache.get("two", "nova", "tts-1") is None
+    assert cache.get("one", "nova", "tts-1") is not None
+    assert cache.get("four", "nova", "tts-1") is not None
+    assert cache.total_bytes == 30
+
+def test_replacing_a_segment_counts_its_size_once(tmp_path):
+    cache = AudioCache(str(tmp_path))
+    cache.put("one", "nova", "tts-1", b"x" * 10)
+    cache.put("one", "nova", "tts-1", b"y" * 4)
+    assert cache.total_bytes == 4
+    assert AudioCache(str(tmp_path)).total_bytes == 4   # Reopened from disk
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
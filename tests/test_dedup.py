@@ -0,0 +1,92 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.dedup import deduplicate_articles, article_shingles, jaccard, MIN_JACCARD
+from src.article_repository import ArticleRepository
+
+# The same story as worded by different outlets
+SAME_STORY = [
+    (("Heavy rain lashes Chennai, schools shut",
+      "Schools and colleges in Chennai will remain closed on Tuesday as heavy rain continues to lash the city, the district collector said."),
+     ("Chennai schools closed as heavy rains continue",
+      "The Chennai district collector declared a holiday for schools and colleges on Tuesday after heavy rain lashed the city overnight.")),
+    (("ISRO successfully launches PSLV-C58 with XPoSat",
+      "The Indian Space Research Organisation launched its first X-ray polarimetry satellite XPoSat on board PSLV-C58 from Sriharikota on Monday."),
+     ("PSLV-C58 lifts off from Sriharikota carrying XPoSat",
+      "ISRO's PSLV-C58 rocket placed the X-ray polarimetry satellite XPoSat in orbit on Monday morning after lifting off from Sriharikota.")),
+    (("India beat Australia by 6 wickets to win series",
+      "Virat Kohli scored an unbeaten 85 as India chased down 241 against Australia to clinch the ODI series 2-1 in Bengaluru."),
+     ("Kohli's unbeaten 85 helps India clinch ODI series against Australia",
+      "India chased 241 with six wickets in hand in Bengaluru to beat Australia and win the three-match ODI series 2-1.")),
+    (("Tiger cubs spotted in Mudumalai reserve",
+      "Forest officials in the Mudumalai tiger reserve spotted a tigress with three cubs during a routine camera trap survey this week."),
+     ("Tigress with three cubs caught on camera at Mudumalai",
+      "A camera trap survey in the Mudumalai tiger reserve captured images of a tigress and her three cubs, forest officials said this week.")),
+    (("Metro rail phase 2 work to begin in March",
+      "Chennai Metro Rail Limited said construction on the phase 2 corridor from Madhavaram to SIPCOT will begin in March."),
+     ("CMRL to start phase 2 metro construction in March",
+      "Construction of the Madhavaram-SIPCOT corridor under Chennai Metro Rail phase 2 will begin in March, CMRL officials said.")),
+    (("Heavy rain lashes Chennai, schools shut",
+      "Schools and colleges in Chennai will remain closed on Tuesday as heavy rain continues to lash the city, the district collector said."),
+     ("HEAVY RAIN LASHES CHENNAI; SCHOOLS SHUT!",
+      "Schools and colleges in Chennai will remain closed on Tuesday as heavy rain continues to lash the city, the district collector said.")),
+]
+
+# Different stories on the same topic
+DIFFERENT_STORIES = [
+    (("Heavy rain lashes Chennai, schools shut",
+      "Schools and colleges in Chennai will remain closed on Tuesday as heavy rain continues to lash the city, the district collector said."),
+     ("Heavy rain lashes Mumbai, local trains delayed",
+      "Local train services in Mumbai were delayed on Tuesday as heavy rain continued to lash the city, railway officials said.")),
+    (("India beat Australia by 6 wickets to win series",
+      "Virat Kohli scored an unbeaten 85 as India chased down 241 against Australia to clinch the ODI series 2-1 in Bengaluru."),
+     ("Australia beat India by 5 wickets in first Test",
+      "Steve Smith scored a century as Australia chased down 210 against India to win the first Test in Perth.")),
+    (("Metro rail phase 2 work to begin in March",
+      "Chennai Metro Rail Limited said construction on the phase 2 corridor from Madhavaram to SIPCOT will begin in March."),
+     ("Chennai airport new terminal to open in March",
+      "The new integrated terminal at Chennai airport will open to passengers in March, Airports Authority of India officials said.")),
+    (("Tiger cubs spotted in Mudumalai reserve",
+      "Forest officials in the Mudumalai tiger reserve spotted a tigress with three cubs during a routine camera trap survey this week."),
+     ("Elephant herd spotted near Mudumalai highway",
+      "Forest officials in Mudumalai warned motorists after a herd of elephants was spotted crossing the highway this week.")),
+]
+
+def make_article(story, link):
+    title, summary = story
+    return {'original_title': title, 'original_summary': summary,
+            'normalized_title': title, 'normalized_summary': summary, 'link': link}
+
+@pytest.mark.parametrize("first, second", SAME_STORY)
+def test_reworded_copies_are_merged(first, second):
+    articles = [make_article(first, "https://a.example/1"), make_article(second, "https://b.example/1")]
+    assert jaccard(article_shingles(articles[0]), article_shingles(articles[1])) >= MIN_JACCARD
+    kept = deduplicate_articles(articles)
+    assert len(kept) == 1
+    assert kept[0]['duplicate_links'] == ["https://b.example/1"]
+
+@pytest.mark.parametrize("first, second", DIFFERENT_STORIES)
+def test_different_stories_are_kept(first, second):
+    articles = [make_article(first, "https://a.example/1"), make_article(second, "https://b.example/1")]
+    assert len(deduplicate_articles(articles)) == 2
+
+def test_copies_of_stored_articles_are_dropped(tmp_path):
+    repository = ArticleRepository(str(tmp_path / "articles.db"))
+    repository.add([make_article(first, f"https://a.example/{index}") for index, (first, _) in enumerate(SAME_STORY[:5])])
+
+    new_articles = [make_article(second, f"https://b.example/{index}") for index, (_, second) in enumerate(SAME_STORY[:5])]
+    new_articles.append(make_article(DIFFERENT_STORIES[0][1], "https://b.example/new"))
+    kept = deduplicate_articles(new_articles, existing=repository)
+    assert [article['link'] for article in kept] == ["https://b.example/new"]
+
+def test_shingles_are_not_stored(tmp_path):
+    repository = ArticleRepository(str(tmp_path / "articles.db"))
+    articles = [make_article(SAME_STORY[0][0], "https://a.example/1")]
+    deduplicate_articles(articles, existing=repository)
+    repository.add(articles)
+    assert 'shingles' not in articles[0]
+    assert 'shingles' not in repository.all()[0]
@@ -0,0 +1,107 @@
+import os
+import sys
+import time
+import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.episodes import EpisodeCatalog, audio_duration
+
+# One MPEG-1 Layer III frame: 128 kbps, 44.1 kHz, 1152 samples in 417 bytes
+FRAME = b'\xFF\xFB\x90\x44' + b'\x55' * 413
+DAY = 86400
+
+def catalog_in(tmp_path):
+    return EpisodeCatalog(str(tmp_path / "episodes.db"), str(tmp_path))
+
+def write_file(tmp_path, filename, data=b"script"):
+    (tmp_path / filename).write_bytes(data)
+    return filename
+
+def test_audio_size_and_duration_are_recorded(tmp_path):
+    catalog = catalog_in(tmp_path)
+    audio = write_file(tmp_path, "podcast_20250318_084904_aa.mp3", FRAME * 10)
+    episode = catalog.add_episode("podcast_20250318_084904_aa", audio, article_ids=["a", "b"],
+                                  voice="nova", failed_segments=1)
+
+    assert episode['size'] == len(FRAME) * 10
+    assert abs(episode['duration'] - 10 * 1152 / 44100) < 1e-9
+    assert episode['article_ids'] == ["a", "b"]
+    assert episode['failed_segments'] == 1
+    assert episode['compacted'] is False
+    assert audio_duration(str(tmp_path / "missing.mp3")) == 0.0
+
+def test_keyset_pages_cover_every_episode_once(tmp_path):
+    catalog = catalog_in(tmp_path)
+    # Two episodes share a timestamp, so the id breaks the tie
+    for index, created in enumerate([100.0, 200.0, 200.0, 300.0, 400.0]):
+        catalog.add_episode(f"episode_{index}", created=created)
+
+    seen = []
+    cursor = None
+    while True:
+        page, cursor = catalog.list_episodes(limit=2, cursor=cursor)
+        seen.extend(episode['id'] for episode in page)
+        if cursor is None:
+            break
+    assert seen == ["episode_4", "episode_3", "episode_2", "episode_1", "episode_0"]
+
+    # Episodes added after a page was read do not shift the following pages
+    page, cursor = catalog.list_episodes(limit=2)
+    catalog.add_episode("episode_new", created=500.0)
+    page, cursor = catalog.list_episodes(limit=2, cursor=cursor)
+    assert [episode['id'] for episode in page] == ["episode_2", "episode_1"]
+
+def test_with_audio_skips_episodes_without_audio(tmp_path):
+    catalog = catalog_in(tmp_path)
+    catalog.add_episode("script_only", script_file="script_only.txt", created=100.0)
+    catalog.add_episode("with_audio", audio_file="with_audio.mp3", created=200.0)
+
+    page, cursor = catalog.list_episodes(with_audio=True)
+    assert [episode['id'] for episode in page] == ["with_audio"]
+    assert cursor is None
+
+def test_retention_compacts_then_deletes(tmp_path):
+    catalog = catalog_in(tmp_path)
+    now = time.time()
+    for name, age in [("fresh", 1), ("old", 10), ("ancient", 40)]:
+        audio = write_file(tmp_path, name + ".mp3", FRAME)
+        script = write_file(tmp_path, name + ".txt")
+        catalog.add_episode(name, audio, script, created=now - age * DAY)
+
+    assert catalog.apply_retention(audio_days=7, keep_days=30) == (1, 1)
+
+    assert catalog.get_episode("fresh")['audio_file'] == "fresh.mp3"
+    old = catalog.get_episode("old")
+    assert old['compacted'] is True
+    assert old['audio_file'] is None and old['size'] == 0
+    assert old['script_file'] == "old.txt"
+    assert catalog.get_episode("ancient") is None
+    assert sorted(os.listdir(tmp_path)) == ["episodes.db", "fresh.mp3", "fresh.txt", "old.txt"]
+
+    # Compacted episodes are not compacted again
+    assert catalog.apply_retention(audio_days=7, keep_days=30) == (0, 0)
+
+def test_retention_is_off_by_default(tmp_path):
+    catalog = catalog_in(tmp_path)
+    catalog.add_episode("old", write_file(tmp_path, "old.mp3", FRAME), created=time.time() - 400 * DAY)
+    assert catalog.apply_retention(audio_days=0, keep_days=0) == (0, 0)
+    assert catalog.get_episode("old")['audio_file'] == "old.mp3"
+
+def test_import_existing_pairs_audio_and_script(tmp_path):
+    write_file(tmp_path, "podcast_20250318_084904_447f4122.mp3", FRAME)
+    write_file(tmp_path, "podcast_20250318_084904_447f4122.txt")
+    write_file(tmp_path, "podcast_20250319_101231_db1a1dc5.txt")
+    write_file(tmp_path, "podcast.mp3", FRAME)
+    catalog = catalog_in(tmp_path)
+
+    assert catalog.import_existing() == 2
+    episode = catalog.get_episode("podcast_20250318_084904_447f4122")
+    assert episode['audio_file'] == "podcast_20250318_084904_447f4122.mp3"
+    assert episode['script_file'] == "podcast_20250318_084904_447f4122.txt"
+    assert episode['created'] == datetime.datetime(2025, 3, 18, 8, 49, 4).timestamp()
+    assert catalog.get_episode("podcast_20250319_101231_db1a1dc5")['audio_file'] is None
+
+    # Already catalogued episodes are not imported twice
+    assert catalog.import_existing() == 0
+    assert catalog.count() == 2
@@ -0,0 +1,47 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.feed_cache import FeedCache, content_hash
+
+URL = "https://example.com/rss"
+ARTICLES = [{'title': "Rain in Chennai", 'link': "https://example.com/rain"}]
+HEADERS = {'ETag': '"v1"', 'Last-Modified': "Tue, 18 Mar 2025 08:00:00 GMT"}
+
+def test_conditional_headers_need_matching_params(tmp_path):
+    cache = FeedCache(str(tmp_path / "feed_cache.json"))
+    assert cache.request_headers(URL, "5|") == {}
+
+    cache.store(URL, "5|", HEADERS, content_hash(b"<rss/>"), 6, ARTICLES)
+    assert cache.request_headers(URL, "5|") == {'If-None-Match': '"v1"',
+                                                'If-Modified-Since': "Tue, 18 Mar 2025 08:00:00 GMT"}
+    assert cache.request_headers(URL, "10|") == {}
+    assert cache.request_headers("https://example.com/other", "5|") == {}
+
+def test_not_modified_and_unchanged_bodies_are_hits(tmp_path):
+    cache = FeedCache(str(tmp_path / "feed_cache.json"))
+    cache.store(URL, "5|", HEADERS, content_hash(b"<rss/>"), 6, ARTICLES)
+
+    assert cache.lookup(URL, "5|") == ARTICLES                              # 304
+    assert cache.lookup(URL, "5|", content_hash(b"<rss/>")) == ARTICLES     # Same body
+    assert cache.lookup(URL, "5|", content_hash(b"<rss>new</rss>")) is None
+    assert cache.lookup(URL, "10|") is None
+    assert cache.stats == {"hits": 2, "misses": 1, "not_modified": 1, "bytes_saved": 6}
+
+def test_cached_articles_are_copies(tmp_path):
+    cache = FeedCache(str(tmp_path / "feed_cache.json"))
+    cache.store(URL, "5|", {}, None, 0, list(ARTICLES))
+    cache.lookup(URL, "5|").append({'title': "Injected"})
+    assert cache.lookup(URL, "5|") == ARTICLES
+
+def test_entries_persist_and_stats_reset(tmp_path):
+    filepath = str(tmp_path / "feed_cache.json")
+    cache = FeedCache(filepath)
+    cache.store(URL, "5|", HEADERS, "hash", 6, ARTICLES)
+    cache.save()
+
+    reloaded = FeedCache(filepath)
+    assert reloaded.lookup(URL, "5|", "hash") == ARTICLES
+    reloaded.reset_stats()
+    assert reloaded.stats == {"hits": 0, "misses": 0, "not_modified": 0, "bytes_saved": 0}
@@ -0,0 +1,72 @@
+import os
+import sys
+import threading
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from src import main
+from src.feed_cache import FeedCache, content_hash
+
+ITEMS = "".join(
+    f"<item><title>Story {index}</title><link>https://example.com/{index}</link>"
+    f"<description>Summary {index}</description><pubDate>Tue, 18 Mar 2025 {12 - index:02d}:00:00 GMT</pubDate></item>"
+    for index in range(10))
+FEED = f'<?xml version="1.0"?><rss version="2.0"><channel><title>News</title>{ITEMS}</channel></rss>'.encode()
+ETAG = '"v1"'
+
+class FeedHandler(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_GET(self):
+        self.requests.append(self.headers.get('If-None-Match'))
+        if self.headers.get('If-None-Match') == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/rss+xml')
+        self.send_header('Content-Length', str(len(FEED)))
+        self.send_header('ETag', ETAG)
+        self.end_headers()
+        self.wfile.write(FEED)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def feed_url():
+    FeedHandler.requests = []
+    server = HTTPServer(("127.0.0.1", 0), FeedHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/feed.xml"
+    server.shutdown()
+    server.server_close()
+
+def test_full_download_is_answered_from_cache_when_not_modified(tmp_path, feed_url):
+    cache = FeedCache(str(tmp_path / "feed_cache.json"))
+    first = main.fetch_rss_articles(feed_url, num_articles=3, cache=cache, stream=False)
+    assert [article['title'] for article in first] == ["Story 0", "Story 1", "Story 2"]
+
+    second = main.fetch_rss_articles(feed_url, num_articles=3, cache=cache, stream=False)
+    assert second == first
+    assert FeedHandler.requests == [None, ETAG]
+    assert cache.stats == {"hits": 1, "misses": 1, "not_modified": 1, "bytes_saved": len(FEED)}
+
+def test_streamed_read_stops_early_and_is_cached_apart(tmp_path, feed_url):
+    cache = FeedCache(str(tmp_path / "feed_cache.json"))
+    streamed = main.fetch_rss_articles(feed_url, num_articles=3, cache=cache, stream=True)
+    assert [article['title'] for article in streamed] == ["Story 0", "Story 1", "Story 2"]
+    entry = cache.entries[feed_url]
+    assert entry['hash'] is None   # Only part of the body was read
+    assert entry['params'].startswith("stream|")
+
+    # A full download does not use the streamed entry's validators, size or hash
+    main.fetch_rss_articles(feed_url, num_articles=3, cache=cache, stream=False)
+    assert FeedHandler.requests == [None, None]
+    assert cache.entries[feed_url]['hash'] == content_hash(FEED)
+    assert cache.entries[feed_url]['size'] == len(FEED)
+    assert cache.stats['bytes_saved'] == 0
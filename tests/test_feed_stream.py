@@ -0,0 +1,103 @@
+import io
+import os
+import sys
+import gzip
+import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from src.feed_stream import iter_feed_entries, iter_response_chunks, parse_entry_date
+
+RSS = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">
+<channel>
+  <title>Kids News</title>
+  <link>https://example.com/</link>
+  <item>
+    <title>Rain&nbsp;in Chennai &amp; Madurai</title>
+    <link>https://example.com/rain</link>
+    <guid>rain-1</guid>
+    <description><![CDATA[<p>Schools are <b>closed</b></p>]]></description>
+    <content:encoded>Full story</content:encoded>
+    <pubDate>Tue, 18 Mar 2025 08:49:04 +0530</pubDate>
+    <source><title>Not the entry title</title></source>
+  </item>
+  <item>
+    <title>சென்னையில் மழை</title>
+    <link>https://example.com/tamil</link>
+  </item>
+</channel>
+</rss>""".encode()
+
+ATOM = b"""<?xml version="1.0"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Feed title</title>
+  <entry>
+    <title>Metro work begins</title>
+    <link rel="self" href="https://example.com/self"/>
+    <link href="https://example.com/metro"/>
+    <id>tag:example.com,2025:metro</id>
+    <summary>Phase 2 starts</summary>
+    <updated>2025-03-18T09:30:00Z</updated>
+  </entry>
+</feed>"""
+
+def chunked(data, size):
+    return (data[start:start + size] for start in range(0, len(data), size))
+
+@pytest.mark.parametrize("size", [1, 7, 4096])
+def test_rss_entries_whatever_the_chunk_boundaries(size):
+    entries = list(iter_feed_entries(chunked(RSS, size)))
+    assert entries == [
+        {'title': "Rain in Chennai & Madurai", 'link': "https://example.com/rain", 'guid': "rain-1",
+         'summary': "<p>Schools are <b>closed</b></p>", 'content': "Full story",
+         'published': "Tue, 18 Mar 2025 08:49:04 +0530"},
+        {'title': "சென்னையில் மழை", 'link': "https://example.com/tamil"},
+    ]
+
+def test_atom_entries():
+    entries = list(iter_feed_entries([ATOM]))
+    assert entries == [{'title': "Metro work begins", 'link': "https://example.com/metro",
+                        'guid': "tag:example.com,2025:metro", 'summary': "Phase 2 starts",
+                        'updated': "2025-03-18T09:30:00Z"}]
+
+def test_entries_are_yielded_before_the_feed_ends():
+    read = []
+
+    def chunks():
+        for chunk in chunked(RSS, 64):
+            read.append(chunk)
+            yield chunk
+
+    first = next(iter_feed_entries(chunks()))
+    assert first['guid'] == "rain-1"
+    assert sum(len(chunk) for chunk in read) < len(RSS)
+
+def test_malformed_feeds_raise():
+    with pytest.raises(Exception):
+        list(iter_feed_entries([b"<rss><channel><item><title>Broken</item></rss>"]))
+
+class FakeResponse(io.BytesIO):
+    def __init__(self, data, headers):
+        super().__init__(data)
+        self.headers = headers
+
+def test_gzip_responses_are_decompressed_while_reading():
+    response = FakeResponse(gzip.compress(RSS), {'Content-Encoding': 'gzip'})
+    assert b"".join(iter_response_chunks(response, chunk_size=50)) == RSS
+    assert b"".join(iter_response_chunks(FakeResponse(RSS, {}), chunk_size=50)) == RSS
+
+@pytest.mark.parametrize("value, expected", [
+    ("Tue, 18 Mar 2025 08:49:04 +0530", datetime.datetime(2025, 3, 18, 3, 19, 4)),
+    ("Tue, 18 Mar 2025 08:49:04 GMT", datetime.datetime(2025, 3, 18, 8, 49, 4)),
+    ("2025-03-18T09:30:00Z", datetime.datetime(2025, 3, 18, 9, 30)),
+    (" 2025-03-18T09:30:00+05:30 ", datetime.datetime(2025, 3, 18, 4, 0)),
+    ("2025-03-18", datetime.datetime(2025, 3, 18)),
+    ("yesterday", None),
+    ("", None),
+    (None, None),
+])
+def test_parse_entry_date(value, expected):
+    assert parse_entry_date(value) == expected
@@ -0,0 +1,47 @@
+import os
+import re
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.glossary import Glossary, compile_glossary, load_glossary
+
+ENTRIES = {
+    "new": "புதிய",
+    "New Delhi": "புது தில்லி",
+    "school": "பள்ளி",
+    "schools": "பள்ளிகள்",
+    "rain": "மழை",
+    "C++": "சி++",
+}
+
+def test_longest_term_wins():
+    glossary = Glossary(ENTRIES)
+    assert glossary.translate("New Delhi gets new schools") == "புது தில்லி gets புதிய பள்ளிகள்"
+
+def test_terms_match_whole_words_only():
+    glossary = Glossary(ENTRIES)
+    assert glossary.translate("Rainbow over the training school") == "Rainbow over the training பள்ளி"
+
+def test_matching_ignores_case_and_whitespace_inside_terms():
+    glossary = Glossary(ENTRIES)
+    assert glossary.translate("NEW  delhi RAIN") == "புது தில்லி மழை"
+    assert glossary.translate("new\ndelhi") == "புது தில்லி"
+
+def test_special_characters_are_escaped():
+    glossary = Glossary(ENTRIES)
+    assert glossary.translate("Learn C++ at school") == "Learn சி++ at பள்ளி"
+
+def test_matches_per_entry_substitution():
+    glossary = Glossary(ENTRIES)
+    text = "New Delhi schools closed for rain; new school opens after rain stops"
+    expected = text
+    for term, translation in sorted(ENTRIES.items(), key=lambda item: -len(item[0])):
+        expected = re.sub(r'(?<!\w)' + re.escape(term) + r'(?!\w)', translation, expected, flags=re.IGNORECASE)
+    assert glossary.translate(text) == expected
+
+def test_empty_glossary_leaves_text_alone(tmp_path):
+    assert compile_glossary([]) is None
+    glossary = load_glossary(str(tmp_path / "missing.json"))
+    assert len(glossary) == 0
+    assert glossary.translate("Heavy rain") == "Heavy rain"
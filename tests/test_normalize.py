@@ -0,0 +1,44 @@
+import os
+import re
+import sys
+from html import unescape
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from src.utils import normalize_text, clean_html
+
+def legacy_clean_html(html_text):
+    """Tag stripping, entity decoding and whitespace collapsing as separate passes"""
+    clean_text = re.sub(r'<[^>]+>', ' ', html_text)
+    clean_text = unescape(clean_text)
+    return re.sub(r'\s+', ' ', clean_text).strip()
+
+@pytest.mark.parametrize("text, expected", [
+    ("<p>Heavy <b>rain</b> in Chennai</p>", "Heavy rain in Chennai"),
+    ("Tom &amp; Jerry &quot;return&quot;", 'Tom & Jerry "return"'),
+    ("Rain&nbsp;&nbsp; today&#10;in&#x09;Chennai", "Rain today in Chennai"),
+    ("  spaced \n\t out  ", "spaced out"),
+    ("சென்னையில்&nbsp;<i>மழை</i>", "சென்னையில் மழை"),
+    ("It&#8217;s a &#x2014; dash", "It’s a — dash"),
+    ("AT&T and &unknown; stay", "AT&T and &unknown; stay"),
+    ("", ""),
+])
+def test_normalize_text(text, expected):
+    assert normalize_text(text) == expected
+
+def test_comments_and_scripts_are_dropped():
+    assert normalize_text("Rain<!-- ad --> today<script>var x = '<b>';</script> in <style>p {}</style>Chennai") == \
+        "Rain today in Chennai"
+
+@pytest.mark.parametrize("text", [
+    "Hello&#10; world", "a&#13;\nb", " &ensp; ", "x&nbsp;&nbsp; y", "a&NewLine;&Tab;b", "a &#x0A; b",
+    "a&#0010;b", "a&#x20;&#32;b", "<p>Rain</p>&#10;<p>in Chennai</p>", "&NBSP; upper case is not an entity",
+    "<a href='x?a=1&amp;b=2'>link</a> &lt;b&gt; not a tag", "a  b", "plain words only",
+])
+def test_matches_the_separate_passes(text):
+    assert normalize_text(text) == legacy_clean_html(text)
+
+def test_clean_html_normalizes():
+    assert clean_html("<p>Rain&nbsp;today</p>") == "Rain today"
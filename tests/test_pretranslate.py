@@ -0,0 +1,77 @@
+import os
+import sys
+import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import pretranslate
+from src.article_repository import ArticleRepository
+
+def make_article(link="https://example.com/rain"):
+    return {
+        'link': link,
+        'original_title': "Heavy rain in Chennai",
+        'original_summary': "Schools are closed today because of the rain",
+        'title_language': "en",
+        'summary_language': "en",
+        'tamil_title': "Heavy rain in Chennai",
+        'tamil_summary': "Schools are closed today because of the rain",
+        'needs_translation': True,
+        'translation_status': "pending",
+    }
+
+def test_fallback_article_is_translated_on_next_run(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)   # Keep the translation memory database out of data/
+    repository = ArticleRepository(str(tmp_path / "articles.db"))
+    repository.add([make_article()])
+
+    # First run: the API is unavailable, so the article falls back to word substitution
+    monkeypatch.setattr(pretranslate, "translate_segments", lambda texts: [None] * len(texts))
+    assert pretranslate.run_pretranslation(repository) == 1
+    article = repository.all()[0]
+    assert article['translation_status'] == "fallback"
+    assert article['translation_attempts'] == 1
+
+    # Not retried before the backoff has passed
+    assert pretranslate.run_pretranslation(repository) == 0
+
+    # Once it has, the next run translates it properly
+    last_attempt = datetime.datetime.now() - datetime.timedelta(seconds=pretranslate.FALLBACK_RETRY_DELAY + 1)
+    repository.update(article['key'], {'translated_at': last_attempt.isoformat()})
+    monkeypatch.setattr(pretranslate, "translate_segments", lambda texts: [f"தமிழ் {text}" for text in texts])
+    assert pretranslate.run_pretranslation(repository) == 1
+    article = repository.all()[0]
+    assert article['translation_status'] == "done"
+    assert article['tamil_title'] == "தமிழ் Heavy rain in Chennai"
+    assert article['translation_attempts'] == 2
+
+def test_fallback_retries_stop_after_max_attempts():
+    article = make_article()
+    article.update(translation_status="fallback", translated_at="2000-01-01T00:00:00",
+                   translation_attempts=pretranslate.MAX_TRANSLATION_ATTEMPTS)
+    assert not pretranslate.needs_pretranslation(article)
+    article['translation_attempts'] = pretranslate.MAX_TRANSLATION_ATTEMPTS - 1
+    assert pretranslate.needs_pretranslation(article)
+
+def test_edited_fallback_article_is_not_retried():
+    article = make_article()
+    article.update(translation_status="fallback", translated_at="2000-01-01T00:00:00", edited=True)
+    assert not pretranslate.needs_pretranslation(article)
+
+def test_only_translation_candidates_are_read(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    repository = ArticleRepository(str(tmp_path / "articles.db"))
+    done = dict(make_article("https://example.com/done"), original_title="Metro work begins in March",
+                translation_status="done")
+    not_needed = dict(make_article("https://example.com/tamil"), original_title="சென்னையில் மழை",
+                      needs_translation=False, translation_status=None)
+    repository.add([make_article(), done, not_needed])
+
+    candidates = repository.translation_candidates(pretranslate.UNFINISHED_STATUSES + ("fallback",))
+    assert [article['link'] for article in candidates] == ["https://example.com/rain"]
+
+    def full_scan():
+        raise AssertionError("run_pretranslation must not read every article")
+    monkeypatch.setattr(repository, "all", full_scan)
+    monkeypatch.setattr(pretranslate, "translate_segments", lambda texts: [f"தமிழ் {text}" for text in texts])
+    assert pretranslate.run_pretranslation(repository) == 1
@@ -0,0 +1,90 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from src import rate_limit
+from src.rate_limit import TokenBucket, RateLimiter, call_with_backoff, is_retryable
+
+class FakeClock:
+    """Stands in for the time module: sleeping advances the clock instantly"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit, "time", clock)
+    return clock
+
+class StatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+def test_bucket_allows_a_burst_then_waits_for_refill(clock):
+    bucket = TokenBucket(rate_per_minute=60, capacity=3)
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.acquire() == pytest.approx(1.0)   # One token per second
+    assert bucket.acquire(2) == pytest.approx(2.0)
+
+def test_bucket_refills_up_to_capacity_only(clock):
+    bucket = TokenBucket(rate_per_minute=60, capacity=2)
+    bucket.acquire(2)
+    clock.now += 3600
+    assert bucket.acquire(2) == 0.0
+    assert bucket.acquire(1) == pytest.approx(1.0)
+
+def test_oversized_requests_are_capped_at_capacity(clock):
+    bucket = TokenBucket(rate_per_minute=60, capacity=5)
+    assert bucket.acquire(500) == 0.0
+
+def test_limiter_takes_from_both_buckets(clock):
+    limiter = RateLimiter(requests_per_minute=600, tokens_per_minute=60)
+    assert limiter.acquire(60) == 0.0
+    assert limiter.acquire(30) == pytest.approx(30.0)   # Token budget, not request count, is the limit
+
+def test_transient_errors_are_retried_with_bounded_backoff(clock):
+    attempts = []
+
+    def flaky():
+        attempts.append(clock.now)
+        if len(attempts) < 4:
+            raise StatusError(429 if len(attempts) % 2 else 503)
+        return "ok"
+
+    assert call_with_backoff(flaky, base_delay=1.0, max_delay=3.0) == "ok"
+    assert len(attempts) == 4
+    assert all(0 <= delay <= min(3.0, 2 ** attempt) for attempt, delay in enumerate(clock.sleeps))
+
+def test_permanent_errors_and_exhausted_retries_raise(clock):
+    def bad_request():
+        raise StatusError(400)
+
+    def always_busy():
+        raise StatusError(429)
+
+    with pytest.raises(StatusError):
+        call_with_backoff(bad_request)
+    assert clock.sleeps == []
+    with pytest.raises(StatusError):
+        call_with_backoff(always_busy, max_retries=2)
+    assert len(clock.sleeps) == 2
+
+def test_retryable_errors():
+    assert is_retryable(StatusError(429))
+    assert is_retryable(StatusError(500))
+    assert not is_retryable(StatusError(404))
+    assert is_retryable(type("APITimeoutError", (Exception,), {})())
+    assert not is_retryable(ValueError("bad input"))
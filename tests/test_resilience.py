@@ -0,0 +1,110 @@
+import os
+import sys
+import time
+import threading
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from src import resilience
+from src.resilience import CircuitBreaker, call_with_hedging, get_breaker, CLOSED, OPEN, HALF_OPEN
+
+@pytest.fixture(autouse=True)
+def fresh_breakers(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)   # Events are logged under data/
+    monkeypatch.setattr(resilience, "_breakers", {})
+
+def test_breaker_opens_on_failure_rate_after_min_calls():
+    breaker = CircuitBreaker("test", min_calls=4, failure_rate=0.5)
+    for _ in range(3):
+        breaker.record(False, 0.1)
+    assert breaker.state == CLOSED   # Too few calls to judge
+
+    breaker = CircuitBreaker("test", min_calls=4, failure_rate=0.5)
+    for succeeded in (True, True, True, False, False):
+        breaker.record(succeeded, 0.1)
+    assert breaker.state == CLOSED   # 2 of 5 failed
+    breaker.record(False, 0.1)
+    assert breaker.state == OPEN     # 3 of 6 reaches the threshold
+    assert not breaker.allow()
+
+def test_breaker_opens_when_calls_are_slow():
+    breaker = CircuitBreaker("test", min_calls=3, slow_call_seconds=1.0, slow_rate=0.6)
+    for _ in range(3):
+        breaker.record(True, 2.0)
+    assert breaker.state == OPEN
+
+def test_half_open_breaker_lets_one_trial_through():
+    breaker = CircuitBreaker("test", min_calls=2, open_seconds=0)
+    breaker.record(False, 0.1)
+    breaker.record(False, 0.1)
+    assert breaker.state == OPEN
+
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()        # Only one trial at a time
+    breaker.record(False, 0.1)
+    assert breaker.state == OPEN      # Failed trial re-opens
+
+    assert breaker.allow()
+    breaker.record(True, 0.1)
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+
+def test_open_breaker_stays_open_during_cool_down():
+    breaker = CircuitBreaker("test", min_calls=1, open_seconds=60)
+    breaker.record(False, 0.1)
+    assert not breaker.allow()
+    assert breaker.state == OPEN
+
+def test_latency_percentile():
+    breaker = CircuitBreaker("test", min_calls=3)
+    assert breaker.latency_percentile(0.5) is None
+    for seconds in (0.1, 0.2, 0.3, 0.4):
+        breaker.record(True, seconds)
+    breaker.record(False, 9.0)        # Failed calls do not count
+    assert breaker.latency_percentile(0.5) == 0.3
+    assert breaker.latency_percentile(0.99) == 0.4
+
+def test_failing_provider_falls_through_to_the_next():
+    calls = []
+    providers = [("primary", lambda text: calls.append("primary")),
+                 ("secondary", lambda text: calls.append("secondary") or f"[ta] {text}")]
+    winner, result, _ = call_with_hedging(providers, "rain", hedge=False)
+    assert (winner, result) == ("secondary", "[ta] rain")
+    assert calls == ["primary", "secondary"]
+    assert get_breaker("primary").calls[-1][0] is False
+
+def test_open_breaker_is_skipped():
+    open_breaker = get_breaker("primary")
+    for _ in range(open_breaker.min_calls):
+        open_breaker.record(False, 0.1)
+
+    def primary(text):
+        raise AssertionError("primary must not be called")
+
+    winner, result, _ = call_with_hedging([("primary", primary), ("secondary", str.upper)], "rain")
+    assert (winner, result) == ("secondary", "RAIN")
+
+def test_slow_primary_is_hedged(monkeypatch):
+    monkeypatch.setattr(resilience, "HEDGE_DEFAULT_DELAY", 0.05)
+    monkeypatch.setattr(resilience, "HEDGE_MIN_DELAY", 0.01)
+    release = threading.Event()
+
+    def slow(text):
+        release.wait(5)
+        return "slow"
+
+    try:
+        start = time.monotonic()
+        winner, result, _ = call_with_hedging([("primary", slow), ("secondary", str.upper)], "rain", hedge=True)
+        assert (winner, result) == ("secondary", "RAIN")
+        assert time.monotonic() - start < 2
+    finally:
+        release.set()
+
+def test_no_usable_answer():
+    winner, result, _ = call_with_hedging([("primary", lambda text: None), ("secondary", lambda text: "")],
+                                          "rain")
+    assert (winner, result) == (None, None)
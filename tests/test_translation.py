@@ -0,0 +1,60 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import translation, resilience
+from src.translation_memory import TranslationMemory
+from src.providers import memory_provider
+
+class FakeGoogleClient:
+    def __init__(self):
+        self.calls = []
+
+    def translate(self, text, target_language):
+        self.calls.append(text)
+        return {'translatedText': f"கூகிள் {text}"}
+
+def open_breaker(name):
+    breaker = resilience.get_breaker(name)
+    for _ in range(breaker.min_calls):
+        breaker.record(False, 0.1)
+    assert breaker.state == resilience.OPEN
+
+def test_open_breaker_sends_segments_to_fallback_provider(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)   # Resilience events are logged under data/
+    monkeypatch.setattr(resilience, "_breakers", {})
+    memory = TranslationMemory(str(tmp_path / "memory.db"))
+    monkeypatch.setattr(translation, "get_translation_memory", lambda: memory)
+
+    google = FakeGoogleClient()
+    clients = {'openai': object(), 'google': google}
+    monkeypatch.setattr(translation, "get_client", lambda name: clients[name])
+
+    def unavailable(*args, **kwargs):
+        raise AssertionError("OpenAI must not be called while its breaker is open")
+    monkeypatch.setattr(translation, "translate_batch_openai", unavailable)
+
+    open_breaker(memory_provider('openai'))
+    texts = ["Heavy rain in Chennai", "Schools are closed today"]
+    assert translation.translate_segments(texts) == [f"கூகிள் {text}" for text in texts]
+    assert google.calls == texts
+
+    # Stored under the provider that translated them, and reused on the next call
+    assert memory.get(texts[0], memory_provider('google'), translation.GOOGLE_TRANSLATION_MODEL, "") == \
+        f"கூகிள் {texts[0]}"
+    assert translation.translate_segments(texts) == [f"கூகிள் {text}" for text in texts]
+    assert google.calls == texts
+
+def test_failed_primary_falls_back_per_batch(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(resilience, "_breakers", {})
+    memory = TranslationMemory(str(tmp_path / "memory.db"))
+    monkeypatch.setattr(translation, "get_translation_memory", lambda: memory)
+
+    providers = [
+        ("primary", "model", "v1", lambda texts: None),
+        ("secondary", "model", "v1", lambda texts: [f"[ta] {text}" for text in texts]),
+    ]
+    assert translation.translate_segments(["one", "two"], providers=providers) == ["[ta] one", "[ta] two"]
+    assert resilience.get_breaker("primary").calls[-1][0] is False
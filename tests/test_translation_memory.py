@@ -0,0 +1,48 @@
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.translation_memory import TranslationMemory
+
+def test_lookup_across_providers_counts_once(tmp_path):
+    memory = TranslationMemory(str(tmp_path / "memory.db"))
+    candidates = [("openai", "gpt", "1"), ("google", "nmt", "")]
+
+    assert memory.get_any("Rain in Chennai", candidates) is None
+    assert memory.stats['misses'] == 1
+
+    memory.put("Rain in Chennai", "google", "nmt", "", "சென்னையில் மழை")
+    assert memory.get_any("Rain in Chennai", candidates) == "சென்னையில் மழை"
+    assert memory.stats['hits'] == 1
+    assert memory.stats['misses'] == 1
+
+def test_translations_are_keyed_by_provider_model_and_prompt_version(tmp_path):
+    memory = TranslationMemory(str(tmp_path / "memory.db"))
+    memory.put("Rain in Chennai", "openai", "gpt", "v1", "சென்னையில் மழை")
+
+    assert memory.get("Rain in Chennai", "openai", "gpt", "v1") == "சென்னையில் மழை"
+    assert memory.get("Rain in Chennai", "openai", "gpt", "v2") is None
+    assert memory.get("Rain in Chennai", "openai", "gpt-4", "v1") is None
+    assert memory.get("Rain in Chennai", "google", "gpt", "v1") is None
+    assert memory.get("Rain in Chennai!", "openai", "gpt", "v1") is None
+
+def test_least_recently_used_translations_are_evicted_by_size(tmp_path, monkeypatch):
+    clock = iter(range(1, 100))
+    monkeypatch.setattr(time, "time", lambda: next(clock))
+    memory = TranslationMemory(str(tmp_path / "memory.db"), max_bytes=30)
+
+    memory.put("one", "openai", "gpt", "v1", "a" * 10)
+    memory.put("two", "openai", "gpt", "v1", "b" * 10)
+    memory.put("three", "openai", "gpt", "v1", "c" * 10)
+    assert memory.get("one", "openai", "gpt", "v1") == "a" * 10   # Now the most recently used
+
+    memory.put("four", "openai", "gpt", "v1", "d" * 10)
+    assert memory.total_bytes == 30
+    assert memory.get("two", "openai", "gpt", "v1") is None
+    assert memory.get("one", "openai", "gpt", "v1") == "a" * 10
+    assert memory.get("four", "openai", "gpt", "v1") == "d" * 10
+
+    # Reopening reads the stored size back
+    assert TranslationMemory(str(tmp_path / "memory.db"), max_bytes=30).total_bytes == 30
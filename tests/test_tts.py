@@ -0,0 +1,47 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from src import tts, providers
+from src.audio import iter_frames
+from src.audio_cache import AudioCache
+from src.episodes import EpisodeCatalog
+
+SCRIPT = "First story.\n\nSecond story fails.\n\nThird story.\n\nFourth story.\n\nFifth story.\n\nSixth story."
+
+@pytest.fixture
+def speech(tmp_path, monkeypatch):
+    """Mock speech client whose segments containing 'fails' raise"""
+    monkeypatch.setattr(providers, "MOCK_LATENCY", 0)
+    monkeypatch.setattr(tts, "get_client", lambda name: providers.MockOpenAIClient())
+    monkeypatch.setattr(tts, "get_audio_cache", lambda: AudioCache(str(tmp_path / "cache")))
+    synthesize = tts.synthesize_segment
+
+    def flaky(client, text, voice=tts.TTS_VOICE):
+        if "fails" in text:
+            raise RuntimeError("speech API unavailable")
+        return synthesize(client, text, voice)
+    monkeypatch.setattr(tts, "synthesize_segment", flaky)
+
+def test_failed_segment_is_reported_and_others_are_kept(tmp_path, speech):
+    output = str(tmp_path / "episode.mp3")
+    path, failed = tts.text_to_speech_openai(SCRIPT, output)
+    assert path == output
+    assert failed == 1
+    with open(output, 'rb') as f:
+        assert list(iter_frames(f.read()))
+
+def test_too_many_failed_segments_discard_the_audio(tmp_path, speech):
+    output = str(tmp_path / "episode.mp3")
+    path, failed = tts.text_to_speech_openai("Only story fails.\n\nSecond story fails.\n\nThird story.", output)
+    assert path is None
+    assert failed == 2
+    assert not os.path.exists(output)
+
+def test_catalog_records_failed_segments(tmp_path):
+    catalog = EpisodeCatalog(str(tmp_path / "episodes.db"), str(tmp_path))
+    episode = catalog.add_episode("podcast_20250318_084904_447f4122", failed_segments=2)
+    assert episode['failed_segments'] == 2